@@ -0,0 +1,251 @@
+"""Benchmark del lexer y del parser sobre programas generados.
+
+Uso: python benchmark.py --tamanos 1K,100K,10M --salida archivos_salida/benchmark.json
+     python benchmark.py --comparar archivos_salida/benchmark_anterior.json
+     python benchmark.py --sin-despacho --salida archivos_salida/sin_despacho.json  (y luego --comparar contra ese archivo)
+"""
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from generador import GeneradorProgramas
+from lex import ENCABEZADO_TABLA, registro_token
+from salidas import SalidaTexto, volcar
+from sesion import Sesion
+from traza import APAGADO, Traza
+
+UNIDADES = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+# Tope de errores de sintaxis de las sesiones medidas (el análisis normal se detiene en MAXIMO_ERRORES)
+SIN_TOPE_ERRORES = float("inf")
+
+def leer_tamano(texto):
+    """Convierte '1K', '10M' o '512' en una cantidad de bytes."""
+    texto = texto.strip().upper().rstrip('B')
+    if texto and texto[-1] in UNIDADES:
+        return int(float(texto[:-1]) * UNIDADES[texto[-1]])
+    return int(texto)
+
+def instrumentar_reducciones(parser):
+    """Reemplaza las producciones del parser por copias que cuentan cada reducción."""
+    contador = [0]
+    producciones = []
+    for produccion in parser.productions:
+        copia = copy.copy(produccion)
+        if produccion.callable:
+            def contar(p, funcion=produccion.callable):
+                contador[0] += 1
+                funcion(p)
+            copia.callable = contar
+        producciones.append(copia)
+    parser.productions = producciones
+    return contador
+
+def medir(funcion, repeticiones):
+    """Ejecuta la función varias veces y devuelve el mejor tiempo y el último resultado."""
+    mejor = None
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        transcurrido = time.perf_counter() - inicio
+        if mejor is None or transcurrido < mejor:
+            mejor = transcurrido
+    return mejor, resultado
+
+def memoria_pico(funcion):
+    """Devuelve el pico de memoria (en bytes) asignada por Python durante la función."""
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def medir_programa(codigo, repeticiones, con_memoria, despacho=True):
+    """Mide cada fase del análisis sobre un programa ya generado."""
+    # Los mensajes de cada regla no forman parte de lo que se mide
+    sesion = Sesion(Traza(APAGADO))
+    # Sin tope de errores: la variante con errores se analiza completa, como la válida
+    sesion.parser.maximo_errores = SIN_TOPE_ERRORES
+    if not despacho:
+        sesion.lexer.set_dispatch(False)
+
+    # Fase léxica: tokens de PLY en una sola pasada
+    t_lexico, tokens = medir(lambda: sesion.lexear(codigo), repeticiones)
+    # La misma fase guardando los tokens en arreglos, sin un objeto por token
+    t_columnas, _ = medir(lambda: sesion.lexear_columnas(codigo), repeticiones)
+    # La misma fase sobre los bytes en UTF-8 sin decodificarlos, y lo que cuesta decodificarlos
+    datos = codigo.encode("utf-8")
+    t_binario, _ = medir(lambda: sesion.lexear_bytes(datos), repeticiones)
+    t_decodificacion, _ = medir(lambda: datos.decode("utf-8"), repeticiones)
+
+    # Tabla de símbolos formateada en memoria
+    def tabla():
+        with SalidaTexto(io.StringIO()) as salida:
+            return volcar((registro_token(tok, sesion.lexer) for tok in tokens), [salida],
+                          encabezado=ENCABEZADO_TABLA)
+    t_tabla, _ = medir(tabla, repeticiones)
+
+    # Fase sintáctica a partir de los tokens ya obtenidos
+    t_sintactico, _ = medir(lambda: sesion.parse(codigo, tokens), repeticiones)
+    errores = len(sesion.errores_lexicos) + len(sesion.errores)
+
+    # Las reducciones se cuentan aparte para no distorsionar los tiempos
+    contada = Sesion(Traza(APAGADO))
+    contada.parser.maximo_errores = SIN_TOPE_ERRORES
+    contador = instrumentar_reducciones(contada.parser)
+    contada.parse(codigo, tokens)
+
+    resultado = {
+        "bytes": len(datos),
+        "lineas": codigo.count("\n") + 1,
+        "tokens": len(tokens),
+        "reducciones": contador[0],
+        "errores": errores,
+        "fases": {
+            "lexico": t_lexico,
+            "lexico_columnas": t_columnas,
+            "lexico_binario": t_binario,
+            "decodificacion": t_decodificacion,
+            "tabla": t_tabla,
+            "sintactico": t_sintactico,
+            "total": t_lexico + t_tabla + t_sintactico,
+        },
+        "tokens_por_segundo": len(tokens) / t_lexico if t_lexico else None,
+        "tokens_por_segundo_columnas": len(tokens) / t_columnas if t_columnas else None,
+        "tokens_por_segundo_binario": len(tokens) / t_binario if t_binario else None,
+        "reducciones_por_segundo": contador[0] / t_sintactico if t_sintactico else None,
+        "bytes_por_segundo": len(codigo) / (t_lexico + t_sintactico) if t_lexico + t_sintactico else None,
+    }
+
+    if con_memoria:
+        resultado["memoria_pico"] = {
+            "lexico": memoria_pico(lambda: sesion.lexear(codigo)),
+            "lexico_columnas": memoria_pico(lambda: sesion.lexear_columnas(codigo)),
+            "lexico_binario": memoria_pico(lambda: sesion.lexear_bytes(datos)),
+            "sintactico": memoria_pico(lambda: sesion.parse(codigo, tokens)),
+        }
+    return resultado
+
+def rss_maximo():
+    """Devuelve el máximo de memoria residente del proceso en bytes, si la plataforma lo informa."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa kilobytes; macOS, bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def commit_actual():
+    """Devuelve el commit de git del árbol de trabajo, si se puede obtener."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def ejecutar(tamanos, tasa_errores, semilla, repeticiones, con_memoria, despacho=True):
+    """Genera y mide un programa válido y otro con errores por cada tamaño."""
+    resultados = []
+    variantes = [("valido", 0.0)]
+    if tasa_errores:
+        variantes.append(("con_errores", tasa_errores))
+
+    for tamano in tamanos:
+        for variante, tasa in variantes:
+            generador = GeneradorProgramas(semilla=semilla, tasa_errores=tasa)
+            inicio = time.perf_counter()
+            codigo = generador.generar(tamano)
+            t_generacion = time.perf_counter() - inicio
+
+            medicion = medir_programa(codigo, repeticiones, con_memoria, despacho)
+            medicion["fases"]["generacion"] = t_generacion
+            resultados.append(dict(tamano_objetivo=tamano, variante=variante, **medicion))
+            del codigo
+
+            print(f"{tamano:>12} B {variante:<12} {medicion['tokens']:>10} tokens "
+                  f"{medicion['tokens_por_segundo'] or 0:>12,.0f} tok/s "
+                  f"{medicion['tokens_por_segundo_columnas'] or 0:>12,.0f} tok/s en columnas "
+                  f"{medicion['tokens_por_segundo_binario'] or 0:>12,.0f} tok/s en bytes "
+                  f"{medicion['reducciones_por_segundo'] or 0:>12,.0f} red/s "
+                  f"léxico {medicion['fases']['lexico']:.3f} s  sintáctico {medicion['fases']['sintactico']:.3f} s",
+                  file=sys.stderr)
+    return resultados
+
+def comparar(actual, anterior, umbral):
+    """Compara dos ejecuciones e indica las mediciones que empeoraron más que el umbral."""
+    previas = {(r["tamano_objetivo"], r["variante"]): r for r in anterior["resultados"]}
+    regresiones = 0
+    for r in actual["resultados"]:
+        previa = previas.get((r["tamano_objetivo"], r["variante"]))
+        if not previa:
+            continue
+        for metrica in ("tokens_por_segundo", "tokens_por_segundo_columnas", "tokens_por_segundo_binario",
+                        "reducciones_por_segundo"):
+            if not r.get(metrica) or not previa.get(metrica):
+                continue
+            razon = r[metrica] / previa[metrica]
+            marca = ""
+            if razon < 1 - umbral:
+                marca = "  <-- regresión"
+                regresiones += 1
+            print(f"{r['tamano_objetivo']:>12} B {r['variante']:<12} {metrica:<24} "
+                  f"{previa[metrica]:>12,.0f} -> {r[metrica]:>12,.0f} ({razon:.2f}x){marca}")
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del analizador léxico y sintáctico.")
+    parser.add_argument("--tamanos", default="1K,10K,100K,1M",
+                        help="tamaños de programa separados por comas, de 1K a 100M (por defecto: %(default)s)")
+    parser.add_argument("--tasa-errores", type=float, default=0.05,
+                        help="proporción de sentencias erróneas en la variante con errores (0 la omite)")
+    parser.add_argument("--semilla", type=int, default=1234)
+    parser.add_argument("--repeticiones", type=int, default=3, help="se informa el mejor tiempo")
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir el pico de memoria")
+    parser.add_argument("--sin-despacho", action="store_true",
+                        help="el lexer prueba todas las reglas en cada posición (para comparar)")
+    parser.add_argument("--salida", default=os.path.join("archivos_salida", "benchmark.json"))
+    parser.add_argument("--comparar", help="resultado JSON anterior contra el cual comparar")
+    parser.add_argument("--umbral", type=float, default=0.10,
+                        help="caída relativa que se considera regresión (por defecto: %(default)s)")
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    tamanos = [leer_tamano(t) for t in args.tamanos.split(",") if t.strip()]
+    resultados = ejecutar(tamanos, args.tasa_errores, args.semilla, args.repeticiones, not args.sin_memoria,
+                          not args.sin_despacho)
+
+    informe = {
+        "commit": commit_actual(),
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": args.semilla,
+        "repeticiones": args.repeticiones,
+        "despacho": not args.sin_despacho,
+        "rss_maximo": rss_maximo(),
+        "resultados": resultados,
+    }
+    directorio = os.path.dirname(args.salida)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, "r", encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+        if comparar(informe, anterior, args.umbral):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import hashlib
+import importlib.util
+import os
+
+# Variable de entorno que permite elegir otro directorio para la caché
+VARIABLE_CACHE = "ANALIZADOR_CACHE"
+
+def directorio_cache():
+    """Devuelve el directorio de la caché: $ANALIZADOR_CACHE o el directorio de caché del usuario (XDG)."""
+    ruta = os.environ.get(VARIABLE_CACHE)
+    if not ruta:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        ruta = os.path.join(base, "analizador-lexico")
+    return ruta
+
+def huella(*partes):
+    """Resume las partes indicadas en un identificador corto, estable entre ejecuciones."""
+    return hashlib.sha1(repr(partes).encode("utf-8")).hexdigest()[:16]
+
+def huella_reglas_lexicas(ldict, reflags):
+    """Huella de todo lo que determina las tablas del lexer: tokens, literales, estados y reglas."""
+    reglas = []
+    for nombre, valor in sorted(ldict.items()):
+        if not nombre.startswith("t_"):
+            continue
+        if callable(valor):
+            # El orden de las reglas-función depende de la línea donde están definidas
+            reglas.append((nombre, getattr(valor, "regex", valor.__doc__), valor.__code__.co_firstlineno))
+        else:
+            reglas.append((nombre, valor))
+    return huella(list(ldict.get("tokens", ())), ldict.get("literals", ""), ldict.get("states", ()),
+                  reglas, int(reflags))
+
+def cargar_modulo(ruta, nombre):
+    """Carga un módulo de tablas desde la caché; devuelve None si no existe o está dañado."""
+    if not os.path.exists(ruta):
+        return None
+    try:
+        spec = importlib.util.spec_from_file_location(nombre, ruta)
+        modulo = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(modulo)
+        return modulo
+    except Exception:
+        return None
+
+def guardar_en_cache(nombre, escribir):
+    """Escribe un archivo de la caché de forma atómica; escribir recibe la ruta temporal, que todavía no existe.
+
+    Si la caché no se puede escribir el análisis sigue igual, solo que sin guardar nada."""
+    directorio = directorio_cache()
+    # Nombre temporal propio del proceso, en el mismo directorio para que el reemplazo sea atómico
+    temporal = os.path.join(directorio, f"tmp_{os.getpid()}_{nombre}")
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        try:
+            escribir(temporal)
+            os.replace(temporal, os.path.join(directorio, nombre))
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+    except OSError:
+        return None
+    return os.path.join(directorio, nombre)
+
+def marcar_uso(ruta):
+    """Actualiza la fecha de un archivo de la caché al reutilizarlo, para que limitar_cache() lo conserve."""
+    try:
+        os.utime(ruta)
+    except OSError:
+        pass
+
+def limitar_cache(prefijo, maximo_bytes):
+    """Borra los archivos de la caché que empiezan con el prefijo, del usado hace más tiempo al más
+    reciente, hasta que entre todos ocupen como mucho maximo_bytes. Devuelve cuántos se borraron."""
+    try:
+        with os.scandir(directorio_cache()) as entradas:
+            archivos = []
+            for entrada in entradas:
+                if entrada.name.startswith(prefijo) and entrada.is_file():
+                    datos = entrada.stat()
+                    archivos.append((datos.st_mtime, datos.st_size, entrada.path))
+    except OSError:
+        return 0
+    total = sum(tamano for _, tamano, _ in archivos)
+    borrados = 0
+    for _, tamano, ruta in sorted(archivos):
+        if total <= maximo_bytes:
+            break
+        try:
+            os.remove(ruta)
+        except OSError:
+            # Otro proceso pudo haberlo borrado o reemplazado: su espacio se descuenta igual
+            pass
+        total -= tamano
+        borrados += 1
+    return borrados
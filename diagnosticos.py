@@ -0,0 +1,125 @@
+import json
+from collections import Counter, namedtuple
+
+# Severidades (con su equivalente en SARIF)
+ERROR = "error"
+ADVERTENCIA = "advertencia"
+NIVELES_SARIF = {ERROR: "error", ADVERTENCIA: "warning"}
+
+# Catálogo de mensajes: cada diagnóstico guarda su código y sus argumentos, y el texto se arma al mostrarlo
+MENSAJES = {
+    "L001": "Error léxico: Identificador inválido '{0}' en línea {linea}, columna {columna} - "
+            "Los identificadores no pueden comenzar con números.",
+    "L002": "Error léxico: Número mal formado '{0}' en línea {linea}, columna {columna}.",
+    "L003": "Error léxico: Literal de carácter inválido '{0}' en línea {linea}, columna {columna} - {1}",
+    "L004": "Error léxico: Operador inválido '{0}' en línea {linea}, columna {columna}.",
+    "S001": "Error de sintaxis: Se esperaba un punto y coma después de 'imprimir' en línea {linea}.",
+    "S002": "Error de sintaxis: Argumentos no válidos en 'imprimir' en línea {linea}. Verifica el contenido.",
+    "S003": "Error de sintaxis: Identificadores no válidos en declaración en línea {linea}.",
+    "S004": "Error de sintaxis: Se esperaba un punto y coma al final de la línea {linea}.",
+    "S005": "Error de sintaxis: Identificador no válido en línea {linea}.",
+    "S006": "Error de sintaxis: Valor faltante en asignación en línea {linea}.",
+    "S007": "Error de sintaxis: Operación errónea en línea {linea}. Falta un operando.",
+    "S008": "Error de sintaxis en la condición del bloque 'mientras' en línea {linea}.",
+    "S009": "Error de sintaxis: Condición mal formada en 'si' en línea {linea}. Verifica la condición.",
+    "S010": "Error de sintaxis: 'sino' no puede existir sin un bloque 'si' en línea {linea}.",
+    "S011": "Error de sintaxis: Condición errónea en línea {linea}. Verifica los operandos.",
+    "S012": "Error de sintaxis: Se esperaba un punto y coma al final de la línea {linea}",
+    "S013": "Error de sintaxis: fin inesperado del archivo.",
+    "S014": "Error de sintaxis: demasiados errores (más de {0}); el análisis se detuvo en la línea {linea}.",
+    "S015": "Error de sintaxis: '{0}' inesperado en línea {linea}, columna {columna}; se omite la sentencia.",
+}
+
+# Descripción corta de cada código, para las reglas de SARIF
+DESCRIPCIONES = {
+    "L001": "Identificador que comienza con un número",
+    "L002": "Número mal formado",
+    "L003": "Literal de carácter inválido",
+    "L004": "Operador inválido",
+    "S001": "Falta ';' después de imprimir",
+    "S002": "Argumentos inválidos en imprimir",
+    "S003": "Identificadores inválidos en una declaración",
+    "S004": "Falta ';' en una declaración",
+    "S005": "Identificador inválido en una asignación",
+    "S006": "Valor faltante en una asignación",
+    "S007": "Operación sin operando",
+    "S008": "Condición inválida en mientras",
+    "S009": "Condición inválida en si",
+    "S010": "sino sin si",
+    "S011": "Condición errónea",
+    "S012": "Falta ';' después de terminar",
+    "S013": "Fin inesperado del archivo",
+    "S014": "Análisis detenido por exceso de errores",
+    "S015": "Sentencia omitida por un token inesperado",
+}
+
+class Diagnostico(namedtuple("Diagnostico", "codigo severidad linea columna inicio fin args archivo",
+                             defaults=(None,))):
+    """Error o advertencia del análisis, con su posición (línea, columna y rango [inicio, fin) en el texto).
+
+    Al ser una tupla se puede ordenar, comparar y usar en conjuntos; el mensaje se arma recién al pedirlo."""
+    __slots__ = ()
+
+    @property
+    def mensaje(self):
+        return MENSAJES[self.codigo].format(*self.args, linea=self.linea, columna=self.columna)
+
+    def __str__(self):
+        return self.mensaje
+
+    def desplazado(self, delta):
+        """El mismo diagnóstico con su rango corrido delta caracteres."""
+        if self.inicio is None:
+            return self
+        return self._replace(inicio=self.inicio + delta, fin=self.fin + delta)
+
+def orden(diagnostico):
+    """Clave para ordenar diagnósticos por archivo y posición."""
+    return (diagnostico.archivo or "", diagnostico.linea or 0, diagnostico.columna or 0, diagnostico.codigo)
+
+def contar(diagnosticos):
+    """Cantidad de diagnósticos por código."""
+    return Counter(diagnostico.codigo for diagnostico in diagnosticos)
+
+def formatear_texto(diagnosticos):
+    """Los mensajes de siempre, uno por línea."""
+    return "".join([diagnostico.mensaje + "\n" for diagnostico in diagnosticos])
+
+def formatear_jsonl(diagnosticos):
+    """Un objeto JSON por línea con todos los campos del diagnóstico y su mensaje."""
+    return "".join([json.dumps(dict(diagnostico._asdict(), args=list(diagnostico.args), mensaje=diagnostico.mensaje),
+                               ensure_ascii=False) + "\n" for diagnostico in diagnosticos])
+
+def sarif(diagnosticos, herramienta="analizador-lexico"):
+    """Registro SARIF 2.1.0 con los diagnósticos, listo para json.dump."""
+    resultados = []
+    for diagnostico in diagnosticos:
+        resultado = {
+            "ruleId": diagnostico.codigo,
+            "level": NIVELES_SARIF[diagnostico.severidad],
+            "message": {"text": diagnostico.mensaje},
+        }
+        region = {}
+        if diagnostico.linea:
+            region["startLine"] = diagnostico.linea
+        if diagnostico.columna:
+            region["startColumn"] = diagnostico.columna
+        if diagnostico.inicio is not None:
+            region["charOffset"] = diagnostico.inicio
+            region["charLength"] = diagnostico.fin - diagnostico.inicio
+        ubicacion = {}
+        if diagnostico.archivo:
+            ubicacion["artifactLocation"] = {"uri": diagnostico.archivo.replace("\\", "/")}
+        if region:
+            ubicacion["region"] = region
+        if ubicacion:
+            resultado["locations"] = [{"physicalLocation": ubicacion}]
+        resultados.append(resultado)
+
+    reglas = [{"id": codigo, "shortDescription": {"text": DESCRIPCIONES[codigo]}}
+              for codigo in sorted({diagnostico.codigo for diagnostico in diagnosticos})]
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{"tool": {"driver": {"name": herramienta, "rules": reglas}}, "results": resultados}],
+    }
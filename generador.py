@@ -0,0 +1,135 @@
+"""Generador de programas aleatorios para el lenguaje del analizador.
+
+Sigue la gramática de sin.py (declaraciones, asignaciones, leer, imprimir,
+mientras, si/sino y expresiones anidadas) y, opcionalmente, inserta errores
+léxicos y sintácticos típicos.
+"""
+import random
+
+TIPOS = ('int', 'float', 'char')
+OPERADORES = ('+', '-', '*', '/')
+# '!=' y los operadores lógicos no se usan: el lexer actual no los reconoce como tales
+COMPARADORES = ('<', '<=', '>', '>=', '==')
+
+class GeneradorProgramas:
+    """Produce programas válidos o con errores a partir de la gramática."""
+    def __init__(self, semilla=None, tasa_errores=0.0, profundidad_max=3, variables=50):
+        self.azar = random.Random(semilla)
+        self.tasa_errores = tasa_errores
+        self.profundidad_max = profundidad_max
+        self.variables = [f"v{i}" for i in range(variables)]
+
+    def generar(self, tamano, nombre="generado"):
+        """Devuelve un programa de aproximadamente tamano caracteres."""
+        return "".join(self.fragmentos(tamano, nombre))
+
+    def escribir(self, ruta, tamano, nombre="generado"):
+        """Escribe el programa directamente en un archivo, sin armarlo entero en memoria."""
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for fragmento in self.fragmentos(tamano, nombre):
+                archivo.write(fragmento)
+
+    def fragmentos(self, tamano, nombre):
+        """Genera el programa por partes hasta alcanzar el tamaño pedido."""
+        encabezado = f"programa {nombre}() {{\n"
+        yield encabezado
+        escrito = len(encabezado)
+
+        # Declaraciones iniciales de todas las variables
+        for i in range(0, len(self.variables), 10):
+            linea = f"    {self.azar.choice(TIPOS)} {', '.join(self.variables[i:i + 10])};\n"
+            yield linea
+            escrito += len(linea)
+
+        while escrito < tamano:
+            sentencia = self.sentencia(1)
+            yield sentencia
+            escrito += len(sentencia)
+
+        yield "    terminar;\n}\n"
+
+    def sentencia(self, nivel):
+        """Genera una sentencia, con bloques anidados hasta la profundidad máxima."""
+        if self.tasa_errores and self.azar.random() < self.tasa_errores:
+            return self.sentencia_erronea(nivel)
+
+        sangria = "    " * nivel
+        opciones = ['asignacion', 'asignacion', 'asignacion', 'imprimir', 'leer', 'declaracion']
+        if nivel <= self.profundidad_max:
+            opciones += ['mientras', 'si', 'si_sino']
+        tipo = self.azar.choice(opciones)
+
+        if tipo == 'asignacion':
+            return f"{sangria}{self.variable()} = {self.expresion()};\n"
+        if tipo == 'imprimir':
+            return f"{sangria}imprimir({self.contenido_imprimir()});\n"
+        if tipo == 'leer':
+            return f"{sangria}leer {self.variable()};\n"
+        if tipo == 'declaracion':
+            if self.azar.random() < 0.5:
+                return f"{sangria}{self.azar.choice(TIPOS)} {self.variable()} = {self.expresion()};\n"
+            variables = ", ".join(self.variable() for _ in range(self.azar.randint(1, 4)))
+            return f"{sangria}{self.azar.choice(TIPOS)} {variables};\n"
+        if tipo == 'mientras':
+            return (f"{sangria}mientras ({self.condicion()}) {{\n"
+                    f"{self.bloque(nivel + 1)}{sangria}}}\n")
+        if tipo == 'si':
+            return (f"{sangria}si ({self.condicion()}) {{\n"
+                    f"{self.bloque(nivel + 1)}{sangria}}}\n")
+        return (f"{sangria}si ({self.condicion()}) {{\n"
+                f"{self.bloque(nivel + 1)}{sangria}}} sino {{\n"
+                f"{self.bloque(nivel + 1)}{sangria}}}\n")
+
+    def sentencia_erronea(self, nivel):
+        """Genera una sentencia con un error léxico o sintáctico frecuente."""
+        sangria = "    " * nivel
+        variable = self.variable()
+        # Se elige la variante antes de armarla: así solo se generan las expresiones y bloques que se usan
+        errores = [
+            lambda: f"{sangria}{variable} = {self.expresion()}\n",                    # falta ';'
+            lambda: f"{sangria}{variable} = ;\n",                                      # valor faltante
+            lambda: f"{sangria}{variable} = {self.expresion()} + ;\n",                 # falta un operando
+            lambda: f"{sangria}{self.azar.randint(1, 9)}{variable} = 1;\n",            # identificador inválido
+            lambda: f"{sangria}{variable} = {variable} ** 2;\n",                       # operador inválido
+            lambda: f"{sangria}char {variable} = 'ab';\n",                             # literal de carácter inválido
+            lambda: f"{sangria}imprimir({variable} {variable});\n",                    # argumentos inválidos
+        ]
+        if nivel <= self.profundidad_max:
+            errores += [
+                lambda: f"{sangria}sino {{\n{self.bloque(nivel + 1)}{sangria}}}\n",        # 'sino' sin 'si'
+                lambda: f"{sangria}mientras ({variable} <) {{\n{self.bloque(nivel + 1)}{sangria}}}\n",
+            ]
+        return self.azar.choice(errores)()
+
+    def bloque(self, nivel):
+        return "".join(self.sentencia(nivel) for _ in range(self.azar.randint(1, 4)))
+
+    def variable(self):
+        return self.azar.choice(self.variables)
+
+    def operando(self):
+        if self.azar.random() < 0.5:
+            return self.variable()
+        return str(self.azar.randint(0, 1000))
+
+    def expresion(self, operadores=None):
+        """Genera una cadena de operaciones de longitud aleatoria."""
+        if operadores is None:
+            operadores = self.azar.randint(0, 6)
+        partes = [self.operando()]
+        for _ in range(operadores):
+            partes.append(self.azar.choice(OPERADORES))
+            partes.append(self.operando())
+        return " ".join(partes)
+
+    def condicion(self):
+        return f"{self.expresion(self.azar.randint(0, 2))} {self.azar.choice(COMPARADORES)} {self.expresion(self.azar.randint(0, 2))}"
+
+    def contenido_imprimir(self):
+        elementos = []
+        for _ in range(self.azar.randint(1, 3)):
+            if self.azar.random() < 0.5:
+                elementos.append(f'"texto {self.azar.randint(0, 99)}"')
+            else:
+                elementos.append(self.variable())
+        return ", ".join(elementos)
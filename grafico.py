@@ -0,0 +1,97 @@
+import os
+from recorrido import preorden
+from salidas import TAMANO_LOTE
+
+# Ruta del DOT del árbol; Graphviz deja la imagen al lado (arbol_sintactico.dot.png / .svg)
+RUTA_DOT = "archivos_salida/arbol_sintactico.dot"
+
+# Píxeles que necesita, aproximadamente, un nodo para que su etiqueta se lea en pantalla
+AREA_NODO = 90 * 40
+
+def etiqueta(nodo):
+    """Texto con el que se muestra un nodo: su tipo y, si tiene, su valor."""
+    valor = nodo.valor
+    return f"{nodo.nombre}" + (f": {valor}" if valor else "")
+
+def citar(texto):
+    """Cadena DOT entre comillas."""
+    return '"' + texto.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+def subarbol(raiz, ruta):
+    """Nodo al que lleva una ruta de índices de hijos como "0.2.1" (vacía: la raíz)."""
+    nodo = raiz
+    for paso in filter(None, ruta.strip().split(".")):
+        indice = int(paso)
+        if not 0 <= indice < len(nodo.hijos):
+            raise ValueError(f"El nodo '{etiqueta(nodo)}' no tiene hijo {indice}")
+        nodo = nodo.hijos[indice]
+    return nodo
+
+def elementos_grafico(raiz, profundidad=None):
+    """Recorre el árbol en preorden y produce (id, etiqueta, id_padre, resumido).
+
+    Los ids son enteros consecutivos. En el nivel indicado por profundidad, los hijos de cada
+    nodo se reemplazan por un único elemento resumido (con la cantidad de hijos como etiqueta)."""
+    siguiente = 0
+    # Id del último nodo visto en cada nivel: en preorden, el padre de un nodo es el último del nivel anterior
+    ultimos = []
+    for nodo, nivel in preorden(raiz, profundidad):
+        del ultimos[nivel:]
+        ultimos.append(siguiente)
+        yield siguiente, etiqueta(nodo), ultimos[nivel - 1] if nivel else None, False
+        siguiente += 1
+        if nodo.hijos and nivel == profundidad:
+            yield siguiente, len(nodo.hijos), ultimos[nivel], True
+            siguiente += 1
+
+def contar_nodos(raiz, profundidad=None):
+    """Cantidad de nodos que tendrá el gráfico con esa profundidad."""
+    cantidad = 0
+    for nodo, nivel in preorden(raiz, profundidad):
+        cantidad += 2 if nodo.hijos and nivel == profundidad else 1
+    return cantidad
+
+def escribir_dot(raiz, archivo, profundidad=None, atributos=None):
+    """Escribe el árbol en formato DOT por lotes, sin armar el grafo en memoria. Devuelve la cantidad de nodos."""
+    lineas = ["digraph {\n"]
+    for nombre, valor in (atributos or {}).items():
+        lineas.append(f"\t{nombre}={citar(str(valor))}\n")
+    cantidad = 0
+    for ident, texto, padre, resumido in elementos_grafico(raiz, profundidad):
+        if resumido:
+            lineas.append(f'\tn{ident} [label="... ({texto} hijos)" shape=plaintext]\n')
+            lineas.append(f"\tn{padre} -> n{ident} [style=dashed]\n")
+        else:
+            lineas.append(f"\tn{ident} [label={citar(texto)}]\n")
+            if padre is not None:
+                lineas.append(f"\tn{padre} -> n{ident}\n")
+        cantidad += 1
+        if len(lineas) >= TAMANO_LOTE:
+            archivo.writelines(lineas)
+            del lineas[:]
+    lineas.append("}\n")
+    archivo.writelines(lineas)
+    return cantidad
+
+def elegir_salida(nodos, ancho, alto, dpi=96):
+    """Formato y atributos del gráfico según el lugar donde se va a mostrar.
+
+    Si los nodos entran legibles en un área de ancho x alto píxeles, PNG limitado a ese tamaño
+    (Graphviz achica el dibujo, nunca lo agranda); si no, SVG a tamaño natural para verlo aparte."""
+    if nodos * AREA_NODO <= ancho * alto:
+        return "png", {"dpi": dpi, "size": f"{ancho / dpi:.2f},{alto / dpi:.2f}"}
+    return "svg", {}
+
+def exportar_arbol(raiz, ancho, alto, dpi=96, profundidad=None, ruta_dot=RUTA_DOT):
+    """Escribe el DOT del árbol y lo dibuja con Graphviz. Devuelve (formato, ruta de la imagen, nodos)."""
+    # Graphviz solo se necesita para dibujar; el análisis funciona sin él
+    import graphviz
+
+    nodos = contar_nodos(raiz, profundidad)
+    formato, atributos = elegir_salida(nodos, ancho, alto, dpi)
+    directorio = os.path.dirname(ruta_dot)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta_dot, "w", encoding="utf-8", buffering=1 << 16) as archivo:
+        escribir_dot(raiz, archivo, profundidad, atributos)
+    return formato, graphviz.render("dot", formato, ruta_dot), nodos
@@ -0,0 +1,442 @@
+from bisect import bisect_left, bisect_right
+from functools import partial
+from ply.lex import LexToken
+from salidas import SalidaLista
+from recorrido import preorden
+from recuperacion import TOKENS_POR_AVISO, Entrada
+from sin import CODIGOS_NODO, SENTENCIA_REUTILIZADA, analizar_tokens, reiniciar_parser
+from traza import INFO, Traza
+
+def prefijo_comun(a, b):
+    """Largo del prefijo común de dos textos (búsqueda binaria sobre comparaciones de porciones)."""
+    bajo, alto = 0, min(len(a), len(b))
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[:medio] == b[:medio]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+def sufijo_comun(a, b, limite):
+    """Largo del sufijo común de dos textos, sin superar el límite indicado."""
+    bajo, alto = 0, min(len(a), len(b), limite)
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if a[len(a) - medio:] == b[len(b) - medio:]:
+            bajo = medio
+        else:
+            alto = medio - 1
+    return bajo
+
+class ErroresAnotados(list):
+    """Lista de errores léxicos que anota la línea en la que estaba el lexer al recibir cada mensaje."""
+    def __init__(self, lexer):
+        super().__init__()
+        self.lexer = lexer
+        self.lineas = []
+
+    def append(self, mensaje):
+        self.lineas.append(self.lexer.lineno)
+        super().append(mensaje)
+
+    def clear(self):
+        del self.lineas[:]
+        super().clear()
+
+class LexerIncremental:
+    """Mantiene los tokens de un texto y, ante una edición, vuelve a tokenizar solo la zona afectada.
+
+    Para cada token se guarda el estado del lexer después de obtenerlo (posición y línea). Tras una
+    edición se retoma desde el último token que terminó antes de la línea anterior al cambio, y se
+    tokeniza hasta que un token nuevo coincide con uno viejo desplazado y el lexer queda en el mismo
+    estado: desde ahí, los tokens viejos se reutilizan corriendo su posición y su línea.
+    El lexer no debe usar estados (solo INITIAL)."""
+    def __init__(self, lexer):
+        if len(lexer.lexstatere) > 1:
+            raise ValueError("El lexer incremental no admite lexers con estados")
+        self.lexer = lexer
+        # Si el lexer guarda sus errores léxicos, se les anota la línea para poder reutilizarlos
+        self.con_errores = hasattr(lexer, "errores_lexicos")
+        # Si el lexer ubica sus tokens (col, endpos, end_col), al reutilizarlos hay que correr también esos datos
+        self.ubicados = getattr(lexer, "ubica_tokens", False)
+        self.texto = ""
+        self.tokens = []
+        self.fines = []     # posición del lexer después de cada token
+        self.lineas = []    # número de línea del lexer después de cada token
+        # Errores léxicos como (posición, línea, mensaje), ordenados por posición
+        self.errores = []
+        # Función opcional al_avanzar(posición, largo del texto), llamada cada TOKENS_POR_AVISO tokens
+        self.al_avanzar = None
+
+    @property
+    def errores_lexicos(self):
+        return [mensaje for _, _, mensaje in self.errores]
+
+    def actualizar(self, texto):
+        """Lleva el estado al texto dado, detectando la zona editada. Devuelve el rango de tokens nuevos."""
+        inicio = prefijo_comun(self.texto, texto)
+        sufijo = sufijo_comun(self.texto, texto, min(len(self.texto), len(texto)) - inicio)
+        return self.editar(inicio, len(self.texto) - sufijo, texto[inicio:len(texto) - sufijo])
+
+    def editar(self, inicio, fin, nuevo):
+        """Reemplaza texto[inicio:fin] por nuevo y vuelve a tokenizar lo necesario.
+
+        Devuelve (primero, ultimo): los índices de self.tokens que se volvieron a generar."""
+        viejo = self.texto
+        texto = viejo[:inicio] + nuevo + viejo[fin:]
+        delta = len(nuevo) - (fin - inicio)
+        lineas_delta = nuevo.count("\n") - viejo.count("\n", inicio, fin)
+
+        # Punto de reinicio: estado después del último token que termina antes de la línea previa al cambio
+        salto = viejo.rfind("\n", 0, inicio)
+        limite = viejo.rfind("\n", 0, salto) + 1 if salto > 0 else 0
+        reinicio = bisect_right(self.fines, limite) - 1
+        if reinicio >= 0:
+            posicion, linea = self.fines[reinicio], self.lineas[reinicio]
+        else:
+            posicion, linea = 0, 1
+
+        # Tokens viejos candidatos a reutilizarse: los que terminan después de la zona editada
+        candidato = bisect_left(self.fines, fin + 1)
+        fin_editado = inicio + len(nuevo)
+        errores_viejos = self.errores
+        posiciones_error = [error[0] for error in errores_viejos]
+
+        lexer = self.lexer
+        lexer.input(texto)
+        lexer.lexpos = posicion
+        lexer.lineno = linea
+        errores_lexicos = None
+        if self.con_errores:
+            errores_lexicos = lexer.errores_lexicos = ErroresAnotados(lexer)
+
+        tokens, fines, lineas, errores = [], [], [], []
+        sincronizado = None
+        al_avanzar = self.al_avanzar
+        try:
+            while True:
+                antes = lexer.lexpos
+                cantidad_errores = len(errores_lexicos) if errores_lexicos is not None else 0
+                tok = lexer.token()
+                if errores_lexicos is not None and len(errores_lexicos) > cantidad_errores:
+                    for indice in range(cantidad_errores, len(errores_lexicos)):
+                        errores.append((antes, errores_lexicos.lineas[indice], errores_lexicos[indice]))
+                if tok is None:
+                    break
+                tokens.append(tok)
+                fines.append(lexer.lexpos)
+                lineas.append(lexer.lineno)
+                if al_avanzar is not None and len(tokens) % TOKENS_POR_AVISO == 0:
+                    al_avanzar(lexer.lexpos, len(texto))
+                if lexer.lexpos <= fin_editado:
+                    continue
+
+                # ¿Coincide con un token viejo desplazado, con el lexer en el mismo estado?
+                while candidato < len(self.fines) and self.fines[candidato] + delta < lexer.lexpos:
+                    candidato += 1
+                if candidato < len(self.fines) and self.fines[candidato] + delta == lexer.lexpos:
+                    anterior = self.tokens[candidato]
+                    if (anterior.type == tok.type and anterior.value == tok.value
+                            and anterior.lexpos >= fin and anterior.lexpos + delta == tok.lexpos
+                            and self.lineas[candidato] + lineas_delta == lexer.lineno
+                            and self.errores_reutilizables(posiciones_error, self.fines[candidato],
+                                                           lineas_delta, self.lineas[candidato])):
+                        sincronizado = candidato
+                        break
+        except Exception:
+            # El estado quedó a medias: el próximo análisis se hace desde cero
+            self.texto, self.tokens, self.fines, self.lineas, self.errores = "", [], [], [], []
+            raise
+
+        primero = reinicio + 1
+        ultimo = primero + len(tokens)
+        cola_tokens, cola_fines, cola_lineas, cola_errores = [], [], [], []
+        if sincronizado is not None:
+            cola_tokens = self.tokens[sincronizado + 1:]
+            cola_fines = self.fines[sincronizado + 1:]
+            cola_lineas = self.lineas[sincronizado + 1:]
+            # Una edición que no cambia el largo ni las líneas no obliga a tocar el resto
+            if delta or lineas_delta:
+                for tok in cola_tokens:
+                    tok.lexpos += delta
+                    tok.lineno += lineas_delta
+                if self.ubicados and delta:
+                    for tok in cola_tokens:
+                        tok.endpos += delta
+                cola_fines = [f + delta for f in cola_fines]
+                cola_lineas = [l + lineas_delta for l in cola_lineas]
+            if self.ubicados:
+                self.reubicar_columnas(texto, fin_editado, cola_tokens)
+            desde = bisect_left(posiciones_error, self.fines[sincronizado])
+            # Los diagnósticos reutilizados están en la misma línea y columna, pero su rango se corre
+            cola_errores = [(p + delta, l + lineas_delta, m.desplazado(delta) if delta else m)
+                            for p, l, m in errores_viejos[desde:]]
+
+        errores_previos = errores_viejos[:bisect_left(posiciones_error, posicion)]
+        self.texto = texto
+        self.tokens = self.tokens[:primero] + tokens + cola_tokens
+        self.fines = self.fines[:primero] + fines + cola_fines
+        self.lineas = self.lineas[:primero] + lineas + cola_lineas
+        self.errores = errores_previos + errores + cola_errores
+        return primero, ultimo
+
+    @staticmethod
+    def reubicar_columnas(texto, fin_editado, cola_tokens):
+        """Corrige la columna de los tokens reutilizados que quedaron en la línea donde termina la edición."""
+        inicio_linea = texto.rfind("\n", 0, fin_editado) + 1
+        fin_linea = texto.find("\n", fin_editado)
+        for tok in cola_tokens:
+            if 0 <= fin_linea < tok.lexpos:
+                break
+            tok.col = tok.lexpos - inicio_linea + 1
+            tok.end_col = tok.col + (tok.endpos - tok.lexpos)
+
+    def errores_reutilizables(self, posiciones_error, desde, lineas_delta, linea):
+        """Los mensajes guardados incluyen línea y columna: solo se reutilizan si siguen siendo válidos."""
+        indice = bisect_left(posiciones_error, desde)
+        if indice == len(posiciones_error):
+            return True
+        # Con líneas corridas, cualquier error posterior tendría mal su número de línea
+        if lineas_delta:
+            return False
+        # En la misma línea del cambio, la columna del error también se corre
+        return self.errores[indice][1] > linea
+
+# Encabezado de todo programa, antes de su bloque de sentencias
+ENCABEZADO_PROGRAMA = ['PROGRAMA', 'IDENTIFICADOR', 'PARENTESIS_IZQ', 'PARENTESIS_DER', 'LLAVE_IZQ']
+
+# Tipo de evento que emite la regla de cada sentencia (uno por sentencia, al reducirla)
+EVENTOS_SENTENCIA = {
+    CODIGOS_NODO["Declaracion"]: "declaracion",
+    CODIGOS_NODO["Declaracion y Asignacion"]: "declaracion",
+    CODIGOS_NODO["Asignacion"]: "asignacion",
+    CODIGOS_NODO["Leer"]: "leer",
+    CODIGOS_NODO["Imprimir"]: "imprimir",
+    CODIGOS_NODO["Mientras"]: "mientras",
+    CODIGOS_NODO["Si"]: "si",
+    CODIGOS_NODO["Si-Sino"]: "si_sino",
+}
+SENTENCIAS = CODIGOS_NODO["Sentencias"]
+SI = CODIGOS_NODO["Si"]
+
+class ReanalisisFallido(Exception):
+    """El parser encontró un error en la entrada abreviada: se vuelve a analizar todo."""
+
+class SinAlinear(Exception):
+    """Los tokens, el árbol y los eventos de un análisis no se corresponden como se esperaba."""
+
+class SentenciaAnalizada:
+    """Sentencia de un análisis anterior: sus tokens, su árbol, sus eventos y sus sentencias internas."""
+    __slots__ = ("tokens", "linea", "nodo", "eventos", "internas", "token")
+
+    def __init__(self, tokens, nodo, eventos, internas):
+        self.tokens = tokens
+        # Los mensajes llevan números de línea: solo se reutiliza si la sentencia no se corrió de línea
+        self.linea = tokens[0].lineno
+        self.nodo = nodo
+        self.eventos = eventos
+        self.internas = internas
+        # Token que la representa en la entrada del parser
+        self.token = LexToken()
+        self.token.type = SENTENCIA_REUTILIZADA
+        self.token.value = self
+        self.token.lineno = self.linea
+        self.token.lexpos = tokens[0].lexpos
+
+class ParserIncremental:
+    """Analiza sintácticamente reutilizando las sentencias que no cambiaron desde el análisis anterior.
+
+    Cada sentencia sin cambios (los mismos objetos token, que el lexer incremental conserva, y en la
+    misma línea si la traza guarda sus mensajes) se reemplaza en la entrada del parser por un único
+    token SENTENCIA_REUTILIZADA con su subárbol y sus mensajes. Así solo se vuelven a analizar las sentencias editadas y los bloques que
+    las contienen; el resto se reduce en un paso. Si la entrada abreviada tiene algún error, se
+    analiza todo de nuevo, de modo que el resultado es siempre el de un análisis completo."""
+    def __init__(self, parser):
+        self.parser = parser
+        # Sentencias del último análisis sin errores, por id de su primer token
+        self.registros = {}
+        self.con_eventos = None
+        # Función opcional al_avanzar(tokens consumidos, total), como en analizar_tokens
+        self.al_avanzar = None
+
+    def parse(self, tokens, lexer):
+        """Analiza la lista de tokens y devuelve el árbol, como parser.parse con esos tokens."""
+        parser = self.parser
+        con_eventos = parser.traza.nivel >= INFO
+        if con_eventos != self.con_eventos:
+            # Los eventos guardados dependen del nivel de la traza
+            self.registros = {}
+            self.con_eventos = con_eventos
+
+        if self.registros:
+            flujo, posiciones = self.comprimir(tokens)
+            if posiciones:
+                resultado = self.intentar(flujo, lexer)
+                if resultado is not None:
+                    arbol, eventos = resultado
+                    parser.traza.reenviar(eventos)
+                    self.registrar(flujo, posiciones, arbol, eventos)
+                    return arbol
+                reiniciar_parser(parser)
+                parser.errores.clear()
+
+        with parser.traza.grabando() as eventos:
+            arbol = analizar_tokens(parser, tokens, lexer, self.al_avanzar)
+        if parser.errores or parser.error or parser.estado.error_found:
+            self.registros = {}
+        else:
+            self.registrar(tokens, [], arbol, eventos)
+        return arbol
+
+    def comprimir(self, tokens):
+        """Reemplaza cada sentencia reutilizable por su token; devuelve la entrada y dónde quedaron esos tokens."""
+        registros = self.registros
+        flujo, posiciones = [], []
+        i, total = 0, len(tokens)
+        while i < total:
+            tok = tokens[i]
+            registro = registros.get(id(tok))
+            if registro is not None:
+                fin = i + len(registro.tokens)
+                # Sin eventos guardados, la línea no importa: el árbol no la incluye
+                if ((not self.con_eventos or registro.linea == tok.lineno) and tokens[i:fin] == registro.tokens
+                        # Un 'si' seguido ahora de 'sino' forma otra sentencia
+                        and not (registro.nodo.tipo == SI and fin < total and tokens[fin].type == 'SINO')):
+                    if registro.nodo.inicio != tok.lexpos:
+                        self.desplazar(registro, tok.lexpos - registro.nodo.inicio)
+                        registro.token.lexpos = tok.lexpos
+                    posiciones.append(len(flujo))
+                    flujo.append(registro.token)
+                    i = fin
+                    continue
+            flujo.append(tok)
+            i += 1
+        return flujo, posiciones
+
+    @staticmethod
+    def desplazar(registro, delta):
+        """Corre el rango de los nodos de una sentencia cuyo texto se movió (sus tokens ya los corrió el lexer).
+
+        Se modifican los nodos del árbol anterior: Sesion ya dio por vencido el resultado que los contenía."""
+        for nodo, _ in preorden(registro.nodo):
+            if nodo.inicio is not None:
+                nodo.inicio += delta
+            if nodo.fin is not None:
+                nodo.fin += delta
+
+    def intentar(self, flujo, lexer):
+        """Analiza la entrada abreviada con los mensajes retenidos; devuelve (árbol, eventos) o None si hubo errores."""
+        parser = self.parser
+        traza, errorfunc = parser.traza, parser.errorfunc
+        retenidos = SalidaLista()
+        parser.traza = Traza(traza.nivel, [retenidos])
+
+        def abandonar(p):
+            raise ReanalisisFallido()
+
+        parser.errorfunc = abandonar
+        if self.al_avanzar is None:
+            siguiente = partial(next, iter(flujo), None)
+        else:
+            siguiente = Entrada(flujo).con_avisos(self.al_avanzar)
+        try:
+            arbol = parser.parse(lexer=lexer, tokenfunc=siguiente)
+        except ReanalisisFallido:
+            return None
+        finally:
+            parser.traza, parser.errorfunc = traza, errorfunc
+        if arbol is None or parser.errores or parser.error or parser.estado.error_found:
+            return None
+        return arbol, retenidos.registros
+
+    def registrar(self, flujo, posiciones, arbol, eventos):
+        """Guarda las sentencias del árbol para el próximo análisis."""
+        self.registros = {}
+        if [tok.type for tok in flujo[:len(ENCABEZADO_PROGRAMA)]] != ENCABEZADO_PROGRAMA:
+            return
+        try:
+            fin, _, _ = self.registrar_bloque(flujo, posiciones, len(ENCABEZADO_PROGRAMA),
+                                              arbol.hijos[0].hijos, eventos, 0)
+            if flujo[fin].type != 'TERMINAR':
+                raise SinAlinear()
+        except (SinAlinear, IndexError, ValueError):
+            self.registros = {}
+
+    def registrar_bloque(self, flujo, posiciones, inicio, nodos, eventos, cursor):
+        """Registra las sentencias de un bloque que empieza en flujo[inicio], recorriendo a la par
+        tokens, nodos y eventos (cada sentencia emite el suyo después de los de sus sentencias internas).
+
+        Devuelve el índice donde termina el bloque, el cursor de eventos y las sentencias registradas."""
+        registradas = []
+        i = inicio
+        for nodo in nodos:
+            tok = flujo[i]
+            if tok.type == SENTENCIA_REUTILIZADA:
+                sentencia = tok.value
+                if sentencia.nodo is not nodo:
+                    raise SinAlinear()
+                self.conservar(sentencia)
+                registradas.append(sentencia)
+                cursor += len(sentencia.eventos)
+                i += 1
+                continue
+
+            desde = cursor
+            internas = []
+            cuerpos = [hijo for hijo in nodo.hijos if hijo.tipo == SENTENCIAS]
+            if cuerpos:
+                # mientras / si / si-sino: cada cuerpo va entre llaves
+                fin = i
+                for cuerpo in cuerpos:
+                    fin = self.buscar(flujo, 'LLAVE_IZQ', fin) + 1
+                    fin, cursor, registradas_cuerpo = self.registrar_bloque(flujo, posiciones, fin, cuerpo.hijos,
+                                                                             eventos, cursor)
+                    if flujo[fin].type != 'LLAVE_DER':
+                        raise SinAlinear()
+                    fin += 1
+                    internas += registradas_cuerpo
+            else:
+                fin = self.buscar(flujo, 'PUNTO_Y_COMA', i) + 1
+
+            if self.con_eventos:
+                if eventos[cursor].tipo != EVENTOS_SENTENCIA.get(nodo.tipo):
+                    raise SinAlinear()
+                cursor += 1
+
+            sentencia = SentenciaAnalizada(self.tokens_originales(flujo, posiciones, i, fin), nodo,
+                                           eventos[desde:cursor], internas)
+            self.registros[id(sentencia.tokens[0])] = sentencia
+            registradas.append(sentencia)
+            i = fin
+        return i, cursor, registradas
+
+    @staticmethod
+    def buscar(flujo, tipo, desde):
+        """Índice del próximo token del tipo dado; una llave o sentencia en el camino indica un desajuste."""
+        for indice in range(desde, len(flujo)):
+            encontrado = flujo[indice].type
+            if encontrado == tipo:
+                return indice
+            if encontrado in ('LLAVE_IZQ', 'LLAVE_DER', SENTENCIA_REUTILIZADA):
+                raise SinAlinear()
+        raise SinAlinear()
+
+    @staticmethod
+    def tokens_originales(flujo, posiciones, inicio, fin):
+        """Tokens de flujo[inicio:fin] con cada sentencia reutilizada expandida a sus tokens."""
+        tokens, desde = [], inicio
+        for posicion in posiciones[bisect_left(posiciones, inicio):bisect_left(posiciones, fin)]:
+            tokens += flujo[desde:posicion]
+            tokens += flujo[posicion].value.tokens
+            desde = posicion + 1
+        tokens += flujo[desde:fin]
+        return tokens
+
+    def conservar(self, sentencia):
+        """Mantiene registrada una sentencia reutilizada junto con todas sus sentencias internas."""
+        pendientes = [sentencia]
+        while pendientes:
+            actual = pendientes.pop()
+            self.registros[id(actual.tokens[0])] = actual
+            pendientes += actual.internas
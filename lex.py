@@ -1,4 +1,13 @@
 import ply.lex as lex
+import os
+import re
+import sys
+from bisect import bisect_right
+from collections import namedtuple
+from diagnosticos import ERROR, Diagnostico
+from salidas import ENCABEZADO_TABLA, Salida, SalidaArchivo, SalidaConsola, volcar
+from traza import traza_consola
+from cache import cargar_modulo, directorio_cache, guardar_en_cache, huella_reglas_lexicas
 
 # Palabras reservadas
 reservadas = {
@@ -45,7 +54,43 @@ t_MAYOR_IGUAL = r'>='
 t_IGUAL_IGUAL = r'=='
 t_DISTINTO = r'!='
 
-# Función auxiliar para registrar errores
+# Lexema de cada regla simple (todas son texto fijo): con el lexer binario, el valor de esos tokens
+# se toma de acá en lugar de decodificarlo
+LEXEMAS = {nombre[2:]: re.sub(r'\\(.)', r'\1', patron) for nombre, patron in list(globals().items())
+           if nombre.startswith('t_') and nombre != 't_ignore' and isinstance(patron, str)}
+
+def texto(valor):
+    """Valor de un token como texto: con el lexer binario llega en bytes (UTF-8)."""
+    return valor if isinstance(valor, str) else str(valor, "utf-8", "replace")
+
+def saltar(t, cantidad):
+    """Avanza el lexer la cantidad de caracteres indicada desde su posición actual.
+
+    Con el lexer binario se avanzan los bytes que ocupan esos caracteres en UTF-8, para no quedar
+    dentro de una secuencia de varios bytes y seguir igual que el lexer de texto."""
+    lexer = t.lexer
+    if not lexer.lexbinary:
+        lexer.skip(cantidad)
+        return
+    datos, inicio = lexer.lexdata, lexer.lexpos
+    fin, largo = inicio, len(datos)
+    for _ in range(cantidad):
+        fin += 1
+        # Los bytes de continuación (10xxxxxx) pertenecen al carácter anterior
+        while fin < largo and 0x80 <= datos[fin] < 0xC0:
+            fin += 1
+    lexer.skip(fin - inicio)
+
+# Funciones auxiliares para registrar errores
+def reportar_error_lexico(t, codigo, *args):
+    """Guarda el diagnóstico del error léxico en la lista del lexer y lo informa en su traza."""
+    # Con la entrada por partes, t.lexpos es relativo a la parte cargada en el lexer
+    inicio = t.lexer.lexoffset + t.lexpos
+    diagnostico = Diagnostico(codigo, ERROR, t.lexer.lineno, calcular_columna(t, t.lexer),
+                              inicio, inicio + len(t.value), tuple(texto(arg) for arg in args))
+    t.lexer.traza.error("lexico", t.lineno, "%s", diagnostico)
+    t.lexer.errores_lexicos.append(diagnostico)
+
 def registrar_error(t, mensaje):
     """Registra un error y lo marca como tipo 'ERROR'."""
     t.type = 'ERROR'
@@ -55,35 +100,36 @@ def registrar_error(t, mensaje):
 # Reglas avanzadas para tokens específicos
 def t_IDENTIFICADOR(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
+    t.value = texto(t.value)
     t.type = reservadas.get(t.value.lower(), 'IDENTIFICADOR')
     return t
 
 def t_INVALIDO_NUMERO_IDENTIFICADOR(t):
     r'\d+[a-zA-Z_][a-zA-Z0-9_]*'
-    column = calcular_columna(t, t.lexer)
-    print(f"Error léxico: Identificador inválido '{t.value}' en línea {t.lexer.lineno}, columna {column} - Los identificadores no pueden comenzar con números.")
+    reportar_error_lexico(t, "L001", t.value)
+    valor = texto(t.value)
     
     i = 0
-    while i < len(t.value):
-        char = t.value[i]
+    while i < len(valor):
+        char = valor[i]
         if char in ",;":
             t.type = 'COMA' if char == ',' else 'PUNTO_Y_COMA'
             t.value = char
             t.lexpos = t.lexpos + i
-            t.lexer.skip(i + 1)
+            saltar(t, i + 1)
             return t
         i += 1
     # Verificar caracteres inmediatamente después del token
     if t.lexer.lexpos < len(t.lexer.lexdata):
-        siguiente = t.lexer.lexdata[t.lexer.lexpos]
+        siguiente = texto(t.lexer.lexdata[t.lexer.lexpos:t.lexer.lexpos + 1])
         if siguiente in ",;":
             t.type = 'COMA' if siguiente == ',' else 'PUNTO_Y_COMA'
             t.value = siguiente
             t.lexpos = t.lexer.lexpos 
-            t.lexer.skip(1)
+            saltar(t, 1)
             return t
     # Avanzar el lexer completamente si no hay separadores
-    t.lexer.skip(len(t.value))
+    saltar(t, len(valor))
 
 def t_NUMERO(t):
     r'\b\d+\b'
@@ -97,53 +143,55 @@ def t_FLOTANTE(t):
 
 def t_INVALIDO_NUMERO(t):
     r'\d+\.\.+\d*|\d+\.\.$|\.\d+\.\d*'
-    column = calcular_columna(t, t.lexer)
-    print(f"Error léxico: Número mal formado '{t.value}' en línea {t.lexer.lineno}, columna {column}.")
-    t.lexer.skip(len(t.value))
+    reportar_error_lexico(t, "L002", t.value)
+    saltar(t, len(t.value))
 
 def t_CARACTER(t):
     r"'([^'\n])'"
-    t.value = t.value[1:-1]
+    t.value = texto(t.value[1:-1])
     return t
 
 def t_INVALIDO_CARACTER(t):
     r"'([^'\n]*['\n]?)"
-    column = calcular_columna(t, t.lexer)
-    
+    valor = texto(t.value)
+    if len(valor) == 3 and valor[0] == valor[2] == "'" and valor[1] not in "'\n":
+        # Con el lexer binario, un carácter de varios bytes no coincide con t_CARACTER
+        t.type = 'CARACTER'
+        t.value = valor[1]
+        return t
     # Detectar si el token contiene un salto de línea o está mal formado
-    if '\n' in t.value or '\r' in t.value:
+    if '\n' in valor or '\r' in valor:
         # Si el literal contiene un salto de línea, mostrar solo la comilla inicial
         valor_limpio = "'"
         descripcion = "Literal de carácter no cerrado."
-    elif len(t.value) > 3:
+    elif len(valor) > 3:
         # Si tiene más de un carácter
-        valor_limpio = t.value  # Mostrar el literal completo
+        valor_limpio = valor  # Mostrar el literal completo
         descripcion = "Solo un carácter permitido en literales de carácter."
-    elif t.value == "''":
+    elif valor == "''":
         # Si está vacío
-        valor_limpio = t.value  # Mostrar el literal vacío
+        valor_limpio = valor  # Mostrar el literal vacío
         descripcion = "Literal de carácter vacío."
     else:
         # Otro caso
-        valor_limpio = t.value
+        valor_limpio = valor
         descripcion = "Falta el cierre del literal o está vacío."
 
     # Imprimir mensaje de error léxico
-    print(f"Error léxico: Literal de carácter inválido '{valor_limpio}' en línea {t.lexer.lineno}, columna {column} - {descripcion}")
+    reportar_error_lexico(t, "L003", valor_limpio, descripcion)
     
     # Continuar el análisis saltando el literal inválido
-    t.lexer.skip(len(t.value))
+    saltar(t, len(valor))
 
 def t_TEXTO(t):
     r'"[^"\n]*"'
-    t.value = t.value[1:-1]
+    t.value = texto(t.value[1:-1])
     return t
 
 def t_INVALIDO_OPERADOR(t):
     r'([+\-*/&|^!]{2,}|\*\*|&{3,}|[+\-*/&|^!]=+)'
-    column = calcular_columna(t, t.lexer)
-    print(f"Error léxico: Operador inválido '{t.value}' en línea {t.lexer.lineno}, columna {column}.")
-    t.lexer.skip(len(t.value))
+    reportar_error_lexico(t, "L004", t.value)
+    saltar(t, len(t.value))
 
 # Manejo de saltos de línea
 def t_newline(t):
@@ -162,50 +210,176 @@ def t_COMMENT(t):
 # Manejo general de errores
 def t_error(t):
     column = calcular_columna(t, t.lexer)
-    mensaje = f"Carácter ilegal '{t.value[0]}' en línea {t.lexer.lineno}, columna {column}."
+    mensaje = f"Carácter ilegal '{texto(t.value[:4])[0]}' en línea {t.lexer.lineno}, columna {column}."
     return registrar_error(t, mensaje)
 
 # Funciones auxiliares
+SALTO_LINEA = re.compile(r'\n')
+SALTO_LINEA_BYTES = re.compile(rb'\n')
+
+def indice_lineas(lexer):
+    """Devuelve los inicios de línea del texto cargado en el lexer; se construyen una sola vez por texto.
+
+    Con la entrada por partes, anota también en linea_base la cantidad de líneas anteriores a la parte cargada."""
+    if lexer.texto_indexado is not lexer.lexdata:
+        if lexer.lexbinary:
+            saltos = SALTO_LINEA_BYTES.finditer(lexer.lexdata or b'')
+        else:
+            saltos = SALTO_LINEA.finditer(lexer.lexdata or '')
+        lexer.inicios_linea = inicios = [0] + [m.end() for m in saltos]
+        lexer.texto_indexado = lexer.lexdata
+        lexer.linea_base = lexer.lineno - bisect_right(inicios, lexer.lexpos) if lexer.lexoffset else 0
+    return lexer.inicios_linea
+
+def columna(inicios, linea, posicion):
+    """Columna de una posición del texto, dada su línea probable y los inicios de línea."""
+    indice = linea - 1
+    # Acceso directo por número de línea; si no coincide, búsqueda binaria
+    if not (0 <= indice < len(inicios) and inicios[indice] <= posicion
+            and (indice + 1 == len(inicios) or posicion < inicios[indice + 1])):
+        indice = bisect_right(inicios, posicion) - 1
+    return (posicion - inicios[indice]) + 1
+
 def calcular_columna(t, lexer):
-    line_start = lexer.lexdata.rfind('\n', 0, t.lexpos) + 1
-    return (t.lexpos - line_start) + 1
+    """Calcula la columna de un token usando el índice de inicios de línea."""
+    inicios = indice_lineas(lexer)
+    return columna(inicios, t.lineno - lexer.linea_base, t.lexpos)
+
+# Tokens de un carácter que t_INVALIDO_NUMERO_IDENTIFICADOR rescata de dentro de un error:
+# el lexer ya avanzó más allá de ellos, así que su fin no es la posición del lexer
+SEPARADORES = frozenset(('COMA', 'PUNTO_Y_COMA'))
+
+class TokenUbicado(lex.LexToken):
+    """Token de PLY con su ubicación completa; los atributos son fijos para que cada token ocupe poco."""
+    __slots__ = ('col', 'endpos', 'end_col')
+
+class AnalizadorLexico(lex.Lexer):
+    """Lexer de PLY que ubica cada token que devuelve: además de lineno y lexpos le agrega
+    col (su columna), endpos (la posición siguiente a su último carácter) y end_col (la columna de endpos).
+
+    Con la entrada por partes (input_file), lexdata tiene solo las líneas cargadas, desde lexoffset:
+    las columnas se calculan sobre ellas y las posiciones de los tokens son las del texto completo.
+    Con el lexer binario (ver lexer_binario), posiciones y columnas se cuentan en bytes."""
+    ubica_tokens = True
+
+    def token(self):
+        tok = lex.Lexer.token(self)
+        if tok is None:
+            return None
+        if tok.value.__class__ is bytes:
+            # Lexer binario: las reglas simples son texto fijo, así que no hace falta decodificar
+            tok.value = LEXEMAS.get(tok.type) or texto(tok.value)
+        lexpos = tok.lexpos
+        desplazamiento = self.lexoffset
+        inicios = self.inicios_linea if self.texto_indexado is self.lexdata else indice_lineas(self)
+        tok.col = col = columna(inicios, tok.lineno - self.linea_base, lexpos - desplazamiento)
+        tok.endpos = endpos = lexpos + 1 if tok.type in SEPARADORES else self.lexpos + desplazamiento
+        tok.end_col = col + (endpos - lexpos)
+        return tok
+
+def reiniciar_lexer(lexer, texto=None):
+    """Deja el lexer listo para un nuevo análisis y, si se indica, le carga el texto."""
+    lexer.lineno = 1
+    lexer.line_start = 0
+    lexer.errores_lexicos = []
+    if texto is not None:
+        lexer.input(texto)
+
+def huella_lexer():
+    """Huella de las reglas del lexer: cambia si cambia lo que produce."""
+    return huella_reglas_lexicas(vars(sys.modules[__name__]), re.VERBOSE)
+
+def construir_analizador():
+    """Crea el lexer desde la tabla en caché; si las reglas cambiaron, la valida, la genera y la guarda.
+
+    El lexer despacha por primer carácter: en cada posición prueba solo las reglas que pueden empezar con él."""
+    modulo = sys.modules[__name__]
+    nombre = "lextab_" + huella_lexer()
+    tabla = cargar_modulo(os.path.join(directorio_cache(), nombre + ".py"), nombre)
+    if tabla is not None and getattr(tabla, "_tabversion", None) == lex.__tabversion__:
+        # Tabla vigente: no se validan las reglas ni se arma la expresión maestra desde cero
+        lexer = lex.lex(module=modulo, optimize=True, lextab=tabla, dispatch=True, tokenclass=TokenUbicado)
+        # Se mantiene el control de tipos de token por regla, igual que sin caché
+        lexer.lexoptimize = False
+    else:
+        lexer = lex.lex(module=modulo, dispatch=True, tokenclass=TokenUbicado)
+        guardar_en_cache(nombre + ".py", lambda temporal: lexer.writetab(
+            os.path.splitext(os.path.basename(temporal))[0], os.path.dirname(temporal)))
+    # lex.lex() siempre crea un Lexer; sus clones conservan la clase
+    lexer.__class__ = AnalizadorLexico
+    return lexer
 
 # Crear el analizador
-analizador = lex.lex()
+analizador = construir_analizador()
 
 # Inicializar variables del lexer
-analizador.line_start = 0
+analizador.inicios_linea = [0]
+analizador.texto_indexado = None
+analizador.linea_base = 0
+analizador.traza = traza_consola
+reiniciar_lexer(analizador)
+
+def lexer_binario(lexer=None):
+    """Copia del lexer (por defecto, el analizador) que analiza bytes en UTF-8, incluso un archivo
+    mapeado en memoria, sin decodificarlos: solo se decodifican los identificadores, textos y caracteres.
+
+    Los tokens y errores son los mismos que con el texto; las posiciones y columnas, en bytes."""
+    binario = (lexer or analizador).clone()
+    binario.set_binary(True)
+    reiniciar_lexer(binario)
+    return binario
+
+# Registro compacto de un token: tipo, valor, línea y columna
+RegistroToken = namedtuple('RegistroToken', 'tipo valor linea columna')
+
+def registro_token(tok, lexer):
+    """Convierte un token de PLY en un registro compacto (la columna ya la calculó el lexer)."""
+    return RegistroToken(tok.type, tok.value, tok.lineno, tok.col)
+
+# Ruta del archivo de salida
+RUTA_TABLA = "archivos_salida/tabla_simbolos.txt"
+
+def tokenizar(texto, lexer=None):
+    """Genera los tokens del texto como registros compactos, sin escribir nada."""
+    if lexer is None:
+        lexer = analizador
+    reiniciar_lexer(lexer, texto)
+
+    for tok in iter(lexer.token, None):
+        yield registro_token(tok, lexer)
+
+def tokenizar_archivo(ruta, lexer=None, tamano=1 << 16):
+    """Como tokenizar, pero leyendo el archivo de a partes de tamano caracteres: la memoria que usa
+    depende del largo de las líneas y no del tamaño del archivo. Con un lexer binario se lee en bytes."""
+    if lexer is None:
+        lexer = analizador
+    reiniciar_lexer(lexer)
+    with (open(ruta, "rb") if lexer.lexbinary else open(ruta, "r", encoding="utf-8")) as archivo:
+        lexer.input_file(archivo, tamano)
+        for tok in iter(lexer.token, None):
+            yield registro_token(tok, lexer)
+
+def escribir_tabla(registros, eco=True, ruta_archivo=RUTA_TABLA):
+    """Escribe la tabla de símbolos con los registros dados en el archivo y, si eco es verdadero, en consola.
+
+    En lugar de la consola, eco también puede ser otra Salida donde repetir la tabla."""
+    salidas = [SalidaArchivo(ruta_archivo)]
+    if isinstance(eco, Salida):
+        salidas.append(eco)
+    elif eco:
+        salidas.append(SalidaConsola())
+
+    try:
+        return volcar(registros, salidas, encabezado=ENCABEZADO_TABLA)
+    finally:
+        for salida in salidas:
+            salida.cerrar()
 
 # Función principal de análisis
-def analizar(texto):
-    analizador.lineno = 1  
-    analizador.line_start = 0  
-    analizador.input(texto)
-
-    # Ruta del archivo de salida
-    ruta_archivo = "archivos_salida/tabla_simbolos.txt"
-
-    # Abrir el archivo en modo escritura
-    with open(ruta_archivo, "w", encoding="utf-8") as archivo:
-        # Encabezado para la tabla de símbolos
-        encabezado = "TOKEN            VALOR           LÍNEA            COLUMNA\n" + "-" * 60 + "\n"
-        print(encabezado, end="")
-        archivo.write(encabezado)
-
-        # Analizar y guardar tokens
-        while True:
-            tok = analizador.token()
-            if not tok:
-                break
-
-            tipo = tok.type.ljust(15)
-            valor = str(tok.value).ljust(15)
-            linea = str(tok.lineno).ljust(4)
-            columna = str(calcular_columna(tok, analizador)).ljust(4)
-            linea_salida = f"Token: {tipo} Valor: {valor} Línea: {linea} Columna: {columna}\n"
-
-            # Imprimir en la consola
-            print(linea_salida, end="")
-
-            # Guardar en el archivo
-            archivo.write(linea_salida)
+def analizar(texto, eco=True, ruta_archivo=RUTA_TABLA, lexer=None):
+    """Tokeniza el texto y escribe su tabla de símbolos (ver escribir_tabla)."""
+    return escribir_tabla(tokenizar(texto, lexer), eco, ruta_archivo)
+
+def analizar_archivo(ruta, eco=True, ruta_archivo=RUTA_TABLA, lexer=None):
+    """Escribe la tabla de símbolos de un archivo sin cargarlo entero (para archivos muy grandes)."""
+    return escribir_tabla(tokenizar_archivo(ruta, lexer), eco, ruta_archivo)
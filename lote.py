@@ -0,0 +1,206 @@
+"""Análisis léxico y sintáctico por lotes, sin interfaz gráfica.
+
+Uso: python lote.py casos_prueba/ "otros/*.txt" --salida archivos_salida/lote
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from cache import directorio_cache, guardar_en_cache, huella, limitar_cache, marcar_uso
+from diagnosticos import formatear_jsonl, orden, sarif
+from lex import ENCABEZADO_TABLA, huella_lexer, registro_token
+from recorrido import preorden
+from salidas import SalidaArchivo, volcar
+from serializacion import VERSION, abrir, guardar
+from sesion import Sesion, huella_texto
+from sin import firma_gramatica, guardar_errores_en_archivo
+from traza import APAGADO, Traza
+
+# Sesión del proceso trabajador (se crea una sola vez por proceso)
+_sesion = None
+# Huella del lexer, la gramática y el formato: forma parte de la clave de cada árbol en caché
+_firma_arboles = None
+# Los árboles en caché se nombran ast_<huella>.bin; al terminar cada lote, si entre todos superan
+# este tamaño, se borran los usados hace más tiempo
+PREFIJO_ARBOLES = "ast_"
+MAXIMO_CACHE_ARBOLES = 256 * 1024 * 1024
+
+def iniciar_trabajador(nivel=APAGADO, con_cache=True):
+    """Prepara la sesión del proceso; las tablas de PLY se cargan una única vez por proceso."""
+    global _sesion, _firma_arboles
+    # Los mensajes por regla solo interesan en la interfaz gráfica: por defecto la traza va apagada
+    _sesion = Sesion(Traza(nivel))
+    _firma_arboles = huella(huella_lexer(), firma_gramatica(), VERSION) if con_cache else None
+
+def arbol_en_cache(codigo):
+    """Árbol guardado de un texto ya analizado sin errores sintácticos (o None) y su nombre en la caché."""
+    if _firma_arboles is None:
+        return None, None
+    nombre = f"{PREFIJO_ARBOLES}{huella(huella_texto(codigo), _firma_arboles)}.bin"
+    ruta = os.path.join(directorio_cache(), nombre)
+    try:
+        arbol = abrir(ruta)
+    except (OSError, ValueError):
+        return None, nombre
+    marcar_uso(ruta)
+    return arbol, nombre
+
+def procesar_archivo(trabajo):
+    """Analiza un archivo y escribe su tabla de tokens y su reporte de errores."""
+    ruta, ruta_tokens, ruta_errores = trabajo
+    inicio = time.perf_counter()
+    resultado = {"archivo": ruta, "tokens": 0, "errores_lexicos": 0, "errores_sintacticos": 0,
+                 "nodos": 0, "arbol_en_cache": False, "error_fatal": None}
+    errores = []
+    diagnosticos = []
+    try:
+        with open(ruta, "r", encoding="utf-8") as archivo:
+            codigo = archivo.read()
+
+        # Una sola pasada del lexer: la tabla y el parser usan los mismos tokens
+        tokens = []
+        try:
+            _sesion.lexear(codigo, tokens)
+        finally:
+            with SalidaArchivo(ruta_tokens) as tabla:
+                resultado["tokens"] = volcar((registro_token(tok, _sesion.lexer) for tok in tokens),
+                                             [tabla], encabezado=ENCABEZADO_TABLA)
+
+        # Un texto que ya se analizó sin errores sintácticos no se vuelve a analizar
+        arbol, nombre = arbol_en_cache(codigo)
+        errores_sintacticos = []
+        if arbol is not None:
+            # El árbol guardado reemplaza al análisis: su cantidad de nodos sale del encabezado
+            with arbol:
+                resultado["nodos"] = arbol.cantidad
+            resultado["arbol_en_cache"] = True
+        else:
+            arbol = _sesion.parse(codigo, tokens)
+            errores_sintacticos = _sesion.errores
+            if arbol is not None:
+                resultado["nodos"] = sum(1 for _ in preorden(arbol))
+            if nombre and arbol is not None and not errores_sintacticos and not _sesion.hay_errores:
+                try:
+                    guardar_en_cache(nombre, lambda temporal: guardar(arbol, temporal))
+                except ValueError:
+                    pass  # el árbol es demasiado grande para el formato: simplemente no se guarda
+        errores.extend(_sesion.errores_lexicos)
+        errores.extend(errores_sintacticos)
+        diagnosticos = [diagnostico._replace(archivo=ruta) for diagnostico in errores]
+        resultado["errores_lexicos"] = len(_sesion.errores_lexicos)
+        resultado["errores_sintacticos"] = len(errores_sintacticos)
+    except Exception as e:
+        resultado["error_fatal"] = f"{type(e).__name__}: {e}"
+        errores.append(f"Error fatal: {e}")
+
+    guardar_errores_en_archivo(errores, ruta_errores)
+    resultado["segundos"] = round(time.perf_counter() - inicio, 6)
+    # Los diagnósticos viajan al proceso principal para volcarlos todos juntos al final
+    resultado["diagnosticos"] = diagnosticos
+    return resultado
+
+def expandir_entradas(entradas):
+    """Convierte directorios y patrones glob en una lista ordenada de archivos."""
+    archivos = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            archivos.extend(glob.glob(os.path.join(entrada, "*.txt")))
+        else:
+            archivos.extend(glob.glob(entrada))
+    return sorted(set(archivos))
+
+def planificar(archivos, directorio_salida):
+    """Asigna a cada entrada rutas de salida únicas dentro del directorio de salida."""
+    trabajos = []
+    usados = set()
+    for ruta in archivos:
+        base = os.path.splitext(os.path.basename(ruta))[0]
+        nombre, n = base, 1
+        while nombre in usados:
+            n += 1
+            nombre = f"{base}_{n}"
+        usados.add(nombre)
+        trabajos.append((ruta,
+                         os.path.join(directorio_salida, nombre + ".tokens.txt"),
+                         os.path.join(directorio_salida, nombre + ".errores.txt")))
+    return trabajos
+
+def ejecutar(trabajos, procesos=None, con_cache=True):
+    """Procesa los trabajos en un pool de procesos (o en este proceso si procesos es 1)."""
+    if procesos == 1:
+        iniciar_trabajador(APAGADO, con_cache)
+        resultados = [procesar_archivo(trabajo) for trabajo in trabajos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, initializer=iniciar_trabajador,
+                                 initargs=(APAGADO, con_cache)) as pool:
+            lote = max(1, len(trabajos) // ((procesos or os.cpu_count() or 1) * 8))
+            resultados = list(pool.map(procesar_archivo, trabajos, chunksize=lote))
+    if con_cache:
+        limitar_cache(PREFIJO_ARBOLES, MAXIMO_CACHE_ARBOLES)
+    return resultados
+
+def resumir(resultados, segundos):
+    """Arma el resumen agregado del lote."""
+    return {
+        "archivos": len(resultados),
+        "correctos": sum(1 for r in resultados if not r["error_fatal"]
+                         and not r["errores_lexicos"] and not r["errores_sintacticos"]),
+        "con_errores": sum(1 for r in resultados if r["error_fatal"]
+                           or r["errores_lexicos"] or r["errores_sintacticos"]),
+        "fatales": sum(1 for r in resultados if r["error_fatal"]),
+        "tokens": sum(r["tokens"] for r in resultados),
+        "errores_lexicos": sum(r["errores_lexicos"] for r in resultados),
+        "errores_sintacticos": sum(r["errores_sintacticos"] for r in resultados),
+        "nodos": sum(r["nodos"] for r in resultados),
+        "arboles_en_cache": sum(1 for r in resultados if r["arbol_en_cache"]),
+        "segundos": round(segundos, 6),
+        "resultados": resultados,
+    }
+
+def escribir_diagnosticos(diagnosticos, formatos, directorio_salida):
+    """Vuelca en bloque los diagnósticos de todos los archivos, en cada formato pedido."""
+    if "jsonl" in formatos:
+        with open(os.path.join(directorio_salida, "diagnosticos.jsonl"), "w", encoding="utf-8") as archivo:
+            archivo.write(formatear_jsonl(diagnosticos))
+    if "sarif" in formatos:
+        with open(os.path.join(directorio_salida, "diagnosticos.sarif"), "w", encoding="utf-8") as archivo:
+            json.dump(sarif(diagnosticos), archivo, ensure_ascii=False, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis léxico y sintáctico por lotes.")
+    parser.add_argument("entradas", nargs="+", help="directorios o patrones glob (ej. casos_prueba/*.txt)")
+    parser.add_argument("--salida", default=os.path.join("archivos_salida", "lote"),
+                        help="directorio donde se escriben las tablas, los reportes y el resumen")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="cantidad de procesos (por defecto, uno por CPU)")
+    parser.add_argument("--diagnosticos", action="append", choices=("jsonl", "sarif"), default=[],
+                        help="escribe también todos los diagnósticos juntos en diagnosticos.jsonl o .sarif")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="no reutilizar ni guardar los árboles de archivos ya analizados")
+    args = parser.parse_args(argv)
+
+    archivos = expandir_entradas(args.entradas)
+    if not archivos:
+        parser.error("no se encontraron archivos para analizar")
+
+    os.makedirs(args.salida, exist_ok=True)
+    inicio = time.perf_counter()
+    resultados = ejecutar(planificar(archivos, args.salida), args.procesos, not args.sin_cache)
+    diagnosticos = sorted((d for r in resultados for d in r.pop("diagnosticos")), key=orden)
+    resumen = resumir(resultados, time.perf_counter() - inicio)
+    escribir_diagnosticos(diagnosticos, args.diagnosticos, args.salida)
+
+    with open(os.path.join(args.salida, "resumen.json"), "w", encoding="utf-8") as archivo:
+        json.dump(resumen, archivo, ensure_ascii=False, indent=2)
+
+    print(f"Archivos analizados: {resumen['archivos']}  Correctos: {resumen['correctos']}  "
+          f"Con errores: {resumen['con_errores']}  Fatales: {resumen['fatales']}")
+    print(f"Tokens: {resumen['tokens']}  Errores léxicos: {resumen['errores_lexicos']}  "
+          f"Errores sintácticos: {resumen['errores_sintacticos']}  Tiempo: {resumen['segundos']:.2f} s")
+    return 1 if resumen["con_errores"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
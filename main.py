@@ -1,11 +1,37 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
-import sys
-import io
-from lex import analizador, analizar
-from sin import parser, parser_state, errores_sintacticos, reiniciar_parser, guardar_errores_en_archivo, graficar_arbol
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sin import guardar_errores_en_archivo
+from grafico import RUTA_DOT, exportar_arbol, subarbol
+from sesion import Sesion
+from salidas import SalidaTexto
+from traza import INFO, Traza, formatear_eventos
 from PIL import Image, ImageTk
 
+# Cada cuántos milisegundos la ventana revisa el trabajo en segundo plano
+INTERVALO_REVISION = 50
+# Máximo de fragmentos de texto que se agregan a los resultados en cada revisión
+FRAGMENTOS_POR_REVISION = 500
+# Fases de un análisis completo; cada una ocupa una parte igual de la barra de progreso
+FASES_ANALISIS = ("lexico", "sintactico")
+
+class AnalisisCancelado(Exception):
+    """Interrumpe el trabajo en segundo plano cuando el usuario lo cancela."""
+
+class FlujoCola:
+    """Flujo de texto que deja lo escrito en una cola para mostrarlo desde el hilo de Tk."""
+    def __init__(self, cola, cancelado):
+        self.cola = cola
+        self.cancelado = cancelado
+
+    def write(self, texto):
+        # Mientras se escriben resultados también se atiende la cancelación (ver CompilerGUI.avanzar)
+        if self.cancelado.is_set():
+            raise AnalisisCancelado()
+        self.cola.put(texto)
+
 class CompilerGUI:
     def __init__(self, root):
         self.root = root
@@ -85,14 +111,48 @@ class CompilerGUI:
         ]
 
         # Crear botones con los estilos definidos
+        self.botones = []
         for text, command, bg_color, fg_color in button_styles:
-            self.create_button(buttons_frame, text, command, bg_color, fg_color)
-
-        # Redireccionar stdout
-        self.stdout_redirector = io.StringIO()
-        self.original_stdout = sys.stdout
+            self.botones.append(self.create_button(buttons_frame, text, command, bg_color, fg_color))
 
         self.generate_tree_button = self.create_button(buttons_frame, "Generar Árbol", self.generar_arbol, "#dc3545", "white")
+        self.botones.append(self.generate_tree_button)
+
+        self.cancel_button = self.create_button(buttons_frame, "Cancelar", self.cancelar, "#6c757d", "white")
+        self.cancel_button.config(state=tk.DISABLED)
+
+        # Avance del trabajo en segundo plano
+        self.progreso = ttk.Progressbar(buttons_frame, mode="determinate", maximum=100, length=200)
+        self.progreso.pack(side=tk.LEFT, padx=2)
+
+        # Opciones del árbol: profundidad máxima (0 = sin límite) y subárbol como ruta de hijos ("0.2.1")
+        ttk.Label(buttons_frame, text="Profundidad").pack(side=tk.LEFT, padx=(6, 2))
+        self.profundidad = ttk.Spinbox(buttons_frame, from_=0, to=99, width=4)
+        self.profundidad.set(0)
+        self.profundidad.pack(side=tk.LEFT, padx=2)
+        ttk.Label(buttons_frame, text="Subárbol").pack(side=tk.LEFT, padx=(6, 2))
+        self.ruta_subarbol = ttk.Entry(buttons_frame, width=10)
+        self.ruta_subarbol.pack(side=tk.LEFT, padx=2)
+
+        # El análisis corre en un hilo aparte; lo que produce llega a la ventana por esta cola
+        self.cola = queue.Queue()
+        self.cancelado = threading.Event()
+        self.ejecutor = ThreadPoolExecutor(max_workers=1)
+        self.trabajo = None
+        # Último árbol graficado, para no volver a llamar a Graphviz con el mismo árbol
+        self.grafico = None
+        self.salida_resultados = SalidaTexto(FlujoCola(self.cola, self.cancelado))
+
+        # Sesión de análisis propia de la ventana; sus mensajes se suman a los resultados
+        self.traza = Traza(INFO)
+        self.traza.suscribir(SalidaTexto(self.salida_resultados.flujo, formatear_eventos))
+        self.sesion = Sesion(self.traza)
+        # Última fase informada por la sesión y la fracción hecha de ella
+        self.avance = None
+        self.fases = FASES_ANALISIS
+        self.sesion.vigilar(self.avanzar)
+
+        root.protocol("WM_DELETE_WINDOW", self.cerrar)
 
 
     def create_button(self, parent, text, command, bg_color, fg_color):
@@ -132,19 +192,86 @@ class CompilerGUI:
 
         return f"#{r:02x}{g:02x}{b:02x}"
 
-    def redirect_stdout(self):
-        sys.stdout = self.stdout_redirector
-        self.stdout_redirector.seek(0)
-        self.stdout_redirector.truncate()
+    def iniciar_trabajo(self, tarea, al_terminar, mensaje_error, fases=FASES_ANALISIS):
+        """Ejecuta la tarea en segundo plano; al_terminar recibe su resultado en el hilo de Tk.
 
-    def restore_stdout(self):
-        sys.stdout = self.original_stdout
-        output = self.stdout_redirector.getvalue()
+        fases son las fases de la sesión que recorre la tarea, para repartir entre ellas la barra de progreso."""
+        if self.trabajo is not None:
+            return
+        self.cancelado.clear()
         self.output_text.delete(1.0, tk.END)
-        self.output_text.insert(tk.END, output)
-        self.system_text.insert(tk.END, "Análisis ejecutado correctamente.\n")
+        self.avance = None
+        self.fases = fases
+        self.estados_botones = [boton.cget("state") for boton in self.botones]
+        for boton in self.botones:
+            boton.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progreso.config(value=0)
+        self.trabajo = self.ejecutor.submit(tarea)
+        self.root.after(INTERVALO_REVISION, self.revisar_trabajo, al_terminar, mensaje_error)
+
+    def revisar_trabajo(self, al_terminar, mensaje_error):
+        """Muestra lo producido hasta ahora y, si el trabajo terminó, su resultado."""
+        if not self.trabajo.done():
+            self.mostrar_pendientes(FRAGMENTOS_POR_REVISION)
+            avance = self.avance
+            if avance is not None and avance[0] in self.fases:
+                fase, fraccion = avance
+                self.progreso.config(value=100 * (self.fases.index(fase) + fraccion) / len(self.fases))
+            self.root.after(INTERVALO_REVISION, self.revisar_trabajo, al_terminar, mensaje_error)
+            return
+
+        trabajo, self.trabajo = self.trabajo, None
+        self.mostrar_pendientes()
+        for boton, estado in zip(self.botones, self.estados_botones):
+            boton.config(state=estado)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progreso.config(value=0)
+        try:
+            resultado = trabajo.result()
+        except AnalisisCancelado:
+            self.system_text.insert(tk.END, "Análisis cancelado.\n")
+        except Exception as e:
+            self.system_text.insert(tk.END, f"{mensaje_error}: {str(e)}\n")
+        else:
+            if al_terminar:
+                al_terminar(resultado)
+            self.system_text.insert(tk.END, "Análisis ejecutado correctamente.\n")
         self.system_text.see(tk.END)
 
+    def avanzar(self, fase, hecho, total):
+        """La sesión la llama desde el hilo de análisis mientras lexea y analiza: guarda el avance
+        y, si el usuario canceló, interrumpe el análisis."""
+        if self.cancelado.is_set():
+            raise AnalisisCancelado()
+        self.avance = (fase, hecho / max(total, 1))
+
+    def mostrar_pendientes(self, maximo=None):
+        """Agrega a los resultados el texto que el hilo de análisis dejó en la cola."""
+        partes = []
+        try:
+            while maximo is None or len(partes) < maximo:
+                partes.append(self.cola.get_nowait())
+        except queue.Empty:
+            pass
+        if partes:
+            self.mostrar_resultado("".join(partes))
+
+    def mostrar_resultado(self, texto):
+        self.output_text.insert(tk.END, texto)
+        self.output_text.see(tk.END)
+
+    def cancelar(self):
+        if self.trabajo is not None:
+            self.cancelado.set()
+            self.system_text.insert(tk.END, "Cancelando el análisis...\n")
+            self.system_text.see(tk.END)
+
+    def cerrar(self):
+        self.cancelado.set()
+        self.ejecutor.shutdown(wait=False)
+        self.root.destroy()
+
     def load_file(self):
         file_path = filedialog.askopenfilename(
             filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
@@ -161,87 +288,99 @@ class CompilerGUI:
                 self.system_text.insert(tk.END, f"Error al cargar el archivo: {str(e)}\n")
 
     def analisis_lexico(self):
-        try:
-            codigo = self.code_text.get(1.0, tk.END)
-            self.redirect_stdout()
-            analizar(codigo)
-            self.restore_stdout()
-        except Exception as e:
-            self.restore_stdout()
-            self.system_text.insert(tk.END, f"Error en el análisis léxico: {str(e)}\n")
-            self.system_text.see(tk.END)
+        codigo = self.code_text.get(1.0, tk.END)
+        self.iniciar_trabajo(lambda: self.sesion.tabla_simbolos(codigo, eco=self.salida_resultados),
+                             None, "Error en el análisis léxico", fases=("lexico",))
 
     def analisis_sintactico(self):
-        try:
-            # Limpiar el estado del parser
-            reiniciar_parser()
-            errores_sintacticos.clear()  # Limpiar la lista de errores
-            parser_state.clear_error()  # Reiniciar el estado del parser
-            parser.error = False  # Reiniciar indicador de errores en el parser
-
-            # Obtener el código de entrada
-            codigo = self.code_text.get(1.0, tk.END)
-            self.redirect_stdout()
-
-            # Reiniciar el lexer
-            analizador.lineno = 1
-            analizador.line_start = 0
-
-            # Ejecutar el análisis sintáctico
-            arbol = parser.parse(codigo, lexer=analizador)
-
+        # Obtener el código de entrada
+        codigo = self.code_text.get(1.0, tk.END)
+
+        def tarea():
+            # Ejecutar el análisis sintáctico (si el código no cambió, se reutiliza el último resultado)
+            resultado = self.sesion.analisis(codigo)
+            if resultado.hay_errores:
+                guardar_errores_en_archivo(resultado.errores)  # Guardar los errores detectados en un archivo
+            return resultado
+
+        def al_terminar(resultado):
+            arbol = resultado.arbol
             # Verificar el resultado del análisis
-            if parser.error or parser_state.error_found:
-                print("\nErrores detectados durante el análisis sintáctico. No se puede construir el árbol.")
+            if resultado.hay_errores:
+                self.mostrar_resultado("\nErrores detectados durante el análisis sintáctico. No se puede construir el árbol.\n")
                 self.generate_tree_button.config(state=tk.DISABLED)  # Deshabilitar el botón
-                guardar_errores_en_archivo()  # Guardar los errores detectados en un archivo
             elif arbol:
-                print("\nEl análisis sintáctico finalizó correctamente.")
+                self.mostrar_resultado("\nEl análisis sintáctico finalizó correctamente.\n")
                 self.generate_tree_button.config(state=tk.NORMAL)  # Habilitar el botón
             else:
-                print("\nNo se puede construir el árbol sintáctico.")
+                self.mostrar_resultado("\nNo se puede construir el árbol sintáctico.\n")
                 self.generate_tree_button.config(state=tk.DISABLED)
 
-            self.restore_stdout()
-        except Exception as e:
-            self.restore_stdout()
-            self.system_text.insert(tk.END, f"Error en el análisis sintáctico: {str(e)}\n")
-            self.system_text.see(tk.END)
+        self.iniciar_trabajo(tarea, al_terminar, "Error en el análisis sintáctico")
 
     def generar_arbol(self):
+        codigo = self.code_text.get(1.0, tk.END)
+        # Tk solo se consulta desde su hilo: el tamaño del canvas y las opciones se leen antes de empezar
+        ancho = max(self.image_canvas.winfo_width(), 1)
+        alto = max(self.image_canvas.winfo_height(), 1)
+        dpi = round(self.image_canvas.winfo_fpixels('1i'))
         try:
-            codigo = self.code_text.get(1.0, tk.END)
-            self.redirect_stdout()
-            analizador.lineno = 1
-            analizador.line_start = 0
-            arbol = parser.parse(codigo, lexer=analizador)
-            if arbol:
-                dot = graficar_arbol(arbol)
-                dot_path = 'archivos_salida/arbol_sintactico.dot'
-                output_path = dot.render(dot_path, format='png', cleanup=False)
-
-                with open(dot_path, 'r', encoding='utf-8') as file:
+            profundidad = int(self.profundidad.get() or 0) or None
+        except ValueError:
+            profundidad = None
+        ruta = self.ruta_subarbol.get()
+
+        def tarea():
+            # El árbol sale del último análisis si el código no cambió
+            arbol = self.sesion.analisis(codigo).arbol
+            if not arbol:
+                return None
+            clave = (arbol, ruta, profundidad, ancho, alto, dpi)
+            if self.grafico is not None and self.grafico[0] == clave:
+                return self.grafico[1]
+            # El DOT se escribe directo a disco; Graphviz y la lectura de la imagen quedan fuera del hilo de Tk
+            formato, output_path, nodos = exportar_arbol(subarbol(arbol, ruta), ancho, alto, dpi, profundidad)
+            if self.cancelado.is_set():
+                raise AnalisisCancelado()
+            dot_content = img = None
+            if formato == 'png':
+                with open(RUTA_DOT, 'r', encoding='utf-8') as file:
                     dot_content = file.read()
-                    self.output_text.delete(1.0, tk.END)
-                    self.output_text.insert(tk.END, f"=== Contenido de {dot_path} ===\n")
-                    self.output_text.insert(tk.END, dot_content)
-
-                self.show_image_in_canvas(output_path)
-            else:
-                print("No se pudo construir el árbol sintáctico.")
-            self.restore_stdout()
-        except Exception as e:
-            self.restore_stdout()
-            self.system_text.insert(tk.END, f"Error al generar el árbol: {str(e)}\n")
-            self.system_text.see(tk.END)
-
-    def show_image_in_canvas(self, image_path):
+                img = Image.open(output_path)
+                img.thumbnail((ancho, alto))
+            self.grafico = (clave, (RUTA_DOT, dot_content, output_path, img, nodos))
+            return self.grafico[1]
+
+        def al_terminar(resultado):
+            if resultado is None:
+                self.mostrar_resultado("No se pudo construir el árbol sintáctico.\n")
+                return
+            dot_path, dot_content, output_path, img, nodos = resultado
+            if img is None:
+                # Demasiados nodos para leerse en el canvas: queda el SVG para abrirlo aparte
+                mensaje = f"El árbol tiene {nodos} nodos; se guardó como SVG en {output_path}"
+                self.mostrar_resultado(mensaje + "\n")
+                self.image_canvas.delete("all")
+                self.image_canvas.create_text(self.image_canvas.winfo_width() // 2,
+                                              self.image_canvas.winfo_height() // 2,
+                                              text=mensaje, width=self.image_canvas.winfo_width() - 20)
+                return
+            self.mostrar_resultado(f"=== Contenido de {dot_path} ===\n")
+            self.mostrar_resultado(dot_content)
+            self.show_image_in_canvas(output_path, img)
+
+        self.iniciar_trabajo(tarea, al_terminar, "Error al generar el árbol")
+
+    def show_image_in_canvas(self, image_path, img=None):
         try:
-            img = Image.open(image_path)
-            img.thumbnail((400, 400))
+            ancho = max(self.image_canvas.winfo_width(), 1)
+            alto = max(self.image_canvas.winfo_height(), 1)
+            if img is None:
+                img = Image.open(image_path)
+                img.thumbnail((ancho, alto))
             self.image_tk = ImageTk.PhotoImage(img)
             self.image_canvas.delete("all")
-            self.image_canvas.create_image(200, 200, image=self.image_tk, anchor=tk.CENTER)
+            self.image_canvas.create_image(ancho // 2, alto // 2, image=self.image_tk, anchor=tk.CENTER)
             self.system_text.insert(tk.END, f"Imagen mostrada en el Canvas: {image_path}\n")
             self.system_text.see(tk.END)
         except Exception as e:
@@ -1,92 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'leftOR_COROR_LARleftAND_CORAND_LARleftMENORMENOR_IGUALMAYORMAYOR_IGUALIGUAL_IGUALDISTINTOleftSUMARESTAleftMULTIPLICACIONDIVISIONAND_COR AND_LAR CARACTER CHAR COMA DISTINTO DIVISION ERROR FLOAT FLOTANTE IDENTIFICADOR IGUAL IGUAL_IGUAL IMPRIMIR INT LEER LLAVE_DER LLAVE_IZQ MAYOR MAYOR_IGUAL MENOR MENOR_IGUAL MIENTRAS MULTIPLICACION NUMERO OR_COR OR_LAR PARENTESIS_DER PARENTESIS_IZQ PROGRAMA PUNTO_Y_COMA RESTA SI SINO SUMA TERMINAR TEXTOPrograma : PROGRAMA IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER LLAVE_IZQ Sentencias Terminar LLAVE_DERSentencias : Sentencias : SentenciaSentencias : Sentencias SentenciaSentencia : DeclaracionSentencia : AsignacionSentencia : ImprimirSentencia : LeerSentencia : MientrasSentencia : SiLeer : LEER IDENTIFICADOR PUNTO_Y_COMAImprimir : IMPRIMIR PARENTESIS_IZQ ContenidoImprimir PARENTESIS_DER PUNTO_Y_COMAImprimir : IMPRIMIR PARENTESIS_IZQ ContenidoImprimir PARENTESIS_DER errorImprimir : IMPRIMIR PARENTESIS_IZQ error PARENTESIS_DER PUNTO_Y_COMAContenidoImprimir : TEXTOContenidoImprimir : IDENTIFICADORContenidoImprimir : ContenidoImprimir COMA ContenidoImprimirDeclaracion : Tipo ListaIdentificadores PUNTO_Y_COMADeclaracion : Tipo IDENTIFICADOR IGUAL Expresion PUNTO_Y_COMADeclaracion : Tipo error PUNTO_Y_COMADeclaracion : Tipo IDENTIFICADOR errorTipo : INT\n            | FLOAT\n            | CHARListaIdentificadores : IDENTIFICADORListaIdentificadores : ListaIdentificadores COMA IDENTIFICADORAsignacion : IDENTIFICADOR IGUAL Expresion PUNTO_Y_COMAAsignacion : error IGUAL Expresion PUNTO_Y_COMAAsignacion : IDENTIFICADOR IGUAL error PUNTO_Y_COMAExpresion : NUMEROExpresion : IDENTIFICADORExpresion : Expresion SUMA ExpresionExpresion : Expresion RESTA ExpresionExpresion : Expresion MULTIPLICACION ExpresionExpresion : Expresion DIVISION ExpresionExpresion : error SUMA Expresion\n                 | Expresion SUMA error\n                 | error RESTA Expresion\n                 | Expresion RESTA error\n                 | error MULTIPLICACION Expresion\n                 | Expresion MULTIPLICACION error\n                 | error DIVISION Expresion\n                 | Expresion DIVISION errorMientras : MIENTRAS PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DERMientras : MIENTRAS PARENTESIS_IZQ error PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DERSi : SI PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DERSi : SI PARENTESIS_IZQ error PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DERSi : SI PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER SINO LLAVE_IZQ Sentencias LLAVE_DERSi : SINO LLAVE_IZQ Sentencias LLAVE_DERCondicion : Expresion MENOR Expresion\n                 | Expresion MENOR_IGUAL Expresion\n                 | Expresion MAYOR Expresion\n                 | Expresion MAYOR_IGUAL Expresion\n                 | Expresion IGUAL_IGUAL Expresion\n                 | Expresion DISTINTO ExpresionCondicion : Condicion AND_COR Condicion\n                 | Condicion AND_LAR Condicion\n                 | Condicion OR_COR Condicion\n                 | Condicion OR_LAR CondicionCondicion : Expresion MENOR errorTerminar : TERMINAR PUNTO_Y_COMATerminar : TERMINAR error'
-    
-_lr_action_items = {'PROGRAMA':([0,],[2,]),'$end':([1,43,],[0,-1,]),'IDENTIFICADOR':([2,6,8,9,10,11,12,13,14,15,16,19,23,24,25,26,28,33,34,36,37,38,46,47,48,49,50,57,63,64,65,66,67,68,69,70,71,72,73,76,78,81,82,83,84,86,87,88,89,90,91,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[3,7,7,-3,-5,-6,-7,-8,-9,-10,31,35,-22,-23,-24,39,-4,39,56,39,39,7,-18,74,39,-21,-20,-11,7,-27,39,39,39,39,-29,39,39,39,39,-28,56,39,39,39,39,39,39,39,39,39,39,-49,-19,-12,-13,-14,7,7,7,7,7,7,7,7,-44,-45,-46,-47,7,7,-48,]),'PARENTESIS_IZQ':([3,18,20,21,],[4,34,36,37,]),'PARENTESIS_DER':([4,39,42,53,54,55,56,58,59,61,62,95,96,97,98,99,100,101,102,103,104,105,106,110,113,114,115,116,118,119,120,121,122,123,124,],[5,-31,-30,77,79,-15,-16,80,85,92,93,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,-17,-56,-57,-58,-59,-50,-60,-51,-52,-53,-54,-55,]),'LLAVE_IZQ':([5,22,80,85,92,93,135,],[6,38,112,117,125,126,136,]),'TERMINAR':([6,8,9,10,11,12,13,14,15,28,46,49,50,57,64,69,76,94,107,108,109,111,131,132,133,134,138,],[-2,29,-3,-5,-6,-7,-8,-9,-10,-4,-18,-21,-20,-11,-27,-29,-28,-49,-19,-12,-13,-14,-44,-45,-46,-47,-48,]),'error':([6,8,9,10,11,12,13,14,15,16,23,24,25,26,28,29,31,33,34,36,37,38,46,48,49,50,57,63,64,65,66,67,68,69,70,71,72,73,76,77,81,82,83,84,86,87,88,89,90,91,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[17,17,-3,-5,-6,-7,-8,-9,-10,32,-22,-23,-24,41,-4,45,49,51,54,59,62,17,-18,51,-21,-20,-11,17,-27,96,98,100,102,-29,51,51,51,51,-28,109,51,51,51,51,119,51,51,51,51,51,-49,-19,-12,-13,-14,17,17,17,17,17,17,17,17,-44,-45,-46,-47,17,17,-48,]),'IMPRIMIR':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[18,18,-3,-5,-6,-7,-8,-9,-10,-4,18,-18,-21,-20,-11,18,-27,-29,-28,-49,-19,-12,-13,-14,18,18,18,18,18,18,18,18,-44,-45,-46,-47,18,18,-48,]),'LEER':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[19,19,-3,-5,-6,-7,-8,-9,-10,-4,19,-18,-21,-20,-11,19,-27,-29,-28,-49,-19,-12,-13,-14,19,19,19,19,19,19,19,19,-44,-45,-46,-47,19,19,-48,]),'MIENTRAS':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[20,20,-3,-5,-6,-7,-8,-9,-10,-4,20,-18,-21,-20,-11,20,-27,-29,-28,-49,-19,-12,-13,-14,20,20,20,20,20,20,20,20,-44,-45,-46,-47,20,20,-48,]),'SI':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[21,21,-3,-5,-6,-7,-8,-9,-10,-4,21,-18,-21,-20,-11,21,-27,-29,-28,-49,-19,-12,-13,-14,21,21,21,21,21,21,21,21,-44,-45,-46,-47,21,21,-48,]),'SINO':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[22,22,-3,-5,-6,-7,-8,-9,-10,-4,22,-18,-21,-20,-11,22,-27,-29,-28,-49,-19,-12,-13,-14,22,22,22,22,22,22,22,22,-44,-45,135,-47,22,22,-48,]),'INT':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[23,23,-3,-5,-6,-7,-8,-9,-10,-4,23,-18,-21,-20,-11,23,-27,-29,-28,-49,-19,-12,-13,-14,23,23,23,23,23,23,23,23,-44,-45,-46,-47,23,23,-48,]),'FLOAT':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[24,24,-3,-5,-6,-7,-8,-9,-10,-4,24,-18,-21,-20,-11,24,-27,-29,-28,-49,-19,-12,-13,-14,24,24,24,24,24,24,24,24,-44,-45,-46,-47,24,24,-48,]),'CHAR':([6,8,9,10,11,12,13,14,15,28,38,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[25,25,-3,-5,-6,-7,-8,-9,-10,-4,25,-18,-21,-20,-11,25,-27,-29,-28,-49,-19,-12,-13,-14,25,25,25,25,25,25,25,25,-44,-45,-46,-47,25,25,-48,]),'IGUAL':([7,17,31,],[26,33,48,]),'LLAVE_DER':([9,10,11,12,13,14,15,27,28,38,44,45,46,49,50,57,63,64,69,76,94,107,108,109,111,112,117,125,126,127,128,129,130,131,132,133,134,136,137,138,],[-3,-5,-6,-7,-8,-9,-10,43,-4,-2,-61,-62,-18,-21,-20,-11,94,-27,-29,-28,-49,-19,-12,-13,-14,-2,-2,-2,-2,131,132,133,134,-44,-45,-46,-47,-2,138,-48,]),'NUMERO':([26,33,36,37,48,65,66,67,68,70,71,72,73,81,82,83,84,86,87,88,89,90,91,],[42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,42,]),'PUNTO_Y_COMA':([29,30,31,32,35,39,40,41,42,52,74,75,77,79,95,96,97,98,99,100,101,102,103,104,105,106,],[44,46,-25,50,57,-31,64,69,-30,76,-26,107,108,111,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'COMA':([30,31,53,55,56,74,110,],[47,-25,78,-15,-16,-26,78,]),'TEXTO':([34,78,],[55,55,]),'SUMA':([39,40,41,42,51,52,59,60,62,75,95,96,97,98,99,100,101,102,103,104,105,106,118,119,120,121,122,123,124,],[-31,65,70,-30,70,65,70,65,70,65,-32,70,-33,70,-34,70,-35,70,-36,-38,-40,-42,65,70,65,65,65,65,65,]),'RESTA':([39,40,41,42,51,52,59,60,62,75,95,96,97,98,99,100,101,102,103,104,105,106,118,119,120,121,122,123,124,],[-31,66,71,-30,71,66,71,66,71,66,-32,71,-33,71,-34,71,-35,71,-36,-38,-40,-42,66,71,66,66,66,66,66,]),'MULTIPLICACION':([39,40,41,42,51,52,59,60,62,75,95,96,97,98,99,100,101,102,103,104,105,106,118,119,120,121,122,123,124,],[-31,67,72,-30,72,67,72,67,72,67,67,72,67,72,-34,72,-35,72,67,67,-40,-42,67,72,67,67,67,67,67,]),'DIVISION':([39,40,41,42,51,52,59,60,62,75,95,96,97,98,99,100,101,102,103,104,105,106,118,119,120,121,122,123,124,],[-31,68,73,-30,73,68,73,68,73,68,68,73,68,73,-34,73,-35,73,68,68,-40,-42,68,73,68,68,68,68,68,]),'MENOR':([39,42,60,95,96,97,98,99,100,101,102,103,104,105,106,],[-31,-30,86,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'MENOR_IGUAL':([39,42,60,95,96,97,98,99,100,101,102,103,104,105,106,],[-31,-30,87,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'MAYOR':([39,42,60,95,96,97,98,99,100,101,102,103,104,105,106,],[-31,-30,88,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'MAYOR_IGUAL':([39,42,60,95,96,97,98,99,100,101,102,103,104,105,106,],[-31,-30,89,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'IGUAL_IGUAL':([39,42,60,95,96,97,98,99,100,101,102,103,104,105,106,],[-31,-30,90,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'DISTINTO':([39,42,60,95,96,97,98,99,100,101,102,103,104,105,106,],[-31,-30,91,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,]),'AND_COR':([39,42,58,61,95,96,97,98,99,100,101,102,103,104,105,106,113,114,115,116,118,119,120,121,122,123,124,],[-31,-30,81,81,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,-56,-57,81,81,-50,-60,-51,-52,-53,-54,-55,]),'AND_LAR':([39,42,58,61,95,96,97,98,99,100,101,102,103,104,105,106,113,114,115,116,118,119,120,121,122,123,124,],[-31,-30,82,82,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,-56,-57,82,82,-50,-60,-51,-52,-53,-54,-55,]),'OR_COR':([39,42,58,61,95,96,97,98,99,100,101,102,103,104,105,106,113,114,115,116,118,119,120,121,122,123,124,],[-31,-30,83,83,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,-56,-57,-58,-59,-50,-60,-51,-52,-53,-54,-55,]),'OR_LAR':([39,42,58,61,95,96,97,98,99,100,101,102,103,104,105,106,113,114,115,116,118,119,120,121,122,123,124,],[-31,-30,84,84,-32,-37,-33,-39,-34,-41,-35,-43,-36,-38,-40,-42,-56,-57,-58,-59,-50,-60,-51,-52,-53,-54,-55,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'Programa':([0,],[1,]),'Sentencias':([6,38,112,117,125,126,136,],[8,63,127,128,129,130,137,]),'Sentencia':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[9,28,9,28,9,9,9,9,28,28,28,28,9,28,]),'Declaracion':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[10,10,10,10,10,10,10,10,10,10,10,10,10,10,]),'Asignacion':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[11,11,11,11,11,11,11,11,11,11,11,11,11,11,]),'Imprimir':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[12,12,12,12,12,12,12,12,12,12,12,12,12,12,]),'Leer':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,]),'Mientras':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[14,14,14,14,14,14,14,14,14,14,14,14,14,14,]),'Si':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[15,15,15,15,15,15,15,15,15,15,15,15,15,15,]),'Tipo':([6,8,38,63,112,117,125,126,127,128,129,130,136,137,],[16,16,16,16,16,16,16,16,16,16,16,16,16,16,]),'Terminar':([8,],[27,]),'ListaIdentificadores':([16,],[30,]),'Expresion':([26,33,36,37,48,65,66,67,68,70,71,72,73,81,82,83,84,86,87,88,89,90,91,],[40,52,60,60,75,95,97,99,101,103,104,105,106,60,60,60,60,118,120,121,122,123,124,]),'ContenidoImprimir':([34,78,],[53,110,]),'Condicion':([36,37,81,82,83,84,],[58,61,113,114,115,116,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> Programa","S'",1,None,None,None),
-  ('Programa -> PROGRAMA IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER LLAVE_IZQ Sentencias Terminar LLAVE_DER','Programa',8,'p_programa','sin.py',98),
-  ('Sentencias -> <empty>','Sentencias',0,'p_sentencias_vacia','sin.py',106),
-  ('Sentencias -> Sentencia','Sentencias',1,'p_sentencias_unica','sin.py',111),
-  ('Sentencias -> Sentencias Sentencia','Sentencias',2,'p_sentencias_multiples','sin.py',118),
-  ('Sentencia -> Declaracion','Sentencia',1,'p_sentencia_declaracion','sin.py',123),
-  ('Sentencia -> Asignacion','Sentencia',1,'p_sentencia_asignacion','sin.py',127),
-  ('Sentencia -> Imprimir','Sentencia',1,'p_sentencia_imprimir','sin.py',131),
-  ('Sentencia -> Leer','Sentencia',1,'p_sentencia_leer','sin.py',135),
-  ('Sentencia -> Mientras','Sentencia',1,'p_sentencia_mientras','sin.py',139),
-  ('Sentencia -> Si','Sentencia',1,'p_sentencia_si','sin.py',143),
-  ('Leer -> LEER IDENTIFICADOR PUNTO_Y_COMA','Leer',3,'p_leer','sin.py',148),
-  ('Imprimir -> IMPRIMIR PARENTESIS_IZQ ContenidoImprimir PARENTESIS_DER PUNTO_Y_COMA','Imprimir',5,'p_imprimir','sin.py',156),
-  ('Imprimir -> IMPRIMIR PARENTESIS_IZQ ContenidoImprimir PARENTESIS_DER error','Imprimir',5,'p_imprimir_error_falta_punto_y_coma','sin.py',164),
-  ('Imprimir -> IMPRIMIR PARENTESIS_IZQ error PARENTESIS_DER PUNTO_Y_COMA','Imprimir',5,'p_imprimir_error_argumentos','sin.py',171),
-  ('ContenidoImprimir -> TEXTO','ContenidoImprimir',1,'p_contenido_imprimir_texto','sin.py',179),
-  ('ContenidoImprimir -> IDENTIFICADOR','ContenidoImprimir',1,'p_contenido_imprimir_variable','sin.py',183),
-  ('ContenidoImprimir -> ContenidoImprimir COMA ContenidoImprimir','ContenidoImprimir',3,'p_contenido_imprimir_multiples','sin.py',187),
-  ('Declaracion -> Tipo ListaIdentificadores PUNTO_Y_COMA','Declaracion',3,'p_declaracion_simple','sin.py',192),
-  ('Declaracion -> Tipo IDENTIFICADOR IGUAL Expresion PUNTO_Y_COMA','Declaracion',5,'p_declaracion_asignacion','sin.py',200),
-  ('Declaracion -> Tipo error PUNTO_Y_COMA','Declaracion',3,'p_declaracion_error_identificador','sin.py',208),
-  ('Declaracion -> Tipo IDENTIFICADOR error','Declaracion',3,'p_declaracion_error_punto_y_coma','sin.py',215),
-  ('Tipo -> INT','Tipo',1,'p_tipo','sin.py',223),
-  ('Tipo -> FLOAT','Tipo',1,'p_tipo','sin.py',224),
-  ('Tipo -> CHAR','Tipo',1,'p_tipo','sin.py',225),
-  ('ListaIdentificadores -> IDENTIFICADOR','ListaIdentificadores',1,'p_lista_identificadores_unico','sin.py',230),
-  ('ListaIdentificadores -> ListaIdentificadores COMA IDENTIFICADOR','ListaIdentificadores',3,'p_lista_identificadores_multiples','sin.py',234),
-  ('Asignacion -> IDENTIFICADOR IGUAL Expresion PUNTO_Y_COMA','Asignacion',4,'p_asignacion','sin.py',239),
-  ('Asignacion -> error IGUAL Expresion PUNTO_Y_COMA','Asignacion',4,'p_asignacion_error_identificador','sin.py',246),
-  ('Asignacion -> IDENTIFICADOR IGUAL error PUNTO_Y_COMA','Asignacion',4,'p_asignacion_error_faltante','sin.py',253),
-  ('Expresion -> NUMERO','Expresion',1,'p_expresion_numero','sin.py',261),
-  ('Expresion -> IDENTIFICADOR','Expresion',1,'p_expresion_identificador','sin.py',265),
-  ('Expresion -> Expresion SUMA Expresion','Expresion',3,'p_expresion_suma','sin.py',269),
-  ('Expresion -> Expresion RESTA Expresion','Expresion',3,'p_expresion_resta','sin.py',277),
-  ('Expresion -> Expresion MULTIPLICACION Expresion','Expresion',3,'p_expresion_multiplicacion','sin.py',285),
-  ('Expresion -> Expresion DIVISION Expresion','Expresion',3,'p_expresion_division','sin.py',293),
-  ('Expresion -> error SUMA Expresion','Expresion',3,'p_expresion_error_operador','sin.py',301),
-  ('Expresion -> Expresion SUMA error','Expresion',3,'p_expresion_error_operador','sin.py',302),
-  ('Expresion -> error RESTA Expresion','Expresion',3,'p_expresion_error_operador','sin.py',303),
-  ('Expresion -> Expresion RESTA error','Expresion',3,'p_expresion_error_operador','sin.py',304),
-  ('Expresion -> error MULTIPLICACION Expresion','Expresion',3,'p_expresion_error_operador','sin.py',305),
-  ('Expresion -> Expresion MULTIPLICACION error','Expresion',3,'p_expresion_error_operador','sin.py',306),
-  ('Expresion -> error DIVISION Expresion','Expresion',3,'p_expresion_error_operador','sin.py',307),
-  ('Expresion -> Expresion DIVISION error','Expresion',3,'p_expresion_error_operador','sin.py',308),
-  ('Mientras -> MIENTRAS PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER','Mientras',7,'p_mientras','sin.py',316),
-  ('Mientras -> MIENTRAS PARENTESIS_IZQ error PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER','Mientras',7,'p_mientras_error','sin.py',324),
-  ('Si -> SI PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER','Si',7,'p_si','sin.py',332),
-  ('Si -> SI PARENTESIS_IZQ error PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER','Si',7,'p_si_error_incompleto','sin.py',340),
-  ('Si -> SI PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER SINO LLAVE_IZQ Sentencias LLAVE_DER','Si',11,'p_si_sino','sin.py',347),
-  ('Si -> SINO LLAVE_IZQ Sentencias LLAVE_DER','Si',4,'p_si_sino_error','sin.py',356),
-  ('Condicion -> Expresion MENOR Expresion','Condicion',3,'p_condicion_comparacion','sin.py',364),
-  ('Condicion -> Expresion MENOR_IGUAL Expresion','Condicion',3,'p_condicion_comparacion','sin.py',365),
-  ('Condicion -> Expresion MAYOR Expresion','Condicion',3,'p_condicion_comparacion','sin.py',366),
-  ('Condicion -> Expresion MAYOR_IGUAL Expresion','Condicion',3,'p_condicion_comparacion','sin.py',367),
-  ('Condicion -> Expresion IGUAL_IGUAL Expresion','Condicion',3,'p_condicion_comparacion','sin.py',368),
-  ('Condicion -> Expresion DISTINTO Expresion','Condicion',3,'p_condicion_comparacion','sin.py',369),
-  ('Condicion -> Condicion AND_COR Condicion','Condicion',3,'p_condicion_logica','sin.py',377),
-  ('Condicion -> Condicion AND_LAR Condicion','Condicion',3,'p_condicion_logica','sin.py',378),
-  ('Condicion -> Condicion OR_COR Condicion','Condicion',3,'p_condicion_logica','sin.py',379),
-  ('Condicion -> Condicion OR_LAR Condicion','Condicion',3,'p_condicion_logica','sin.py',380),
-  ('Condicion -> Expresion MENOR error','Condicion',3,'p_condicion_error_operador','sin.py',387),
-  ('Terminar -> TERMINAR PUNTO_Y_COMA','Terminar',2,'p_terminar','sin.py',395),
-  ('Terminar -> TERMINAR error','Terminar',2,'p_error_terminar_punto_y_coma','sin.py',402),
-]
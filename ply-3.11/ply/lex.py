@@ -40,6 +40,8 @@ import types
 import copy
 import os
 import inspect
+import codecs
+from array import array
 
 # This tuple contains known string types
 try:
@@ -60,8 +62,12 @@ class LexError(Exception):
         self.text = s
 
 
-# Token class.  This class is used to represent the tokens produced.
+# Token class.  This class is used to represent the tokens produced.  Its
+# attributes are fixed (__slots__), which keeps tokens small; rules that need
+# to set attributes of their own can use a subclass (see lex(tokenclass=...))
 class LexToken(object):
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
     def __str__(self):
         return 'LexToken(%s,%r,%d,%d)' % (self.type, self.value, self.lineno, self.lexpos)
 
@@ -69,6 +75,64 @@ class LexToken(object):
         return str(self)
 
 
+# Token that takes any attribute, as LexToken did before it had __slots__
+class LexTokenDict(LexToken):
+    __slots__ = ('__dict__',)
+
+
+# Tokens stored column by column, as produced by Lexer.tokenize_all() and
+# Lexer.iter_batches().  Token i has type typenames[types[i]], starts at
+# lexpos[i], ends at endpos[i] (where lexing went on after it) and is on line
+# lineno[i].  Values are not stored: value(i) is the text of the token in the
+# input, sliced when asked for.  With chunked input, lexdata is the part of
+# the input the batch was lexed from, and positions are relative to it.
+class TokenArrays(object):
+    def __init__(self, lexdata, typenames, lexoffset=0):
+        self.lexdata = lexdata
+        self.lexoffset = lexoffset    # Position of lexdata[0] in the whole input
+        self.typenames = typenames    # Shared with the lexer: type id -> type name
+        self.types = array('H')
+        self.lexpos = array('I')
+        self.endpos = array('I')
+        self.lineno = array('I')
+
+    def __len__(self):
+        return len(self.types)
+
+    def type(self, i):
+        return self.typenames[self.types[i]]
+
+    def value(self, i):
+        return self.lexdata[self.lexpos[i]:self.endpos[i]]
+
+    def token(self, i):
+        tok = LexToken()
+        tok.type = self.typenames[self.types[i]]
+        tok.value = self.lexdata[self.lexpos[i]:self.endpos[i]]
+        tok.lineno = self.lineno[i]
+        tok.lexpos = self.lexoffset + self.lexpos[i]
+        return tok
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self.token(i)
+
+
+# Reads a file (or anything with read(), such as an mmap) in pieces of size
+# characters or bytes, decoding bytes when an encoding is given
+def _read_chunks(read, size, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)() if encoding else None
+    while True:
+        chunk = read(size)
+        if not chunk:
+            break
+        yield decoder.decode(chunk) if decoder else chunk
+    if decoder:
+        rest = decoder.decode(b'', True)
+        if rest:
+            yield rest
+
+
 # This object is a stand-in for a logging object created by the
 # logging module.
 
@@ -105,8 +169,14 @@ class NullLogger(object):
 # a few public methods and attributes:
 #
 #    input()          -  Store a new string in the lexer
+#    input_chunks()   -  Lex input given in pieces, keeping only part of it
+#    input_file()     -  Lex a file in pieces
 #    token()          -  Get the next token
 #    clone()          -  Clone the lexer
+#    set_dispatch()   -  Turn the first-character dispatch on or off
+#    set_binary()     -  Lex bytes instead of strings
+#    tokenize_all()   -  Get all of the remaining tokens as TokenArrays
+#    iter_batches()   -  Get the remaining tokens as TokenArrays of n tokens
 #
 #    lineno           -  Current line number
 #    lexpos           -  Current position in the input string
@@ -132,6 +202,8 @@ class Lexer:
         self.lexdata = None           # Actual input data (as a string)
         self.lexpos = 0               # Current position in input text
         self.lexlen = 0               # Length of the input text
+        self.lexoffset = 0            # Position of lexdata[0] in the whole input (chunked input)
+        self.lexchunks = None         # Rest of the chunked input (None: lexdata has all of it)
         self.lexerrorf = None         # Error rule (if any)
         self.lexeoff = None           # EOF rule (if any)
         self.lextokens = None         # List of valid tokens
@@ -140,6 +212,12 @@ class Lexer:
         self.lexmodule = None         # Module
         self.lineno = 1               # Current line number
         self.lexoptimize = False      # Optimized mode
+        self.lexstatedispatch = {}    # Dictionary mapping lexer states to first-character dispatch maps
+        self.lexdispatch = None       # Dispatch map of the current state (None: always use lexre)
+        self.lextypenames = []        # Token type names by type id (for TokenArrays)
+        self.lextypeids = {}          # Token type ids by type name
+        self.lextokenclass = LexToken # Class of the tokens produced
+        self.lexbinary = False        # Lex bytes (master regexes compiled as bytes patterns)
 
     def clone(self, object=None):
         c = copy.copy(self)
@@ -166,6 +244,8 @@ class Lexer:
             for key, ef in self.lexstateerrorf.items():
                 c.lexstateerrorf[key] = getattr(object, ef.__name__)
             c.lexmodule = object
+            if c.lexstatedispatch:
+                c.set_dispatch(True)
         return c
 
     # ------------------------------------------------------------
@@ -231,6 +311,7 @@ class Lexer:
             txtitem = []
             for pat, func_name in lre:
                 titem.append((re.compile(pat, lextab._lexreflags), _names_to_funcs(func_name, fdict)))
+                txtitem.append(pat)
 
             self.lexstatere[statename] = titem
             self.lexstateretext[statename] = txtitem
@@ -249,13 +330,89 @@ class Lexer:
     # input() - Push a new string into the lexer
     # ------------------------------------------------------------
     def input(self, s):
-        # Pull off the first character to see if s looks like a string
+        # Pull off the first character to see if s looks like a string (or bytes)
         c = s[:1]
-        if not isinstance(c, StringTypes):
+        if not isinstance(c, StringTypes) and not isinstance(c, (bytearray, memoryview)):
             raise ValueError('Expected a string')
         self.lexdata = s
         self.lexpos = 0
         self.lexlen = len(s)
+        self.lexoffset = 0
+        self.lexchunks = None
+
+    # ------------------------------------------------------------
+    # input_chunks() - Push new input given as an iterable of strings
+    # input_file()   - Push a file (or an mmap) as new input, read in
+    #                  pieces of size characters or bytes
+    #
+    # Only part of the input is kept in lexdata: from the start of the
+    # line being lexed to what was read.  Tokens start before the last
+    # newline read (lexlen); when token() gets there, refill() drops the
+    # lines already lexed and reads pieces up to the next newline.  A match
+    # that goes past lexlen is tried again with more input, so tokens that
+    # span lines come out right; but error rules, literals and anchors
+    # such as $ only see the text read.
+    #
+    # Rules see positions in lexdata, as always.  The tokens returned by
+    # token() have lexpos in the whole input: lexoffset plus the position
+    # in lexdata.
+    # ------------------------------------------------------------
+    def input_chunks(self, chunks):
+        self.lexdata = None
+        self.lexpos = 0
+        self.lexlen = 0
+        self.lexoffset = 0
+        self.lexchunks = iter(chunks)
+        self.refill()
+
+    def input_file(self, f, size=65536, encoding=None):
+        self.input_chunks(_read_chunks(f.read, size, encoding))
+
+    # ------------------------------------------------------------
+    # refill() - Read more of the chunked input, keeping the line that
+    #            contains lexpos.  Returns False if all of it was read.
+    # ------------------------------------------------------------
+    def refill(self):
+        chunks = self.lexchunks
+        if chunks is None:
+            return False
+        data = self.lexdata
+        pieces = []
+        if data:
+            newline = b'\n' if isinstance(data, bytes) else '\n'
+            cut = data.rfind(newline, 0, self.lexpos) + 1
+            pieces.append(data[cut:])
+            self.lexoffset += cut
+            self.lexpos -= cut
+        for chunk in chunks:
+            if not isinstance(chunk[:1], StringTypes):
+                raise ValueError('Expected a string')
+            pieces.append(chunk)
+            newline = b'\n' if isinstance(chunk, bytes) else '\n'
+            if newline in chunk:
+                break
+        else:
+            self.lexchunks = None
+        data = pieces[0][:0].join(pieces) if pieces else ''
+        self.lexdata = data
+        if self.lexchunks is None:
+            self.lexlen = len(data)
+        else:
+            # Up to a newline with something read after it, so that a match
+            # ending at lexlen can't go on in the input not read yet
+            self.lexlen = data.rfind(newline, 0, len(data) - 1) + 1
+        return True
+
+    # ------------------------------------------------------------
+    # stop() - End the input at lexpos: the rest is discarded and, if the
+    #          input is chunked, nothing more is read.  token() returns
+    #          None next (after calling the EOF rule, if there is one).
+    #          It can be called between calls to token() or from a rule,
+    #          including the error rule (which then needn't skip).
+    # ------------------------------------------------------------
+    def stop(self):
+        self.lexchunks = None
+        self.lexlen = self.lexpos
 
     # ------------------------------------------------------------
     # begin() - Changes the lexing state
@@ -266,10 +423,55 @@ class Lexer:
         self.lexre = self.lexstatere[state]
         self.lexretext = self.lexstateretext[state]
         self.lexignore = self.lexstateignore.get(state, '')
+        if self.lexbinary:
+            self.lexignore = self.lexignore.encode('latin-1')
         self.lexerrorf = self.lexstateerrorf.get(state, None)
         self.lexeoff = self.lexstateeoff.get(state, None)
+        self.lexdispatch = self.lexstatedispatch.get(state)
         self.lexstate = state
 
+    # ------------------------------------------------------------
+    # set_dispatch() - Turns the first-character dispatch on or off
+    #
+    # With dispatch on, token() picks the master regexes to try from
+    # the character at the current position, using a map from each
+    # character to the rules that can start with it.  Tokens don't
+    # change; states whose rules can't be classified use lexre.
+    # ------------------------------------------------------------
+    def set_dispatch(self, enabled=True):
+        self.lexstatedispatch = {}
+        if enabled:
+            for state, lexre in self.lexstatere.items():
+                lexretext = self.lexstateretext.get(state, [])
+                if self.lexbinary:
+                    lexretext = [text.encode('latin-1') for text in lexretext]
+                dispatch = _build_dispatch(lexre, lexretext, self.lexreflags)
+                if dispatch is not None:
+                    self.lexstatedispatch[state] = dispatch
+        self.lexdispatch = self.lexstatedispatch.get(self.lexstate)
+
+    # ------------------------------------------------------------
+    # set_binary() - Turns lexing of bytes on or off
+    #
+    # With binary on, the master regexes are compiled again from their
+    # text encoded as Latin-1 (one byte per character), so that rules with
+    # ASCII patterns match the same bytes in any ASCII-compatible encoding
+    # such as UTF-8.  The input can be bytes, bytearray, memoryview or
+    # mmap; positions are byte offsets and token values are bytes, except
+    # for literals, whose value is their character as always.
+    # ------------------------------------------------------------
+    def set_binary(self, enabled=True):
+        self.lexbinary = enabled
+        lexstatere = {}
+        for state, lexre in self.lexstatere.items():
+            lexretext = self.lexstateretext[state]
+            lexstatere[state] = [(re.compile(text.encode('latin-1') if enabled else text, self.lexreflags), findex)
+                                 for (cre, findex), text in zip(lexre, lexretext)]
+        self.lexstatere = lexstatere
+        self.begin(self.lexstate)
+        if self.lexstatedispatch:
+            self.set_dispatch(True)
+
     # ------------------------------------------------------------
     # push_state() - Changes the lexing state and saves old on stack
     # ------------------------------------------------------------
@@ -308,21 +510,43 @@ class Lexer:
         lexlen    = self.lexlen
         lexignore = self.lexignore
         lexdata   = self.lexdata
+        lexoffset = self.lexoffset
+        chunked   = self.lexchunks is not None
+
+        while True:
+            if lexpos >= lexlen:
+                if not chunked:
+                    break
+                # End of the chunked input read so far: read more
+                self.lexpos = lexpos
+                self.refill()
+                lexpos    = self.lexpos
+                lexlen    = self.lexlen
+                lexdata   = self.lexdata
+                lexoffset = self.lexoffset
+                chunked   = self.lexchunks is not None
+                continue
 
-        while lexpos < lexlen:
             # This code provides some short-circuit code for whitespace, tabs, and other ignored characters
             if lexdata[lexpos] in lexignore:
                 lexpos += 1
                 continue
 
-            # Look for a regular expression match
-            for lexre, lexindexfunc in self.lexre:
+            # Look for a regular expression match (only among the rules that can
+            # start with the current character, if there is a dispatch map)
+            lexdispatch = self.lexdispatch
+            for lexre, lexindexfunc in (self.lexre if lexdispatch is None else lexdispatch[lexdata[lexpos]]):
                 m = lexre.match(lexdata, lexpos)
                 if not m:
                     continue
 
+                if chunked and m.end() > lexlen:
+                    # The token may go on in input not read yet: read more and match again
+                    lexlen = lexpos
+                    break
+
                 # Create a token for return
-                tok = LexToken()
+                tok = self.lextokenclass()
                 tok.value = m.group()
                 tok.lineno = self.lineno
                 tok.lexpos = lexpos
@@ -334,6 +558,8 @@ class Lexer:
                     # If no token type was set, it's an ignored token
                     if tok.type:
                         self.lexpos = m.end()
+                        if lexoffset:
+                            tok.lexpos += lexoffset
                         return tok
                     else:
                         lexpos = m.end()
@@ -353,6 +579,7 @@ class Lexer:
                 if not newtok:
                     lexpos    = self.lexpos         # This is here in case user has updated lexpos.
                     lexignore = self.lexignore      # This is here in case there was a state change
+                    lexlen    = self.lexlen         # This is here in case the rule called stop()
                     break
 
                 # Verify type of the token.  If not in the token map, raise an error
@@ -362,21 +589,26 @@ class Lexer:
                             func.__code__.co_filename, func.__code__.co_firstlineno,
                             func.__name__, newtok.type), lexdata[lexpos:])
 
+                if lexoffset:
+                    newtok.lexpos += lexoffset
                 return newtok
             else:
                 # No match, see if in literals
-                if lexdata[lexpos] in self.lexliterals:
-                    tok = LexToken()
-                    tok.value = lexdata[lexpos]
+                c = lexdata[lexpos]
+                if self.lexbinary:
+                    c = chr(c)
+                if c in self.lexliterals:
+                    tok = self.lextokenclass()
+                    tok.value = c
                     tok.lineno = self.lineno
                     tok.type = tok.value
-                    tok.lexpos = lexpos
+                    tok.lexpos = lexpos + lexoffset
                     self.lexpos = lexpos + 1
                     return tok
 
                 # No match. Call t_error() if defined.
                 if self.lexerrorf:
-                    tok = LexToken()
+                    tok = self.lextokenclass()
                     tok.value = self.lexdata[lexpos:]
                     tok.lineno = self.lineno
                     tok.type = 'error'
@@ -384,19 +616,22 @@ class Lexer:
                     tok.lexpos = lexpos
                     self.lexpos = lexpos
                     newtok = self.lexerrorf(tok)
-                    if lexpos == self.lexpos:
-                        # Error method didn't change text position at all. This is an error.
+                    if lexpos == self.lexpos and lexpos < self.lexlen:
+                        # Error method didn't change text position at all (nor stopped). This is an error.
                         raise LexError("Scanning error. Illegal character '%s'" % (lexdata[lexpos]), lexdata[lexpos:])
                     lexpos = self.lexpos
+                    lexlen = self.lexlen
                     if not newtok:
                         continue
+                    if lexoffset:
+                        newtok.lexpos += lexoffset
                     return newtok
 
                 self.lexpos = lexpos
-                raise LexError("Illegal character '%s' at index %d" % (lexdata[lexpos], lexpos), lexdata[lexpos:])
+                raise LexError("Illegal character '%s' at index %d" % (lexdata[lexpos], lexpos + self.lexoffset), lexdata[lexpos:])
 
         if self.lexeoff:
-            tok = LexToken()
+            tok = self.lextokenclass()
             tok.type = 'eof'
             tok.value = ''
             tok.lineno = self.lineno
@@ -404,6 +639,8 @@ class Lexer:
             tok.lexer = self
             self.lexpos = lexpos
             newtok = self.lexeoff(tok)
+            if newtok and lexoffset:
+                newtok.lexpos += lexoffset
             return newtok
 
         self.lexpos = lexpos + 1
@@ -411,6 +648,198 @@ class Lexer:
             raise RuntimeError('No input string given with input()')
         return None
 
+    # ------------------------------------------------------------
+    # tokenize_all() - Return all of the remaining tokens as TokenArrays
+    # iter_batches() - Yield the remaining tokens as TokenArrays of up
+    #                  to n tokens each
+    #
+    # These produce the same tokens as token(), running the same rules,
+    # but store them column by column.  Only rules defined by functions
+    # get a LexToken; simple rules and literals are stored directly.
+    # With chunked input a batch ends wherever more input is read, so each
+    # one slices its values from its own part of the input.
+    # ------------------------------------------------------------
+    def tokenize_all(self):
+        if self.lexchunks is not None:
+            raise RuntimeError('tokenize_all() needs the whole input; use iter_batches() with chunked input')
+        tokens = TokenArrays(self.lexdata, self.lextypenames)
+        self.fill(tokens)
+        return tokens
+
+    def iter_batches(self, n):
+        if n < 1:
+            raise ValueError('Batch size must be at least 1')
+        while True:
+            tokens = TokenArrays(self.lexdata, self.lextypenames, self.lexoffset)
+            more = self.fill(tokens, n)
+            if tokens:
+                yield tokens
+            if not more:
+                return
+
+    # ------------------------------------------------------------
+    # fill() - Append up to n tokens (all of them if n is None) to
+    #          a TokenArrays.  Returns True if there may be more tokens
+    #          left (it stopped because of n, because chunked input needs
+    #          reading more, or an EOF rule gave more input).
+    #
+    # This is the loop of token(), storing tokens instead of returning them
+    # ------------------------------------------------------------
+    def fill(self, tokens, n=None):
+        if self.lexdata is None:
+            raise RuntimeError('No input string given with input()')
+        if not self.lextypeids:
+            for name in sorted(self.lextokens_all):
+                self.lextypeids[name] = len(self.lextypenames)
+                self.lextypenames.append(name)
+
+        lexpos    = self.lexpos
+        lexlen    = self.lexlen
+        lexignore = self.lexignore
+        lexdata   = self.lexdata
+        chunked   = self.lexchunks is not None
+        typeids   = self.lextypeids
+        add_type  = tokens.types.append
+        add_start = tokens.lexpos.append
+        add_end   = tokens.endpos.append
+        add_line  = tokens.lineno.append
+        limit     = len(tokens) + n if n is not None else None
+
+        def typeid(name):
+            # Types returned by rules but not declared (error tokens, for instance)
+            if name not in typeids:
+                typeids[name] = len(self.lextypenames)
+                self.lextypenames.append(name)
+            return typeids[name]
+
+        while True:
+            if limit is not None and len(tokens) >= limit:
+                self.lexpos = lexpos
+                return True
+
+            if lexpos >= lexlen:
+                if not chunked:
+                    break
+                self.lexpos = lexpos
+                if tokens:
+                    # The tokens of a batch all come from the same lexdata
+                    return True
+                self.refill()
+                lexpos  = self.lexpos
+                lexlen  = self.lexlen
+                lexdata = self.lexdata
+                chunked = self.lexchunks is not None
+                tokens.lexdata = lexdata
+                tokens.lexoffset = self.lexoffset
+                continue
+
+            if lexdata[lexpos] in lexignore:
+                lexpos += 1
+                continue
+
+            lexdispatch = self.lexdispatch
+            for lexre, lexindexfunc in (self.lexre if lexdispatch is None else lexdispatch[lexdata[lexpos]]):
+                m = lexre.match(lexdata, lexpos)
+                if not m:
+                    continue
+
+                if chunked and m.end() > lexlen:
+                    lexlen = lexpos
+                    break
+
+                func, tokentype = lexindexfunc[m.lastindex]
+
+                if not func:
+                    if tokentype:
+                        add_type(typeids[tokentype] if tokentype in typeids else typeid(tokentype))
+                        add_start(lexpos)
+                        add_end(m.end())
+                        add_line(self.lineno)
+                    lexpos = m.end()
+                    break
+
+                tok = self.lextokenclass()
+                tok.value = m.group()
+                tok.lineno = self.lineno
+                tok.lexpos = lexpos
+                tok.type = tokentype
+                tok.lexer = self
+                self.lexmatch = m
+                self.lexpos = lexpos = m.end()
+
+                newtok = func(tok)
+
+                lexpos    = self.lexpos
+                lexignore = self.lexignore
+                lexlen    = self.lexlen
+                if not newtok:
+                    break
+
+                if not self.lexoptimize:
+                    if newtok.type not in self.lextokens_all:
+                        raise LexError("%s:%d: Rule '%s' returned an unknown token type '%s'" % (
+                            func.__code__.co_filename, func.__code__.co_firstlineno,
+                            func.__name__, newtok.type), lexdata[lexpos:])
+
+                add_type(typeid(newtok.type))
+                add_start(newtok.lexpos)
+                add_end(lexpos)
+                add_line(newtok.lineno)
+                break
+            else:
+                c = lexdata[lexpos]
+                if self.lexbinary:
+                    c = chr(c)
+                if c in self.lexliterals:
+                    add_type(typeid(c))
+                    add_start(lexpos)
+                    add_end(lexpos + 1)
+                    add_line(self.lineno)
+                    lexpos += 1
+                    continue
+
+                # No match. Call t_error() as token() does
+                self.lexpos = lexpos
+                if not self.lexerrorf:
+                    raise LexError("Illegal character '%s' at index %d" % (lexdata[lexpos], lexpos + self.lexoffset), lexdata[lexpos:])
+                tok = self.lextokenclass()
+                tok.value = lexdata[lexpos:]
+                tok.lineno = self.lineno
+                tok.type = 'error'
+                tok.lexer = self
+                tok.lexpos = lexpos
+                newtok = self.lexerrorf(tok)
+                if lexpos == self.lexpos and lexpos < self.lexlen:
+                    raise LexError("Scanning error. Illegal character '%s'" % (lexdata[lexpos]), lexdata[lexpos:])
+                lexpos = self.lexpos
+                lexlen = self.lexlen
+                if newtok:
+                    lexignore = self.lexignore
+                    add_type(typeid(newtok.type))
+                    add_start(newtok.lexpos)
+                    add_end(lexpos)
+                    add_line(newtok.lineno)
+
+        self.lexpos = lexpos
+        if self.lexeoff:
+            tok = self.lextokenclass()
+            tok.type = 'eof'
+            tok.value = ''
+            tok.lineno = self.lineno
+            tok.lexpos = lexpos
+            tok.lexer = self
+            newtok = self.lexeoff(tok)
+            if not newtok:
+                return False
+            add_type(typeid(newtok.type))
+            add_start(newtok.lexpos)
+            add_end(newtok.lexpos)
+            add_line(newtok.lineno)
+            # An EOF rule that loaded more input ends the batch; the next one lexes the new input
+            return self.lexpos < self.lexlen or self.lexdata is not lexdata
+        self.lexpos = lexpos + 1
+        return False
+
     # Iterator interface
     def __iter__(self):
         return self
@@ -522,6 +951,267 @@ def _form_master_re(relist, reflags, ldict, toknames):
         rlist, rre, rnames = _form_master_re(relist[m:], reflags, ldict, toknames)
         return (llist+rlist), (lre+rre), (lnames+rnames)
 
+# -----------------------------------------------------------------------------
+#                    === First-character dispatch ===
+#
+# The master regex is one big alternation that the re module tries branch by
+# branch at every position.  Most rules can only match text starting with a
+# few characters, so for each character that starts some rule we precompute a
+# smaller master regex holding only the rules that can match there, in their
+# original order.  Since the rules left out cannot match at that position, the
+# smaller regex finds the same match as the full one.  Characters not in the
+# map use the full master regex.
+# -----------------------------------------------------------------------------
+
+try:
+    import re._parser as sre_parse
+    import re._constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+_REPEATS = tuple(getattr(sre_constants, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')
+                 if hasattr(sre_constants, name))
+_GROUPREFS = tuple(getattr(sre_constants, name) for name in ('GROUPREF', 'GROUPREF_EXISTS', 'GROUPREF_IGNORE')
+                   if hasattr(sre_constants, name))
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+
+_CATEGORIES = {
+    sre_constants.CATEGORY_DIGIT: r'\d', sre_constants.CATEGORY_NOT_DIGIT: r'\D',
+    sre_constants.CATEGORY_SPACE: r'\s', sre_constants.CATEGORY_NOT_SPACE: r'\S',
+    sre_constants.CATEGORY_WORD: r'\w', sre_constants.CATEGORY_NOT_WORD: r'\W',
+}
+
+class _FirstChars(object):
+    '''Set of character codes a regex can start with.  Codes below limit are listed
+    one by one; wide means that any code from limit up may also start a match.'''
+    def __init__(self, limit):
+        self.limit = limit
+        self.codes = set()
+        self.wide = False
+
+    def add(self, code):
+        if code < self.limit:
+            self.codes.add(code)
+        else:
+            self.wide = True
+
+# Raised when the first characters of a rule can't be worked out
+class _Unknown(Exception):
+    pass
+
+def _first_in(items, first, flags, text):
+    # Character class: [...]
+    negate = items and items[0][0] is sre_constants.NEGATE
+    chars = _FirstChars(first.limit)
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            chars.add(av)
+        elif op is sre_constants.RANGE:
+            lo, hi = av
+            for code in range(lo, min(hi + 1, chars.limit)):
+                chars.codes.add(code)
+            if hi >= chars.limit:
+                chars.wide = True
+        elif op is sre_constants.CATEGORY:
+            if av not in _CATEGORIES:
+                raise _Unknown()
+            catre = re.compile(_CATEGORIES[av].encode('ascii') if not text else _CATEGORIES[av], flags)
+            for code in range(chars.limit):
+                if catre.match(chr(code) if text else bytes((code,))):
+                    chars.codes.add(code)
+            chars.wide = True
+        elif op is not sre_constants.NEGATE:
+            raise _Unknown()
+    if negate:
+        chars.codes = set(range(chars.limit)) - chars.codes
+        chars.wide = True
+    first.codes |= chars.codes
+    first.wide = first.wide or chars.wide
+
+def _first_of(items, first, flags, text):
+    # Adds to first the characters the sequence items can start with.  Returns True
+    # if the sequence can match the empty string (so what follows it counts too)
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            first.add(av)
+            return False
+        elif op is sre_constants.IN:
+            _first_in(av, first, flags, text)
+            return False
+        elif op in (sre_constants.ANY, sre_constants.NOT_LITERAL):
+            first.codes.update(range(first.limit))
+            first.wide = True
+            return False
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.SUBPATTERN:
+            add_flags, del_flags, sub = av[1], av[2], av[-1]
+            if (add_flags | del_flags) & (re.IGNORECASE | re.LOCALE):
+                raise _Unknown()
+            if not _first_of(sub, first, flags, text):
+                return False
+        elif op is _ATOMIC_GROUP:
+            if not _first_of(av, first, flags, text):
+                return False
+        elif op is sre_constants.BRANCH:
+            empty = False
+            for alt in av[1]:
+                empty = _first_of(alt, first, flags, text) or empty
+            if not empty:
+                return False
+        elif op in _REPEATS:
+            lo, hi, sub = av
+            if not _first_of(sub, first, flags, text) and lo > 0:
+                return False
+        else:
+            raise _Unknown()
+    return True
+
+def _has_groupref(items):
+    for op, av in items:
+        if op in _GROUPREFS:
+            return True
+        if op is sre_constants.SUBPATTERN and _has_groupref(av[-1]):
+            return True
+        if op is sre_constants.BRANCH and any(_has_groupref(alt) for alt in av[1]):
+            return True
+        if op in _REPEATS and _has_groupref(av[2]):
+            return True
+        if op is _ATOMIC_GROUP and _has_groupref(av):
+            return True
+    return False
+
+def _first_chars(regex, reflags):
+    '''Returns the _FirstChars of a rule regex, or None if it could start with anything'''
+    text = not isinstance(regex, bytes)
+    try:
+        parsed = sre_parse.parse(regex, reflags)
+        flags = parsed.state.flags
+        if flags & (re.IGNORECASE | re.LOCALE):
+            return None
+        first = _FirstChars(128 if text else 256)
+        if _first_of(parsed, first, flags & ~re.VERBOSE, text):
+            return None
+        return first
+    except (_Unknown, re.error, TypeError, ValueError):
+        return None
+
+def _split_master_re(regex, reflags):
+    '''Splits the text of a master regex back into its rules, or returns None'''
+    if isinstance(regex, bytes):
+        # Latin-1 maps each byte to one character, so the split points are the same
+        parts = _split_master_re(regex.decode('latin-1'), reflags)
+        return parts and [part.encode('latin-1') for part in parts]
+    verbose = reflags & re.VERBOSE
+    parts = []
+    start = depth = i = 0
+    inclass = False
+    while i < len(regex):
+        c = regex[i]
+        if c == '\\':
+            i += 1
+        elif inclass:
+            if c == ']':
+                inclass = False
+        elif c == '[':
+            inclass = True
+            # A ']' right after '[' or '[^' is a literal
+            if regex[i+1:i+2] == '^':
+                i += 1
+            if regex[i+1:i+2] == ']':
+                i += 1
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '#' and verbose:
+            end = regex.find('\n', i)
+            i = len(regex) if end < 0 else end
+        elif c == '|' and depth == 0:
+            parts.append(regex[start:i])
+            start = i + 1
+        i += 1
+    parts.append(regex[start:])
+
+    # Check the split against the regex parser: one top level alternative per part
+    try:
+        parsed = sre_parse.parse(regex, reflags)
+        if len(parsed) == 1 and parsed[0][0] is sre_constants.BRANCH:
+            count = len(parsed[0][1][1])
+        else:
+            count = 1
+        if count != len(parts) or _has_groupref(parsed):
+            return None
+        for part in parts:
+            re.compile(part, reflags)
+    except re.error:
+        return None
+    return parts
+
+def _compile_rules(rules, reflags, entries):
+    # Compiles a list of rule regexes into [(re, findex)], taking the function and
+    # token type of each group from the entries of the full master regexes
+    if not rules:
+        return []
+    regex = (b'|' if isinstance(rules[0], bytes) else '|').join(rules)
+    try:
+        lexre = re.compile(regex, reflags)
+    except Exception:
+        if len(rules) == 1:
+            raise
+        m = len(rules) // 2
+        return _compile_rules(rules[:m], reflags, entries) + _compile_rules(rules[m:], reflags, entries)
+    lexindexfunc = [None] * (max(lexre.groupindex.values()) + 1)
+    for name, i in lexre.groupindex.items():
+        lexindexfunc[i] = entries.get(name)
+    return [(lexre, lexindexfunc)]
+
+class _DispatchMap(dict):
+    '''Maps the character at the current position to the master regexes to try.
+    Characters that don't start any known rule get the full master regexes.'''
+    def __init__(self, mapping, default):
+        dict.__init__(self, mapping)
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+def _build_dispatch(lexre, lexretext, reflags):
+    '''Builds the _DispatchMap of one lexer state, or returns None if the rules of
+    the state can't be dispatched on their first character'''
+    if len(lexre) != len(lexretext):
+        return None
+    rules = []
+    entries = {}
+    for (cre, findex), retext in zip(lexre, lexretext):
+        parts = _split_master_re(retext, reflags)
+        if parts is None:
+            return None
+        rules.extend(parts)
+        for name, i in cre.groupindex.items():
+            entries[name] = findex[i]
+    if not rules:
+        return None
+    text = not isinstance(rules[0], bytes)
+
+    firsts = [_first_chars(rule, reflags) for rule in rules]
+    codes = set()
+    for first in firsts:
+        if first is not None:
+            codes |= first.codes
+    if not codes:
+        return None
+    compiled = {}
+    mapping = {}
+    for code in codes:
+        selected = tuple(n for n, first in enumerate(firsts)
+                         if first is None or code in first.codes)
+        if selected not in compiled:
+            compiled[selected] = _compile_rules([rules[n] for n in selected], reflags, entries)
+        mapping[chr(code) if text else code] = compiled[selected]
+    return _DispatchMap(mapping, lexre)
+
 # -----------------------------------------------------------------------------
 # def _statetoken(s,names)
 #
@@ -860,7 +1550,8 @@ class LexerReflect(object):
 # Build all of the regular expression rules from definitions in the supplied module
 # -----------------------------------------------------------------------------
 def lex(module=None, object=None, debug=False, optimize=False, lextab='lextab',
-        reflags=int(re.VERBOSE), nowarn=False, outputdir=None, debuglog=None, errorlog=None):
+        reflags=int(re.VERBOSE), nowarn=False, outputdir=None, debuglog=None, errorlog=None,
+        dispatch=False, tokenclass=LexToken, binary=False):
 
     if lextab is None:
         lextab = 'lextab'
@@ -871,6 +1562,7 @@ def lex(module=None, object=None, debug=False, optimize=False, lextab='lextab',
     stateinfo  = {'INITIAL': 'inclusive'}
     lexobj = Lexer()
     lexobj.lexoptimize = optimize
+    lexobj.lextokenclass = tokenclass
     global token, input
 
     if errorlog is None:
@@ -911,6 +1603,10 @@ def lex(module=None, object=None, debug=False, optimize=False, lextab='lextab',
     if optimize and lextab:
         try:
             lexobj.readtab(lextab, ldict)
+            if binary:
+                lexobj.set_binary(True)
+            if dispatch:
+                lexobj.set_dispatch(True)
             token = lexobj.token
             input = lexobj.input
             lexer = lexobj
@@ -1013,6 +1709,11 @@ def lex(module=None, object=None, debug=False, optimize=False, lextab='lextab',
             if s not in linfo.ignore:
                 linfo.ignore[s] = linfo.ignore.get('INITIAL', '')
 
+    if binary:
+        lexobj.set_binary(True)
+    if dispatch:
+        lexobj.set_dispatch(True)
+
     # Create global versions of the token() and input() functions
     token = lexobj.token
     input = lexobj.input
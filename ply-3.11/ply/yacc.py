@@ -212,14 +212,22 @@ def call_errorfunc(errorfunc, token, parser):
 #        .endlineno  = Ending line number (optional, set automatically)
 #        .lexpos     = Starting lex position
 #        .endlexpos  = Ending lex position (optional, set automatically)
+# These are its only attributes (__slots__); grammar rules that need to set
+# others can use YaccSymbolDict (see yacc(symbolclass=...))
+
+class YaccSymbol(object):
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'endlineno', 'endlexpos')
 
-class YaccSymbol:
     def __str__(self):
         return self.type
 
     def __repr__(self):
         return str(self)
 
+# Grammar symbol that takes any attribute, as YaccSymbol did before it had __slots__
+class YaccSymbolDict(YaccSymbol):
+    __slots__ = ('__dict__',)
+
 # This class is a wrapper around the objects actually passed to each
 # grammar rule.   Index lookup and assignment actually assign the
 # .value attribute of the underlying YaccSymbol object.
@@ -292,6 +300,7 @@ class LRParser:
         self.errorfunc = errorf
         self.set_defaulted_states()
         self.errorok = True
+        self.symbolclass = YaccSymbol
 
     def errok(self):
         self.errorok = True
@@ -299,7 +308,7 @@ class LRParser:
     def restart(self):
         del self.statestack[:]
         del self.symstack[:]
-        sym = YaccSymbol()
+        sym = self.symbolclass()
         sym.type = '$end'
         self.symstack.append(sym)
         self.statestack.append(0)
@@ -356,6 +365,7 @@ class LRParser:
         prod    = self.productions               # Local reference to production list (to avoid lookup on self.)
         defaulted_states = self.defaulted_states # Local reference to defaulted states
         pslice  = YaccProduction(None)           # Production object passed to grammar rules
+        symbolclass = self.symbolclass           # Class of the grammar symbols created by the parser
         errorcount = 0                           # Used during error recovery
 
         #--! DEBUG
@@ -397,7 +407,7 @@ class LRParser:
         # The start state is assumed to be (0,$end)
 
         statestack.append(0)
-        sym = YaccSymbol()
+        sym = symbolclass()
         sym.type = '$end'
         symstack.append(sym)
         state = 0
@@ -418,7 +428,7 @@ class LRParser:
                     else:
                         lookahead = lookaheadstack.pop()
                     if not lookahead:
-                        lookahead = YaccSymbol()
+                        lookahead = symbolclass()
                         lookahead.type = '$end'
 
                 # Check the action table
@@ -460,7 +470,7 @@ class LRParser:
                     plen  = p.len
 
                     # Get production function
-                    sym = YaccSymbol()
+                    sym = symbolclass()
                     sym.type = pname       # Production name
                     sym.value = None
 
@@ -604,9 +614,11 @@ class LRParser:
                         if self.errorok:
                             # User must have done some kind of panic
                             # mode recovery on their own.  The
-                            # returned token is the next lookahead
+                            # returned token is the next lookahead.
+                            # It may also have unwound the state stack.
                             lookahead = tok
                             errtoken = None
+                            state = statestack[-1]
                             continue
                     else:
                         if errtoken:
@@ -659,7 +671,7 @@ class LRParser:
                         continue
 
                     # Create the error symbol for the first time and make it the new lookahead symbol
-                    t = YaccSymbol()
+                    t = symbolclass()
                     t.type = 'error'
 
                     if hasattr(lookahead, 'lineno'):
@@ -703,6 +715,7 @@ class LRParser:
         prod    = self.productions               # Local reference to production list (to avoid lookup on self.)
         defaulted_states = self.defaulted_states # Local reference to defaulted states
         pslice  = YaccProduction(None)           # Production object passed to grammar rules
+        symbolclass = self.symbolclass           # Class of the grammar symbols created by the parser
         errorcount = 0                           # Used during error recovery
 
 
@@ -741,7 +754,7 @@ class LRParser:
         # The start state is assumed to be (0,$end)
 
         statestack.append(0)
-        sym = YaccSymbol()
+        sym = symbolclass()
         sym.type = '$end'
         symstack.append(sym)
         state = 0
@@ -758,7 +771,7 @@ class LRParser:
                     else:
                         lookahead = lookaheadstack.pop()
                     if not lookahead:
-                        lookahead = YaccSymbol()
+                        lookahead = symbolclass()
                         lookahead.type = '$end'
 
                 # Check the action table
@@ -790,7 +803,7 @@ class LRParser:
                     plen  = p.len
 
                     # Get production function
-                    sym = YaccSymbol()
+                    sym = symbolclass()
                     sym.type = pname       # Production name
                     sym.value = None
 
@@ -910,9 +923,11 @@ class LRParser:
                         if self.errorok:
                             # User must have done some kind of panic
                             # mode recovery on their own.  The
-                            # returned token is the next lookahead
+                            # returned token is the next lookahead.
+                            # It may also have unwound the state stack.
                             lookahead = tok
                             errtoken = None
+                            state = statestack[-1]
                             continue
                     else:
                         if errtoken:
@@ -965,7 +980,7 @@ class LRParser:
                         continue
 
                     # Create the error symbol for the first time and make it the new lookahead symbol
-                    t = YaccSymbol()
+                    t = symbolclass()
                     t.type = 'error'
 
                     if hasattr(lookahead, 'lineno'):
@@ -1009,6 +1024,7 @@ class LRParser:
         prod    = self.productions               # Local reference to production list (to avoid lookup on self.)
         defaulted_states = self.defaulted_states # Local reference to defaulted states
         pslice  = YaccProduction(None)           # Production object passed to grammar rules
+        symbolclass = self.symbolclass           # Class of the grammar symbols created by the parser
         errorcount = 0                           # Used during error recovery
 
 
@@ -1047,7 +1063,7 @@ class LRParser:
         # The start state is assumed to be (0,$end)
 
         statestack.append(0)
-        sym = YaccSymbol()
+        sym = symbolclass()
         sym.type = '$end'
         symstack.append(sym)
         state = 0
@@ -1064,7 +1080,7 @@ class LRParser:
                     else:
                         lookahead = lookaheadstack.pop()
                     if not lookahead:
-                        lookahead = YaccSymbol()
+                        lookahead = symbolclass()
                         lookahead.type = '$end'
 
                 # Check the action table
@@ -1096,7 +1112,7 @@ class LRParser:
                     plen  = p.len
 
                     # Get production function
-                    sym = YaccSymbol()
+                    sym = symbolclass()
                     sym.type = pname       # Production name
                     sym.value = None
 
@@ -1202,9 +1218,11 @@ class LRParser:
                         if self.errorok:
                             # User must have done some kind of panic
                             # mode recovery on their own.  The
-                            # returned token is the next lookahead
+                            # returned token is the next lookahead.
+                            # It may also have unwound the state stack.
                             lookahead = tok
                             errtoken = None
+                            state = statestack[-1]
                             continue
                     else:
                         if errtoken:
@@ -1252,7 +1270,7 @@ class LRParser:
                         continue
 
                     # Create the error symbol for the first time and make it the new lookahead symbol
-                    t = YaccSymbol()
+                    t = symbolclass()
                     t.type = 'error'
 
                     if hasattr(lookahead, 'lineno'):
@@ -3215,7 +3233,8 @@ class ParserReflect(object):
 
 def yacc(method='LALR', debug=yaccdebug, module=None, tabmodule=tab_module, start=None,
          check_recursion=True, optimize=False, write_tables=True, debugfile=debug_file,
-         outputdir=None, debuglog=None, errorlog=None, picklefile=None):
+         outputdir=None, debuglog=None, errorlog=None, picklefile=None, symbolclass=YaccSymbol,
+         reflect=None):
 
     if tabmodule is None:
         tabmodule = tab_module
@@ -3230,8 +3249,11 @@ def yacc(method='LALR', debug=yaccdebug, module=None, tabmodule=tab_module, star
     if errorlog is None:
         errorlog = PlyLogger(sys.stderr)
 
-    # Get the module dictionary used for the parser
-    if module:
+    # Get the module dictionary used for the parser.  A ParserReflect that has
+    # already collected the grammar (get_all) can be given to avoid doing it twice
+    if reflect is not None:
+        pdict = reflect.pdict
+    elif module:
         _items = [(k, getattr(module, k)) for k in dir(module)]
         pdict = dict(_items)
         # If no __file__ or __package__ attributes are available, try to obtain them
@@ -3275,8 +3297,13 @@ def yacc(method='LALR', debug=yaccdebug, module=None, tabmodule=tab_module, star
         pdict['start'] = start
 
     # Collect parser information from the dictionary
-    pinfo = ParserReflect(pdict, log=errorlog)
-    pinfo.get_all()
+    if reflect is None:
+        pinfo = ParserReflect(pdict, log=errorlog)
+        pinfo.get_all()
+    else:
+        pinfo = reflect
+        if start is not None:
+            pinfo.get_start()
 
     if pinfo.error:
         raise YaccError('Unable to build parser')
@@ -3295,6 +3322,7 @@ def yacc(method='LALR', debug=yaccdebug, module=None, tabmodule=tab_module, star
             try:
                 lr.bind_callables(pinfo.pdict)
                 parser = LRParser(lr, pinfo.error_func)
+                parser.symbolclass = symbolclass
                 parse = parser.parse
                 return parser
             except Exception as e:
@@ -3497,6 +3525,7 @@ def yacc(method='LALR', debug=yaccdebug, module=None, tabmodule=tab_module, star
     # Build the parser
     lr.bind_callables(pinfo.pdict)
     parser = LRParser(lr, pinfo.error_func)
+    parser.symbolclass = symbolclass
 
     parse = parser.parse
     return parser
@@ -0,0 +1,54 @@
+# lex_batches.py
+#
+# Bulk tokenizing into TokenArrays: simple rules, function rules that change
+# the type or discard the token, literals, the error rule and line numbers
+
+import sys
+if ".." not in sys.path: sys.path.insert(0,"..")
+
+import ply.lex as lex
+
+tokens = [ 
+    "ID",
+    "IF",
+    "NUMBER",
+    "ASSIGN",
+    ]
+
+literals = ['+']
+
+t_ASSIGN = r'='
+t_NUMBER = r'\d+'
+t_ignore = " \t"
+
+def t_ID(t):
+    r'[a-z]+'
+    if t.value == 'if':
+        t.type = 'IF'
+    return t
+
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += len(t.value)
+
+def t_error(t):
+    print("Illegal character '%s'" % t.value[0])
+    t.lexer.skip(1)
+
+lexer = lex.lex()
+
+data = "if x = 3 + 42\ny = ? x"
+
+def show(batch):
+    for i in range(len(batch)):
+        sys.stdout.write('(%s,%r,%d,%d,%d)\n' % (batch.type(i), batch.value(i), batch.lineno[i],
+                                                 batch.lexpos[i], batch.endpos[i]))
+
+lexer.input(data)
+show(lexer.tokenize_all())
+
+lexer.input(data)
+lexer.lineno = 1
+for batch in lexer.iter_batches(4):
+    print("batch %d" % len(batch))
+    show(batch)
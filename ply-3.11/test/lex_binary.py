@@ -0,0 +1,47 @@
+# lex_binary.py
+#
+# Lexing bytes: bytes, bytearray and memoryview input, ignored characters,
+# literals, the error rule and the first-character dispatch
+
+import sys
+if ".." not in sys.path: sys.path.insert(0,"..")
+
+import ply.lex as lex
+
+tokens = [ 
+    "ID",
+    "NUMBER",
+    "STRING",
+    ]
+
+literals = ['+', '=']
+
+t_NUMBER = r'\d+'
+t_ignore = " \t"
+
+def t_ID(t):
+    r'[a-z]+'
+    return t
+
+def t_STRING(t):
+    r'"[^"\n]*"'
+    # Number of characters, not bytes
+    t.value = len(t.value[1:-1].decode('utf-8'))
+    return t
+
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += len(t.value)
+
+def t_error(t):
+    print("Illegal byte %r" % bytes(t.value[:1]))
+    t.lexer.skip(1)
+
+data = u'x = 3 + 42\ns = "año" ? y'.encode('utf-8')
+
+for dispatch in (False, True):
+    lexer = lex.lex(binary=True, dispatch=dispatch)
+    for kind in (bytes, bytearray, memoryview):
+        lexer.input(kind(data))
+        lexer.lineno = 1
+        print(' '.join(['%s:%r:%d:%d' % (t.type, t.value, t.lineno, t.lexpos) for t in iter(lexer.token, None)]))
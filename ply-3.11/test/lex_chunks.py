@@ -0,0 +1,60 @@
+# lex_chunks.py
+#
+# Chunked input: tokens split across pieces, a token that spans lines,
+# line numbers and positions in the whole input, and batches
+
+import sys
+import io
+if ".." not in sys.path: sys.path.insert(0,"..")
+
+import ply.lex as lex
+
+tokens = [ 
+    "ID",
+    "NUMBER",
+    "QUOTE",
+    ]
+
+t_ID = r'[a-z]+'
+t_NUMBER = r'\d+'
+t_ignore = " \t"
+
+# Lines that start with '|' make one token
+def t_QUOTE(t):
+    r'\|[^\n]*(\n\|[^\n]*)*'
+    t.lexer.lineno += t.value.count('\n')
+    return t
+
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += len(t.value)
+
+def t_error(t):
+    print("Illegal character '%s' at %d" % (t.value[0], t.lexer.lexoffset + t.lexpos))
+    t.lexer.skip(1)
+
+lexer = lex.lex()
+
+data = "abc 12345\n| two\n| lines\nx\n\n? y 7"
+
+def pieces(s, n):
+    return [s[i:i+n] for i in range(0, len(s), n)]
+
+def tokens_of(lexer):
+    lexer.lineno = 1
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in iter(lexer.token, None)]
+
+lexer.input(data)
+whole = tokens_of(lexer)
+for t in whole:
+    print("(%s,%r,%d,%d)" % t)
+
+lexer.input_chunks(pieces(data, 3))
+print(tokens_of(lexer) == whole)
+lexer.input_file(io.BytesIO(data.encode('utf-8')), 2, 'utf-8')
+print(tokens_of(lexer) == whole)
+
+lexer.input_chunks(pieces(data, 4))
+lexer.lineno = 1
+for batch in lexer.iter_batches(10):
+    print("batch %s" % ' '.join([batch.value(i) for i in range(len(batch))]))
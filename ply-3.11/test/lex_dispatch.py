@@ -0,0 +1,62 @@
+# lex_dispatch.py
+#
+# First-character dispatch: rules sharing a first character, literals,
+# characters that start no rule and an exclusive state
+
+import sys
+if ".." not in sys.path: sys.path.insert(0,"..")
+
+import ply.lex as lex
+
+tokens = [ 
+    "ID",
+    "NUMBER",
+    "FLOAT",
+    "LE",
+    "LT",
+    "WORD",
+    ]
+
+literals = ['+', '=']
+
+states = (('comment', 'exclusive'),)
+
+t_LE = r'<='
+t_LT = r'<'
+t_WORD = r'\w+'
+
+t_ignore = " \t"
+
+def t_FLOAT(t):
+    r'\d+\.\d*|\.\d+'
+    return t
+
+def t_NUMBER(t):
+    r'\b\d+\b'
+    return t
+
+def t_ID(t):
+    r'[a-z_][a-z0-9_]*'
+    return t
+
+def t_comment(t):
+    r'/\*'
+    t.lexer.begin('comment')
+
+def t_comment_body_part(t):
+    r'(.|\n)*?\*/'
+    print("comment body %s" % t)
+    t.lexer.begin('INITIAL')
+
+def t_error(t):
+    print("Illegal character '%s'" % t.value[0])
+    t.lexer.skip(1)
+
+t_comment_error = t_error
+t_comment_ignore = t_ignore
+
+lex.lex(dispatch=True)
+
+data = "x1 = 3.5 + .25 <= 12a < 7 /* c */ Ab + _v2 ? 4"
+
+lex.runmain(data=data)
@@ -0,0 +1,65 @@
+# lex_stop.py
+#
+# Lexer.stop(): ending the input from a rule or between tokens, also
+# with chunked input (no more pieces are read)
+
+import sys
+if ".." not in sys.path: sys.path.insert(0,"..")
+
+import ply.lex as lex
+
+tokens = [ 
+    "ID",
+    "STOP",
+    ]
+
+t_ID = r'[a-z]+'
+t_ignore = " \t\n"
+
+def t_STOP(t):
+    r'!'
+    t.lexer.stop()
+    return t
+
+# '?' ends the input from the error rule
+def t_error(t):
+    print("Illegal character '%s'" % t.value[0])
+    if t.value[0] == '?':
+        t.lexer.stop()
+    else:
+        t.lexer.skip(1)
+
+lexer = lex.lex()
+
+read = []
+def pieces(s, n):
+    for i in range(0, len(s), n):
+        read.append(i)
+        yield s[i:i+n]
+
+def values(lexer):
+    return ' '.join([t.value for t in iter(lexer.token, None)])
+
+data = "a b\nc ! d\ne\nf\ng\nh\n"
+
+lexer.input(data)
+print(values(lexer))
+lexer.input_chunks(pieces(data, 2))
+print(values(lexer), len(read))
+
+del read[:]
+lexer.input_chunks(pieces("a b\nc d\ne\nf\ng\nh\n", 2))
+first = [lexer.token().value, lexer.token().value]
+lexer.stop()
+print(' '.join(first), lexer.token(), len(read))
+
+def batches(lexer):
+    return ' | '.join([' '.join([batch.value(i) for i in range(len(batch))]) for batch in lexer.iter_batches(10)])
+
+lexer.input_chunks(pieces(data, 2))
+print(batches(lexer))
+
+lexer.input("a # b ? c")
+print(values(lexer))
+lexer.input("a # b ? c")
+print(batches(lexer))
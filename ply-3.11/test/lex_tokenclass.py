@@ -0,0 +1,38 @@
+# lex_tokenclass.py
+#
+# Rules that set attributes of their own need a token class that allows them
+
+import sys
+if ".." not in sys.path: sys.path.insert(0,"..")
+
+import ply.lex as lex
+
+tokens = [ 
+    "NUMBER",
+    "PLUS",
+    ]
+
+t_PLUS = r'\+'
+t_ignore = " \t"
+
+def t_NUMBER(t):
+    r'\d+'
+    t.digits = len(t.value)
+    return t
+
+def t_error(t):
+    pass
+
+data = "3 + 42"
+
+lexer = lex.lex()
+lexer.input(data)
+try:
+    lexer.token()
+except AttributeError:
+    print("LexToken has no digits")
+
+lexer = lex.lex(tokenclass=lex.LexTokenDict)
+lexer.input(data)
+for tok in lexer:
+    print("%s %s" % (tok, getattr(tok, 'digits', None)))
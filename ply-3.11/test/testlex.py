@@ -662,6 +662,122 @@ class LexRunTests(unittest.TestCase):
                                     "(H_EDIT_DESCRIPTOR,'abcdefghij',1,6)\n"
                                     "(H_EDIT_DESCRIPTOR,'xy',1,20)\n"))
        
+    def test_lex_dispatch(self):
+        run_import("lex_dispatch")
+        result = sys.stdout.getvalue()
+        self.assert_(check_expected(result,
+                                    "(ID,'x1',1,0)\n"
+                                    "(=,'=',1,3)\n"
+                                    "(FLOAT,'3.5',1,5)\n"
+                                    "(+,'+',1,9)\n"
+                                    "(FLOAT,'.25',1,11)\n"
+                                    "(LE,'<=',1,15)\n"
+                                    "(WORD,'12a',1,18)\n"
+                                    "(LT,'<',1,22)\n"
+                                    "(NUMBER,'7',1,24)\n"
+                                    "comment body LexToken(body_part,'c */',1,29)\n"
+                                    "(WORD,'Ab',1,34)\n"
+                                    "(+,'+',1,37)\n"
+                                    "(ID,'_v2',1,39)\n"
+                                    "Illegal character '?'\n"
+                                    "(NUMBER,'4',1,45)\n"
+                                    ))
+
+    def test_lex_batches(self):
+        run_import("lex_batches")
+        result = sys.stdout.getvalue()
+        self.assert_(check_expected(result,
+                                    "Illegal character '?'\n"
+                                    "(IF,'if',1,0,2)\n"
+                                    "(ID,'x',1,3,4)\n"
+                                    "(ASSIGN,'=',1,5,6)\n"
+                                    "(NUMBER,'3',1,7,8)\n"
+                                    "(+,'+',1,9,10)\n"
+                                    "(NUMBER,'42',1,11,13)\n"
+                                    "(ID,'y',2,14,15)\n"
+                                    "(ASSIGN,'=',2,16,17)\n"
+                                    "(ID,'x',2,20,21)\n"
+                                    "batch 4\n"
+                                    "(IF,'if',1,0,2)\n"
+                                    "(ID,'x',1,3,4)\n"
+                                    "(ASSIGN,'=',1,5,6)\n"
+                                    "(NUMBER,'3',1,7,8)\n"
+                                    "batch 4\n"
+                                    "(+,'+',1,9,10)\n"
+                                    "(NUMBER,'42',1,11,13)\n"
+                                    "(ID,'y',2,14,15)\n"
+                                    "(ASSIGN,'=',2,16,17)\n"
+                                    "Illegal character '?'\n"
+                                    "batch 1\n"
+                                    "(ID,'x',2,20,21)\n"
+                                    ))
+
+    def test_lex_chunks(self):
+        run_import("lex_chunks")
+        result = sys.stdout.getvalue()
+        self.assert_(check_expected(result,
+                                    "Illegal character '?' at 27\n"
+                                    "(ID,'abc',1,0)\n"
+                                    "(NUMBER,'12345',1,4)\n"
+                                    "(QUOTE,'| two\\n| lines',2,10)\n"
+                                    "(ID,'x',4,24)\n"
+                                    "(ID,'y',6,29)\n"
+                                    "(NUMBER,'7',6,31)\n"
+                                    "Illegal character '?' at 27\n"
+                                    "True\n"
+                                    "Illegal character '?' at 27\n"
+                                    "True\n"
+                                    "batch abc 12345\n"
+                                    "batch | two\n"
+                                    "| lines x\n"
+                                    "Illegal character '?' at 27\n"
+                                    "batch y 7\n"
+                                    ))
+
+    def test_lex_stop(self):
+        run_import("lex_stop")
+        result = sys.stdout.getvalue()
+        self.assert_(check_expected(result,
+                                    "a b c !\n"
+                                    "a b c ! 6\n"
+                                    "a b None 4\n"
+                                    "a b | c !\n"
+                                    "Illegal character '#'\n"
+                                    "Illegal character '?'\n"
+                                    "a b\n"
+                                    "Illegal character '#'\n"
+                                    "Illegal character '?'\n"
+                                    "a b\n"
+                                    ))
+
+    def test_lex_binary(self):
+        run_import("lex_binary")
+        result = sys.stdout.getvalue()
+        self.assert_(check_expected(result,
+                                    "Illegal byte b'?'\n"
+                                    "ID:b'x':1:0 =:'=':1:2 NUMBER:b'3':1:4 +:'+':1:6 NUMBER:b'42':1:8 ID:b's':2:11 =:'=':2:13 STRING:3:2:15 ID:b'y':2:24\n"
+                                    "Illegal byte b'?'\n"
+                                    "ID:b'x':1:0 =:'=':1:2 NUMBER:b'3':1:4 +:'+':1:6 NUMBER:b'42':1:8 ID:b's':2:11 =:'=':2:13 STRING:3:2:15 ID:b'y':2:24\n"
+                                    "Illegal byte b'?'\n"
+                                    "ID:b'x':1:0 =:'=':1:2 NUMBER:b'3':1:4 +:'+':1:6 NUMBER:b'42':1:8 ID:b's':2:11 =:'=':2:13 STRING:3:2:15 ID:b'y':2:24\n"
+                                    "Illegal byte b'?'\n"
+                                    "ID:b'x':1:0 =:'=':1:2 NUMBER:b'3':1:4 +:'+':1:6 NUMBER:b'42':1:8 ID:b's':2:11 =:'=':2:13 STRING:3:2:15 ID:b'y':2:24\n"
+                                    "Illegal byte b'?'\n"
+                                    "ID:b'x':1:0 =:'=':1:2 NUMBER:b'3':1:4 +:'+':1:6 NUMBER:b'42':1:8 ID:b's':2:11 =:'=':2:13 STRING:3:2:15 ID:b'y':2:24\n"
+                                    "Illegal byte b'?'\n"
+                                    "ID:b'x':1:0 =:'=':1:2 NUMBER:b'3':1:4 +:'+':1:6 NUMBER:b'42':1:8 ID:b's':2:11 =:'=':2:13 STRING:3:2:15 ID:b'y':2:24\n"
+                                    ))
+
+    def test_lex_tokenclass(self):
+        run_import("lex_tokenclass")
+        result = sys.stdout.getvalue()
+        self.assert_(check_expected(result,
+                                    "LexToken has no digits\n"
+                                    "LexToken(NUMBER,'3',1,0) 1\n"
+                                    "LexToken(PLUS,'+',1,2) None\n"
+                                    "LexToken(NUMBER,'42',1,4) 2\n"
+                                    ))
+
     def test_lex_state_try(self):
         run_import("lex_state_try")
         result = sys.stdout.getvalue()
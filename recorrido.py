@@ -0,0 +1,66 @@
+def preorden(raiz, profundidad=None):
+    """Recorre el árbol en preorden con una pila explícita y produce (nodo, nivel).
+
+    Con profundidad, los nodos de ese nivel se producen pero no se recorren sus hijos."""
+    pendientes = [(raiz, 0)]
+    while pendientes:
+        nodo, nivel = pendientes.pop()
+        yield nodo, nivel
+        hijos = nodo.hijos
+        if hijos and (profundidad is None or nivel < profundidad):
+            # Al revés, para que los hijos salgan de izquierda a derecha
+            nivel += 1
+            pendientes.extend([(hijo, nivel) for hijo in reversed(hijos)])
+
+def postorden(raiz):
+    """Recorre el árbol en postorden (cada nodo después de sus hijos) y produce (nodo, nivel)."""
+    pendientes = [(raiz, 0, False)]
+    while pendientes:
+        nodo, nivel, visitado = pendientes.pop()
+        if visitado or not nodo.hijos:
+            yield nodo, nivel
+            continue
+        pendientes.append((nodo, nivel, True))
+        pendientes.extend([(hijo, nivel + 1, False) for hijo in reversed(nodo.hijos)])
+
+class Visitante:
+    """Base para recorrer un árbol sin recursión, con un método por tipo de nodo.
+
+    Al entrar a un nodo se llama a visitar_<Tipo> (espacios y guiones como '_', por ejemplo
+    visitar_Si_Sino) o, si no existe, a visitar_nodo; si devuelve False no se recorren sus hijos.
+    Al salir, después de sus hijos, se llama a salir_<Tipo> o a salir_nodo."""
+    def __init__(self):
+        self._metodos = {}
+
+    def recorrer(self, raiz):
+        """Visita todo el árbol y devuelve self.resultado()."""
+        pendientes = [(raiz, 0, False)]
+        while pendientes:
+            nodo, nivel, saliendo = pendientes.pop()
+            entrar, salir = self.metodos(nodo)
+            if saliendo:
+                salir(nodo, nivel)
+                continue
+            if entrar(nodo, nivel) is False:
+                continue
+            pendientes.append((nodo, nivel, True))
+            pendientes.extend([(hijo, nivel + 1, False) for hijo in reversed(nodo.hijos)])
+        return self.resultado()
+
+    def metodos(self, nodo):
+        """Métodos de entrada y salida para el tipo del nodo (se buscan una vez por tipo)."""
+        metodos = self._metodos.get(nodo.tipo)
+        if metodos is None:
+            sufijo = nodo.nombre.replace(" ", "_").replace("-", "_")
+            metodos = self._metodos[nodo.tipo] = (getattr(self, "visitar_" + sufijo, self.visitar_nodo),
+                                                  getattr(self, "salir_" + sufijo, self.salir_nodo))
+        return metodos
+
+    def visitar_nodo(self, nodo, nivel):
+        pass
+
+    def salir_nodo(self, nodo, nivel):
+        pass
+
+    def resultado(self):
+        return None
@@ -0,0 +1,178 @@
+from functools import partial
+
+# Cantidad de errores de sintaxis a partir de la cual se deja de analizar el resto del texto
+MAXIMO_ERRORES = 100
+# Cada cuántos tokens se avisa el avance del análisis a quien lo vigila
+TOKENS_POR_AVISO = 1000
+
+class TablasRecuperacion:
+    """Datos de las tablas LALR, precalculados por estado, para recuperarse de un error en modo pánico.
+
+    Ante un error, PLY desapila estados (reduciendo si corresponde) hasta uno que desplace el símbolo
+    error, y después descarta tokens de a uno hasta que alguno tenga acción en el estado al que llegó.
+    Con estas tablas se sabe de antemano a qué estado va a llegar y con qué tokens va a seguir."""
+    def __init__(self, parser, sentencia='Sentencia'):
+        self.goto = parser.goto
+        self.producciones = [(produccion.len, produccion.name) for produccion in parser.productions]
+        predeterminadas = parser.defaulted_states
+        # Qué hace cada estado con el símbolo error: desplazarlo (> 0), reducir (< 0) o nada (None)
+        self.ante_error = {}
+        # Terminales con los que cada estado sigue el análisis; None si reduce sin mirar el token
+        self.sincronizacion = {}
+        for estado, acciones in parser.action.items():
+            if estado in predeterminadas:
+                self.ante_error[estado] = predeterminadas[estado]
+                self.sincronizacion[estado] = None
+            else:
+                self.ante_error[estado] = acciones.get('error')
+                self.sincronizacion[estado] = frozenset(acciones).difference(('error',))
+        # Estados en los que puede empezar una sentencia: ahí se reanuda si el error no tiene regla propia
+        self.reanudables = frozenset(estado for estado, saltos in parser.goto.items() if sentencia in saltos)
+
+    def destino(self, pila):
+        """Estado en el que queda el parser después de desplazar error desde la pila de estados dada,
+        o None si PLY tiene que descartar toda la pila y volver a empezar desde el estado inicial."""
+        if len(pila) <= 1:
+            return None
+        ante_error, producciones, goto = self.ante_error, self.producciones, self.goto
+        pila = list(pila)
+        while True:
+            accion = ante_error.get(pila[-1])
+            if accion is None:
+                if len(pila) <= 1:
+                    return None
+                pila.pop()
+            elif accion > 0:
+                return accion
+            elif accion < 0:
+                largo, nombre = producciones[-accion]
+                if largo:
+                    del pila[-largo:]
+                pila.append(goto[pila[-1]][nombre])
+            else:
+                return None
+
+    def nivel_sentencia(self, pila):
+        """Índice en la pila del estado más cercano al tope donde puede empezar una sentencia, o None."""
+        reanudables = self.reanudables
+        for indice in range(len(pila) - 1, -1, -1):
+            if pila[indice] in reanudables:
+                return indice
+        return None
+
+class Entrada:
+    """Lista de tokens que el parser pide de a uno y que la recuperación de errores puede saltear."""
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.iterador = iter(tokens)
+        # Para el parser, la entrada es el iterador de la lista: no agrega costo por token
+        self.siguiente = partial(next, self.iterador, None)
+
+    @property
+    def posicion(self):
+        """Índice del próximo token que va a recibir el parser."""
+        return len(self.tokens) - self.iterador.__length_hint__()
+
+    def saltar(self, posicion):
+        """Descarta los tokens pendientes anteriores a posicion."""
+        self.iterador.__setstate__(posicion)
+
+    def agotar(self):
+        """Descarta todos los tokens pendientes: el parser recibe el fin de la entrada."""
+        self.iterador.__setstate__(len(self.tokens))
+
+    def con_avisos(self, al_avanzar):
+        """Como siguiente, pero cada TOKENS_POR_AVISO tokens llama a al_avanzar(posición, total).
+
+        al_avanzar puede lanzar una excepción para interrumpir el análisis."""
+        iterador, total = self.iterador, len(self.tokens)
+        pedidos = 0
+
+        def siguiente():
+            nonlocal pedidos
+            pedidos += 1
+            if pedidos == TOKENS_POR_AVISO:
+                pedidos = 0
+                al_avanzar(total - iterador.__length_hint__(), total)
+            return next(iterador, None)
+        return siguiente
+
+def primero_de(tokens, desde, tipos):
+    """Índice del primer token desde el índice dado cuyo tipo está en tipos (len(tokens) si no hay)."""
+    total = len(tokens)
+    while desde < total and tokens[desde].type not in tipos:
+        desde += 1
+    return desde
+
+def fin_de_sentencia(tokens, desde, sincronizacion):
+    """Recorre tokens desde el índice dado hasta lo primero que aparezca fuera de un bloque:
+    un token de sincronizacion, un ';' o una '}' que no abrió la sentencia.
+
+    Devuelve (índice, motivo) con motivo 'sincronizacion', 'sentencia' (el índice queda después
+    del ';' o del bloque que cierra la sentencia) o 'bloque' (el índice es la '}' del bloque que
+    la contiene); (len(tokens), None) si no hay nada de eso."""
+    profundidad = 0
+    indice, total = desde, len(tokens)
+    while indice < total:
+        tipo = tokens[indice].type
+        if profundidad == 0 and tipo in sincronizacion:
+            return indice, 'sincronizacion'
+        if tipo == 'LLAVE_IZQ':
+            profundidad += 1
+        elif tipo == 'LLAVE_DER':
+            if profundidad == 0:
+                return indice, 'bloque'
+            profundidad -= 1
+            # Un bloque cerrado termina la sentencia, salvo que siga un 'sino'
+            if profundidad == 0 and (indice + 1 == total or tokens[indice + 1].type != 'SINO'):
+                return indice + 1, 'sentencia'
+        elif tipo == 'PUNTO_Y_COMA' and profundidad == 0:
+            return indice + 1, 'sentencia'
+        indice += 1
+    return total, None
+
+def recuperar(parser, token):
+    """Recupera el análisis del error que provocó token, en una sola pasada y sin pedir tokens al parser.
+
+    Si antes de que termine la sentencia aparece un token con el que PLY puede seguir desde el estado
+    al que lo lleva el símbolo error, se saltean de la entrada los que PLY descartaría de a uno y la
+    recuperación sigue por las reglas de error, que informan el error. Si no, PLY descartaría el resto
+    de la sentencia y más: en cambio se desapila hasta donde empieza la sentencia y se sigue con la
+    próxima. En ese caso devuelve True, porque ninguna regla va a informar el error.
+
+    Sin una Entrada (análisis directo desde el lexer), la recuperación queda toda a cargo de PLY."""
+    entrada = parser.entrada
+    if entrada is None:
+        return False
+    tablas = parser.recuperacion
+    tokens = entrada.tokens
+    destino = tablas.destino(parser.statestack)
+    if destino is None:
+        # PLY descarta la pila y el token, y sigue desde el estado inicial con el primer token que acepte
+        entrada.saltar(primero_de(tokens, entrada.posicion, tablas.sincronizacion[0]))
+        return False
+
+    sincronizacion = tablas.sincronizacion[destino]
+    if sincronizacion is None or token.type in sincronizacion:
+        return False
+    # El recorrido empieza en el token del error (normalmente el último que entregó la entrada)
+    desde = entrada.posicion
+    if desde and tokens[desde - 1] is token:
+        desde -= 1
+    posicion, motivo = fin_de_sentencia(tokens, desde, sincronizacion)
+    nivel = tablas.nivel_sentencia(parser.statestack)
+    if nivel is None:
+        entrada.saltar(primero_de(tokens, entrada.posicion, sincronizacion))
+        return False
+    if motivo == 'sincronizacion':
+        entrada.saltar(max(posicion, entrada.posicion))
+        return False
+    if posicion == desde and nivel == len(parser.statestack) - 1:
+        # No hay nada que desapilar ni que saltear: seguir así repetiría el mismo error
+        return False
+
+    del parser.statestack[nivel + 1:]
+    del parser.symstack[nivel + 1:]
+    entrada.saltar(posicion)
+    parser.errok()
+    return True
@@ -0,0 +1,99 @@
+import sys
+from abc import ABC, abstractmethod
+
+# Cantidad de registros que se acumulan antes de escribir
+TAMANO_LOTE = 4096
+
+# Formato de la tabla de símbolos
+ENCABEZADO_TABLA = "TOKEN            VALOR           LÍNEA            COLUMNA\n" + "-" * 60 + "\n"
+FORMATO_TOKEN = "Token: %-15s Valor: %-15s Línea: %-4s Columna: %-4s\n"
+
+def formatear_tokens(lote):
+    """Convierte un lote de registros de token en las líneas de la tabla."""
+    return "".join([FORMATO_TOKEN % registro for registro in lote])
+
+class Salida(ABC):
+    """Destino de registros. Recibe lotes completos en lugar de un registro por vez.
+
+    Cada salida define escribir_lote(); escribir() recibe texto suelto (como un encabezado) y por defecto lo ignora."""
+    def escribir(self, texto):
+        pass
+
+    @abstractmethod
+    def escribir_lote(self, lote):
+        """Recibe una secuencia de registros."""
+
+    def cerrar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+class SalidaTexto(Salida):
+    """Escribe cada lote formateado con una única llamada a write."""
+    def __init__(self, flujo, formatear=formatear_tokens):
+        self.flujo = flujo
+        self.formatear = formatear
+
+    def escribir(self, texto):
+        self.flujo.write(texto)
+
+    def escribir_lote(self, lote):
+        self.flujo.write(self.formatear(lote))
+
+class SalidaArchivo(SalidaTexto):
+    """Escribe los lotes en un archivo de texto."""
+    def __init__(self, ruta, formatear=formatear_tokens, buffer=1 << 16):
+        super().__init__(open(ruta, "w", encoding="utf-8", buffering=buffer), formatear)
+        self.ruta = ruta
+
+    def cerrar(self):
+        if not self.flujo.closed:
+            self.flujo.close()
+
+class SalidaConsola(SalidaTexto):
+    """Escribe los lotes en la salida estándar vigente al momento de escribir."""
+    def __init__(self, formatear=formatear_tokens):
+        super().__init__(None, formatear)
+
+    def escribir(self, texto):
+        sys.stdout.write(texto)
+
+    def escribir_lote(self, lote):
+        sys.stdout.write(self.formatear(lote))
+
+class SalidaLista(Salida):
+    """Guarda los registros en memoria, sin formatearlos."""
+    def __init__(self):
+        self.registros = []
+
+    def escribir_lote(self, lote):
+        self.registros.extend(lote)
+
+def volcar(registros, salidas, encabezado=None, tamano_lote=TAMANO_LOTE):
+    """Consume los registros y los reparte por lotes entre las salidas. Devuelve la cantidad procesada."""
+    if encabezado:
+        for salida in salidas:
+            salida.escribir(encabezado)
+
+    total = 0
+    lote = []
+    try:
+        for registro in registros:
+            lote.append(registro)
+            if len(lote) >= tamano_lote:
+                # El lote se suelta antes de escribirlo: si una salida falla, no se vuelve a escribir abajo
+                completo, lote = lote, []
+                for salida in salidas:
+                    salida.escribir_lote(completo)
+                total += len(completo)
+    finally:
+        # Lo ya tokenizado y todavía no escrito se escribe aunque el análisis se interrumpa
+        if lote:
+            for salida in salidas:
+                salida.escribir_lote(lote)
+            total += len(lote)
+    return total
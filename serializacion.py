@@ -0,0 +1,156 @@
+import mmap
+import struct
+from itertools import accumulate
+from sin import Nodo, SIN_HIJOS
+
+# Formato binario del árbol:
+#   encabezado | nodos (en anchura: los hijos de cada nodo quedan contiguos) | desplazamientos de cadenas | cadenas
+# Cada nodo guarda su tipo, la clase de su dato, el índice del dato en la tabla de cadenas,
+# el índice de su primer hijo, la cantidad de hijos y su rango en el texto. Todo en little-endian.
+MAGIA = b"ASTN"
+VERSION = 2
+ENCABEZADO = struct.Struct("<4sHHIII")   # magia, versión, reservado, nodos, cadenas, bytes de texto
+REGISTRO = struct.Struct("<BBHIIIII")    # tipo, clase del dato, reservado, dato, primer hijo, hijos, inicio, fin
+SIN_POSICION = 0xFFFFFFFF                # inicio o fin desconocido (None)
+DESPLAZAMIENTO = struct.Struct("<I")
+FUERA_DE_RANGO = ("El árbol no entra en el formato binario: posiciones, cantidades de nodos y tamaños "
+                  "de cadenas deben estar entre 0 y 2**32 - 2")
+
+# Clase del dato de un nodo; los que no son cadenas se guardan como su texto
+SIN_DATO, CADENA, ENTERO, REAL = range(4)
+CLASES_DATO = {str: CADENA, int: ENTERO, float: REAL}
+CONVERSIONES = {CADENA: str, ENTERO: int, REAL: float}
+
+def serializar(raiz):
+    """Convierte el árbol al formato binario, recorriéndolo en anchura (sin recursión).
+
+    Posiciones, cantidades y tamaños se guardan en 32 bits: un árbol que no entra (por ejemplo, el de
+    un texto de 4 GiB o más) lanza ValueError."""
+    try:
+        return _serializar(raiz)
+    except struct.error:
+        raise ValueError(FUERA_DE_RANGO) from None
+
+def _serializar(raiz):
+    cadenas = {}
+    nodos = bytearray()
+    cola = [raiz]
+    indice = 0
+    while indice < len(cola):
+        nodo = cola[indice]
+        indice += 1
+        dato = nodo.dato
+        if dato is None:
+            clase, referencia = SIN_DATO, 0
+        else:
+            clase = CLASES_DATO.get(dato.__class__)
+            if clase is None:
+                raise TypeError(f"No se puede serializar un dato de tipo {type(dato).__name__}")
+            texto = dato if clase == CADENA else repr(dato)
+            referencia = cadenas.setdefault(texto, len(cadenas))
+        hijos = nodo.hijos
+        inicio, fin = nodo.inicio, nodo.fin
+        if inicio == SIN_POSICION or fin == SIN_POSICION:
+            # struct la aceptaría, pero se leería como una posición desconocida
+            raise ValueError(FUERA_DE_RANGO)
+        nodos += REGISTRO.pack(nodo.tipo, clase, 0, referencia, len(cola), len(hijos),
+                               SIN_POSICION if inicio is None else inicio, SIN_POSICION if fin is None else fin)
+        cola.extend(hijos)
+
+    textos = [texto.encode("utf-8") for texto in cadenas]
+    desplazamientos = list(accumulate((len(texto) for texto in textos), initial=0))
+    return b"".join((ENCABEZADO.pack(MAGIA, VERSION, 0, len(cola), len(textos), desplazamientos[-1]),
+                     nodos,
+                     struct.pack(f"<{len(desplazamientos)}I", *desplazamientos),
+                     *textos))
+
+def guardar(raiz, ruta):
+    """Escribe el árbol serializado en un archivo."""
+    with open(ruta, "wb") as archivo:
+        archivo.write(serializar(raiz))
+
+class ArbolSerializado:
+    """Árbol en formato binario (bytes o archivo mapeado en memoria); los nodos se arman a medida que se piden."""
+    def __init__(self, datos, archivo=None):
+        try:
+            magia, version, _, self.cantidad, cantidad_cadenas, largo = ENCABEZADO.unpack_from(datos, 0)
+        except struct.error:
+            raise ValueError("Árbol serializado incompleto") from None
+        if magia != MAGIA or version != VERSION:
+            raise ValueError("No es un árbol serializado de esta versión")
+        self.datos = datos
+        self.archivo = archivo
+        self.inicio_cadenas = ENCABEZADO.size + REGISTRO.size * self.cantidad
+        self.inicio_texto = self.inicio_cadenas + DESPLAZAMIENTO.size * (cantidad_cadenas + 1)
+        if len(datos) < self.inicio_texto + largo:
+            raise ValueError("Árbol serializado incompleto")
+        # Cada cadena se decodifica una sola vez y la comparten todos los nodos que la usan
+        self.cadenas = [None] * cantidad_cadenas
+
+    @property
+    def raiz(self):
+        return NodoPerezoso(self, 0)
+
+    def dato(self, clase, referencia):
+        if clase == SIN_DATO:
+            return None
+        texto = self.cadenas[referencia]
+        if texto is None:
+            posicion = self.inicio_cadenas + DESPLAZAMIENTO.size * referencia
+            desde, hasta = struct.unpack_from("<2I", self.datos, posicion)
+            texto = self.cadenas[referencia] = str(self.datos[self.inicio_texto + desde:self.inicio_texto + hasta],
+                                                   "utf-8")
+        return texto if clase == CADENA else CONVERSIONES[clase](texto)
+
+    def cerrar(self):
+        """Libera el archivo mapeado; los nodos que todavía no se armaron dejan de poder leerse."""
+        if self.archivo is not None:
+            self.datos.close()
+            self.archivo.close()
+            self.archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+class NodoPerezoso(Nodo):
+    """Nodo leído de un árbol serializado: se comporta como cualquier Nodo, pero sus hijos se leen al pedirlos."""
+    __slots__ = ("arbol", "primero", "cantidad", "cargados")
+
+    def __init__(self, arbol, indice):
+        tipo, clase, _, referencia, self.primero, self.cantidad, inicio, fin = REGISTRO.unpack_from(
+            arbol.datos, ENCABEZADO.size + REGISTRO.size * indice)
+        self.tipo = tipo
+        self.dato = arbol.dato(clase, referencia)
+        self.texto = None
+        self.inicio = None if inicio == SIN_POSICION else inicio
+        self.fin = None if fin == SIN_POSICION else fin
+        self.arbol = arbol
+        self.cargados = None
+
+    @property
+    def hijos(self):
+        if self.cargados is None:
+            arbol, primero = self.arbol, self.primero
+            self.cargados = (tuple([NodoPerezoso(arbol, indice) for indice in range(primero, primero + self.cantidad)])
+                             if self.cantidad else SIN_HIJOS)
+        return self.cargados
+
+    @hijos.setter
+    def hijos(self, hijos):
+        self.cargados = hijos
+
+def deserializar(datos):
+    """Raíz del árbol contenido en datos (bytes, por ejemplo recibidos de otro proceso)."""
+    return ArbolSerializado(datos).raiz
+
+def abrir(ruta):
+    """Mapea en memoria un árbol guardado con guardar(); solo se lee del disco lo que se recorre."""
+    archivo = open(ruta, "rb")
+    try:
+        return ArbolSerializado(mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ), archivo)
+    except Exception:
+        archivo.close()
+        raise
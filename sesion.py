@@ -0,0 +1,223 @@
+import hashlib
+from functools import partial
+from lex import analizador, escribir_tabla, lexer_binario, registro_token, reiniciar_lexer, tokenizar
+from sin import analizar_tokens, crear_parser, reiniciar_parser
+from incremental import LexerIncremental, ParserIncremental
+from salidas import SalidaConsola
+from traza import APAGADO, ERROR, INFO, Evento, Traza, formatear_eventos
+
+def huella_texto(texto):
+    """Identifica el contenido de un texto (para reconocer un buffer que no cambió)."""
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+class ResultadoVencido(Exception):
+    """Se pidieron los tokens o el árbol de un resultado después de que la sesión analizara otro texto."""
+
+class Resultado:
+    """Lo obtenido de un texto: tokens, errores, árbol y los eventos de traza que produjo.
+
+    Vale hasta que la sesión analiza otro texto: ese análisis reutiliza los tokens y nodos que no
+    cambiaron corriendo sus posiciones en el lugar, así que desde entonces tokens y arbol lanzan
+    ResultadoVencido en vez de devolver posiciones del texto nuevo."""
+    def __init__(self, huella, texto, tokens, errores_lexicos, eventos_lexicos):
+        self.huella = huella
+        self.texto = texto
+        self.vencido = False
+        self._tokens = tokens
+        self.errores_lexicos = errores_lexicos
+        self.eventos_lexicos = eventos_lexicos
+        # Se completan cuando el texto se analiza sintácticamente
+        self.analizado = False
+        self._arbol = None
+        self.errores = []
+        self.hay_errores = False
+        self.eventos = []
+
+    @property
+    def diagnosticos(self):
+        """Errores léxicos y sintácticos del texto como registros Diagnostico."""
+        return list(self.errores_lexicos) + list(self.errores)
+
+    @property
+    def tokens(self):
+        self.verificar()
+        return self._tokens
+
+    @property
+    def arbol(self):
+        self.verificar()
+        return self._arbol
+
+    @arbol.setter
+    def arbol(self, arbol):
+        self.verificar()
+        self._arbol = arbol
+
+    def verificar(self):
+        if self.vencido:
+            raise ResultadoVencido("El resultado ya no es válido: la sesión analizó otro texto después")
+
+    def vencer(self):
+        """Marca el resultado como reemplazado; suelta sus tokens y su árbol, que la sesión sigue usando."""
+        self.vencido = True
+        self._tokens = self._arbol = None
+
+class Sesion:
+    """Análisis independiente: lexer clonado, parser y errores propios, tablas compartidas.
+
+    Varias sesiones pueden usarse a la vez desde hilos distintos sin mezclar su estado.
+    Los mensajes del lexer y del parser van a la traza indicada (por defecto, la consola)."""
+    def __init__(self, traza=None):
+        if traza is None:
+            traza = Traza(INFO, [SalidaConsola(formatear_eventos)])
+        self.traza = traza
+        self.lexer = analizador.clone()
+        self.lexer.traza = traza
+        # Copia binaria del lexer para lexear_bytes(), que se crea al usarla por primera vez
+        self.binario = None
+        self.parser = crear_parser(traza)
+        # Resultado del último texto analizado con analisis_lexico() o analisis()
+        self.ultimo = None
+        # Tokens del último texto, que se actualizan solo en la zona editada
+        lexer_incremental = analizador.clone()
+        lexer_incremental.traza = Traza(APAGADO)  # sus errores se informan juntos al terminar
+        reiniciar_lexer(lexer_incremental)
+        self.incremental = LexerIncremental(lexer_incremental)
+        # Árbol del último análisis, del que se reutilizan las sentencias sin cambios
+        self.reanalisis = ParserIncremental(self.parser)
+
+    def vigilar(self, al_avanzar):
+        """Hace que analisis_lexico() y analisis() llamen cada tanto a al_avanzar(fase, hecho, total).
+
+        La fase es "lexico" (hecho y total en caracteres) o "sintactico" (en tokens). al_avanzar puede
+        lanzar una excepción para interrumpir el análisis; con None se deja de vigilar."""
+        if al_avanzar is None:
+            self.incremental.al_avanzar = self.reanalisis.al_avanzar = None
+        else:
+            self.incremental.al_avanzar = partial(al_avanzar, "lexico")
+            self.reanalisis.al_avanzar = partial(al_avanzar, "sintactico")
+
+    @property
+    def errores(self):
+        return self.parser.errores
+
+    @property
+    def estado(self):
+        return self.parser.estado
+
+    @property
+    def hay_errores(self):
+        return self.parser.error or self.parser.estado.error_found
+
+    def tokenize(self, texto):
+        """Genera los tokens del texto como registros compactos."""
+        return tokenizar(texto, self.lexer)
+
+    def tabla_simbolos(self, texto, eco=True):
+        """Escribe la tabla de símbolos del texto; si el texto no cambió, no se vuelve a tokenizar."""
+        resultado = self.analisis_lexico(texto)
+        self.enfocar(resultado)
+        return escribir_tabla((registro_token(tok, self.lexer) for tok in resultado.tokens), eco)
+
+    @property
+    def errores_lexicos(self):
+        return self.lexer.errores_lexicos
+
+    @property
+    def diagnosticos(self):
+        """Diagnósticos del último análisis hecho con lexear() y parse()."""
+        return list(self.lexer.errores_lexicos) + list(self.parser.errores)
+
+    def lexear(self, texto, tokens=None):
+        """Devuelve la lista de tokens de PLY del texto, en una sola pasada del lexer.
+
+        Si se pasa una lista, los tokens se agregan a ella a medida que se obtienen."""
+        if tokens is None:
+            tokens = []
+        reiniciar_lexer(self.lexer, texto)
+        for tok in iter(self.lexer.token, None):
+            tokens.append(tok)
+        return tokens
+
+    def lexear_columnas(self, texto):
+        """Tokens del texto en arreglos compactos (TokenArrays de PLY): tipo, inicio, fin y línea de cada uno.
+
+        No se crea un objeto por token y los valores se recortan del texto al pedirlos; sirve para
+        estadísticas sobre textos grandes. Los errores léxicos quedan registrados igual que con lexear()."""
+        reiniciar_lexer(self.lexer, texto)
+        return self.lexer.tokenize_all()
+
+    def lexear_bytes(self, datos):
+        """Como lexear(), pero sobre bytes en UTF-8 (o un archivo mapeado en memoria) que no se decodifican.
+
+        Los tokens y errores léxicos son los mismos; sus posiciones y columnas se cuentan en bytes."""
+        if self.binario is None:
+            self.binario = lexer_binario(self.lexer)
+        reiniciar_lexer(self.binario, datos)
+        return list(iter(self.binario.token, None))
+
+    def parse(self, texto, tokens=None):
+        """Analiza sintácticamente el texto y devuelve el árbol (o None).
+
+        Si se pasan los tokens ya obtenidos con lexear(), el texto no se vuelve a tokenizar."""
+        reiniciar_parser(self.parser)
+        self.parser.errores.clear()
+        if tokens is None:
+            tokens = self.lexear(texto)
+        return analizar_tokens(self.parser, tokens, self.lexer)
+
+    def vigente(self, texto):
+        """Devuelve el resultado guardado si corresponde al mismo contenido, o None."""
+        if self.ultimo is not None and self.ultimo.huella == huella_texto(texto):
+            return self.ultimo
+        return None
+
+    def enfocar(self, resultado):
+        """Deja cargado en el lexer el texto del resultado (las columnas y p.lexer dependen de él)."""
+        if self.lexer.lexdata is not resultado.texto:
+            reiniciar_lexer(self.lexer, resultado.texto)
+
+    def analisis_lexico(self, texto):
+        """Tokeniza el texto; si el contenido no cambió, reutiliza los tokens y repite sus mensajes.
+
+        Un texto editado se retokeniza solo desde poco antes del cambio hasta que los tokens coinciden."""
+        resultado = self.vigente(texto)
+        if resultado is not None:
+            self.traza.reenviar(resultado.eventos_lexicos)
+            return resultado
+
+        # Los tokens y nodos del resultado anterior se van a reutilizar corriendo sus posiciones
+        anterior, self.ultimo = self.ultimo, None
+        if anterior is not None:
+            anterior.vencer()
+        self.incremental.actualizar(texto)
+        eventos = [Evento(ERROR, "lexico", linea, diagnostico.mensaje)
+                   for _, linea, diagnostico in self.incremental.errores]
+        self.traza.reenviar(eventos)
+        self.ultimo = Resultado(huella_texto(texto), texto, list(self.incremental.tokens),
+                                self.incremental.errores_lexicos, eventos)
+        return self.ultimo
+
+    def analisis(self, texto):
+        """Tokeniza y analiza el texto una sola vez; un contenido sin cambios devuelve el resultado guardado.
+
+        Tras una edición solo se vuelven a analizar las sentencias que cambiaron y los bloques que las contienen."""
+        resultado = self.vigente(texto)
+        if resultado is not None and resultado.analizado:
+            self.traza.reenviar(resultado.eventos)
+            return resultado
+
+        # Los mensajes léxicos salen (o se repiten) antes que los del parser
+        resultado = self.analisis_lexico(texto)
+        self.enfocar(resultado)
+        reiniciar_parser(self.parser)
+        self.parser.errores.clear()
+        with self.traza.grabando() as eventos:
+            arbol = self.reanalisis.parse(resultado.tokens, self.lexer)
+
+        resultado.analizado = True
+        resultado.arbol = arbol
+        resultado.errores = list(self.parser.errores)
+        resultado.hay_errores = self.hay_errores
+        resultado.eventos = resultado.eventos_lexicos + eventos
+        return resultado
@@ -1,61 +1,195 @@
+import copy
+import os
+import sys
+from functools import partial
 import ply.yacc as yacc
-from lex import tokens, analizador
-from graphviz import Digraph
+from lex import tokens as tokens_lexicos, analizador, reiniciar_lexer
+from traza import traza_consola
+from cache import directorio_cache, guardar_en_cache, huella
+from diagnosticos import ERROR, Diagnostico
+from recuperacion import MAXIMO_ERRORES, Entrada, TablasRecuperacion, recuperar
+from grafico import elementos_grafico
+from recorrido import preorden
+from salidas import TAMANO_LOTE
+
+# Token que el lexer nunca genera: el análisis incremental lo pone en lugar de una sentencia
+# sin cambios, ya analizada (ver p_sentencia_reutilizada)
+SENTENCIA_REUTILIZADA = 'SENTENCIA_REUTILIZADA'
+tokens = tokens_lexicos + [SENTENCIA_REUTILIZADA]
 
 # Lista global para almacenar mensajes de error
 errores_sintacticos = []
 
-def guardar_mensaje_error(mensaje):
-    """Guarda el mensaje de error en una lista global"""
-    errores_sintacticos.append(mensaje)
-
-def guardar_errores_en_archivo():
+def guardar_mensaje_error(analizador_sintactico, mensaje):
+    """Guarda el mensaje de error en la lista del parser que lo detectó"""
+    analizador_sintactico.errores.append(mensaje)
+
+def reportar_error_sintactico(p, codigo, indice, linea_estado=None):
+    """Registra un error de sintaxis ubicado en el símbolo p[indice]: diagnóstico, traza y estado del parser."""
+    linea = p.lineno(indice)
+    simbolo = p.slice[indice]
+    # El símbolo error lleva como valor el token que lo provocó
+    token = simbolo.value if simbolo.type == "error" else simbolo
+    columna = getattr(token, "col", None)
+    inicio, fin = (token.lexpos, token.endpos) if columna is not None else (None, None)
+    diagnostico = Diagnostico(codigo, ERROR, linea, columna, inicio, fin, ())
+    registrar_error_sintactico(p.parser, diagnostico, linea if linea_estado is None else linea_estado)
+
+def registrar_error_sintactico(analizador_sintactico, diagnostico, linea):
+    """Informa el diagnóstico en la traza, lo guarda y lo anota en el estado del parser."""
+    analizador_sintactico.traza.error("sintaxis", linea, "%s", diagnostico)
+    guardar_mensaje_error(analizador_sintactico, diagnostico)
+    analizador_sintactico.estado.set_error(linea, diagnostico)
+
+# Ruta del archivo de errores
+RUTA_ERRORES = "archivos_salida/errores.txt"
+
+def guardar_errores_en_archivo(errores=None, ruta_archivo=RUTA_ERRORES):
     """Escribe los mensajes de error acumulados en un archivo"""
-    ruta_archivo = "archivos_salida/errores.txt"
+    if errores is None:
+        errores = errores_sintacticos
     try:
         with open(ruta_archivo, "w", encoding="utf-8") as file:
             file.write("=== Lista de errores encontrados ===\n")
-            for error in errores_sintacticos:
+            for error in errores:
                 file.write(f"{error}\n")        
     except Exception as e:
         print(f"Error al guardar el archivo de errores: {e}")
 
 # Función para graficar el árbol sintáctico
-def graficar_arbol(nodo, dot=None, parent=None):
+def graficar_arbol(nodo, dot=None, profundidad=None):
+    """Arma un Digraph de Graphviz con el árbol (o lo agrega a dot), sin recursión y con ids consecutivos.
+
+    Para árboles grandes conviene grafico.exportar_arbol, que escribe el DOT directo a disco."""
     if dot is None:
+        # Graphviz solo se necesita para graficar; el análisis funciona sin él
+        from graphviz import Digraph
         dot = Digraph(format='png')
         dot.attr(dpi='300')
 
-    # Crear un nodo en el grafo para este Nodo
-    etiqueta = f"{nodo.nombre}" + (f": {nodo.valor}" if nodo.valor else "")
-    dot.node(str(id(nodo)), etiqueta)
+    for ident, texto, padre, resumido in elementos_grafico(nodo, profundidad):
+        if resumido:
+            dot.node(f"n{ident}", f"... ({texto} hijos)", shape="plaintext")
+            dot.edge(f"n{padre}", f"n{ident}", style="dashed")
+            continue
+        dot.node(f"n{ident}", texto)
+        if padre is not None:
+            dot.edge(f"n{padre}", f"n{ident}")
 
-    # Si hay un padre, conectar el padre con este nodo
-    if parent:
-        dot.edge(str(id(parent)), str(id(nodo)))
+    return dot
 
-    # Recorrer los hijos y graficarlos
-    for hijo in nodo.hijos:
-        graficar_arbol(hijo, dot, nodo)
+# Tipos de nodo: cada nombre se guarda una sola vez y el nodo solo lleva su código
+TIPOS_NODO = (
+    "Programa", "Sentencias", "Declaracion", "Declaracion y Asignacion", "Tipo", "Variable",
+    "Asignacion", "Leer", "Imprimir", "Contenido", "Numero", "Suma", "Resta", "Multiplicacion",
+    "Division", "Mientras", "Si", "Si-Sino", "Condicion", "Condicion Logica", "Terminar", "Error",
+)
+CODIGOS_NODO = {nombre: codigo for codigo, nombre in enumerate(TIPOS_NODO)}
 
-    return dot
+# Operadores cuyo valor se describe a partir de los hijos, solo cuando se pide
+OPERADORES_NODO = {
+    CODIGOS_NODO["Suma"]: "+",
+    CODIGOS_NODO["Resta"]: "-",
+    CODIGOS_NODO["Multiplicacion"]: "*",
+    CODIGOS_NODO["Division"]: "/",
+}
+CONDICION = CODIGOS_NODO["Condicion"]
+
+# Tipos cuyo valor es un nombre que se repite mucho (se internan las cadenas)
+NOMBRES_INTERNADOS = {CODIGOS_NODO[n] for n in ("Programa", "Declaracion", "Declaracion y Asignacion",
+                                                 "Tipo", "Variable", "Asignacion")}
+
+# Las hojas comparten esta tupla vacía en lugar de tener cada una su propia lista
+SIN_HIJOS = ()
+
+class ListaTexto(list):
+    """Lista de nombres que se muestra separada por comas en los mensajes de la traza."""
+    __slots__ = ()
+
+    def __str__(self):
+        return ", ".join(self)
 
 class Nodo:
-    def __init__(self, nombre, valor=None):
-        self.nombre = nombre
-        self.valor = valor
-        self.hijos = []
+    __slots__ = ("tipo", "dato", "hijos", "texto", "inicio", "fin")
+
+    def __init__(self, nombre, valor=None, hijos=SIN_HIJOS, inicio=None, fin=None):
+        self.tipo = CODIGOS_NODO[nombre]
+        if valor.__class__ is str and self.tipo in NOMBRES_INTERNADOS:
+            valor = sys.intern(valor)
+        self.dato = valor
+        self.hijos = tuple(hijo for hijo in hijos if isinstance(hijo, Nodo)) if hijos else SIN_HIJOS
+        self.texto = None
+        # Rango [inicio, fin) del texto que cubre el nodo, si se conoce
+        self.inicio = inicio
+        self.fin = fin
+
+    @property
+    def nombre(self):
+        return TIPOS_NODO[self.tipo]
+
+    @property
+    def valor(self):
+        """Valor del nodo; en operaciones y condiciones es su texto, armado al pedirlo."""
+        if self.texto is not None:
+            return self.texto
+        if self.tipo in OPERADORES_NODO or self.tipo == CONDICION:
+            # Se arma una sola vez; los pedidos siguientes reutilizan el texto
+            self.texto = self.descripcion()
+            return self.texto
+        return self.dato
+
+    def descripcion(self):
+        """Representación textual de la expresión que forma este subárbol.
+
+        Se recorre con una pila explícita para no depender del límite de recursión."""
+        partes = []
+        pendientes = [self]
+        while pendientes:
+            nodo = pendientes.pop()
+            if nodo.__class__ is str:
+                partes.append(nodo)
+            elif nodo.texto is not None:
+                # Subexpresión ya descripta: no hace falta volver a recorrerla
+                partes.append(nodo.texto)
+            elif nodo.tipo in OPERADORES_NODO:
+                izquierda, derecha = nodo.hijos
+                pendientes += (derecha, f" {OPERADORES_NODO[nodo.tipo]} ", izquierda)
+            elif nodo.tipo == CONDICION:
+                izquierda, derecha = nodo.hijos
+                pendientes += (derecha, f" {nodo.dato} ", izquierda)
+            else:
+                partes.append(f"{nodo.dato}")
+        return "".join(partes)
 
     def agregar_hijo(self, hijo):
         if isinstance(hijo, Nodo):
+            if self.hijos.__class__ is tuple:
+                self.hijos = list(self.hijos)
             self.hijos.append(hijo)
+            self.texto = None
+
+    def abarcar(self, hijo):
+        """Extiende el rango del nodo hasta el final de un hijo agregado (las sentencias con error no tienen nodo)."""
+        if isinstance(hijo, Nodo) and hijo.fin is not None:
+            if self.inicio is None:
+                self.inicio = hijo.inicio
+            self.fin = hijo.fin
+
+    def __str__(self):
+        # Permite pasar el nodo a la traza sin armar su texto si la traza está apagada
+        return f"{self.valor}"
 
     def imprimir(self, nivel=0):
-        indentacion = "  " * nivel
-        valor = f": {self.valor}" if self.valor else ""
-        print(f"{indentacion}{self.nombre}{valor}")
-        for hijo in self.hijos:
-            hijo.imprimir(nivel + 1)
+        """Muestra el subárbol con sangría; se recorre sin recursión y se escribe por lotes."""
+        lineas = []
+        for nodo, profundidad in preorden(self):
+            valor = nodo.valor
+            valor = f": {valor}" if valor else ""
+            lineas.append(f"{'  ' * (nivel + profundidad)}{nodo.nombre}{valor}\n")
+            if len(lineas) >= TAMANO_LOTE:
+                sys.stdout.write("".join(lineas))
+                del lineas[:]
+        sys.stdout.write("".join(lineas))
 
 class ParserState:
     def __init__(self):
@@ -78,11 +212,12 @@ class ParserState:
 # Crear una instancia global del estado del parser
 parser_state = ParserState()
 
-def reiniciar_parser():
+def reiniciar_parser(analizador_sintactico=None):
     """Reinicia las variables del parser para un nuevo análisis."""
-    global parser
-    parser.error = False  # Reiniciar el indicador de errores
-    parser_state.clear_error()  # Reiniciar el estado de errores del parser
+    if analizador_sintactico is None:
+        analizador_sintactico = parser
+    analizador_sintactico.error = False  # Reiniciar el indicador de errores
+    analizador_sintactico.estado.clear_error()  # Reiniciar el estado de errores del parser
 
 # Definición de precedencia de operadores
 precedence = (
@@ -96,11 +231,8 @@ precedence = (
 # Regla para <Programa>
 def p_programa(p):
     '''Programa : PROGRAMA IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER LLAVE_IZQ Sentencias Terminar LLAVE_DER'''
-    print(f"Línea {p.lineno(8)}: Programa '{p[2]}' procesado correctamente.")
-    nodo = Nodo("Programa", p[2])  
-    nodo.agregar_hijo(p[6])
-    nodo.agregar_hijo(p[7])
-    p[0] = nodo
+    p.parser.traza.info("programa", p.lineno(8), "Línea %s: Programa '%s' procesado correctamente.", p.lineno(8), p[2])
+    p[0] = Nodo("Programa", p[2], hijos=(p[6], p[7]), inicio=p.slice[1].lexpos, fin=p.slice[8].endpos)
 
 def p_sentencias_vacia(p):
     '''Sentencias : '''
@@ -111,12 +243,14 @@ def p_sentencias_unica(p):
     '''Sentencias : Sentencia'''
     nodo = Nodo("Sentencias")
     nodo.agregar_hijo(p[1])
+    nodo.abarcar(p[1])
     p[0] = nodo
 
 # Regla para <Sentencias>
 def p_sentencias_multiples(p):
     '''Sentencias : Sentencias Sentencia'''
     p[1].agregar_hijo(p[2])
+    p[1].abarcar(p[2])
     p[0] = p[1]
 
 def p_sentencia_declaracion(p):
@@ -143,36 +277,36 @@ def p_sentencia_si(p):
     '''Sentencia : Si'''
     p[0] = p[1]
 
+def p_sentencia_reutilizada(p):
+    '''Sentencia : SENTENCIA_REUTILIZADA'''
+    # Sentencia igual a la del análisis anterior: se usa su árbol y se repiten sus mensajes
+    sentencia = p[1]
+    p.parser.traza.reenviar(sentencia.eventos)
+    p[0] = sentencia.nodo
+
 # Regla para <Leer>
 def p_leer(p):
     '''Leer : LEER IDENTIFICADOR PUNTO_Y_COMA'''
-    print(f"Línea {p.lineno(2)}: Leer variable '{p[2]}'")
-    nodo = Nodo("Leer")
-    nodo.agregar_hijo(Nodo("Variable", p[2]))
-    p[0] = nodo
+    p.parser.traza.info("leer", p.lineno(2), "Línea %s: Leer variable '%s'", p.lineno(2), p[2])
+    p[0] = Nodo("Leer", hijos=(Nodo("Variable", p[2], inicio=p.slice[2].lexpos, fin=p.slice[2].endpos),),
+                inicio=p.slice[1].lexpos, fin=p.slice[3].endpos)
 
 # Regla para <Imprimir>
 def p_imprimir(p):
     '''Imprimir : IMPRIMIR PARENTESIS_IZQ ContenidoImprimir PARENTESIS_DER PUNTO_Y_COMA'''
-    print(f"Línea {p.lineno(1)}: Imprimir con contenido: {p[3]}")
-    nodo = Nodo("Imprimir")
+    p.parser.traza.info("imprimir", p.lineno(1), "Línea %s: Imprimir con contenido: %s", p.lineno(1), p[3])
+    nodo = Nodo("Imprimir", inicio=p.slice[1].lexpos, fin=p.slice[5].endpos)
     for item in p[3]:
         nodo.agregar_hijo(Nodo("Contenido", item))
     p[0] = nodo
 
 def p_imprimir_error_falta_punto_y_coma(p):
     '''Imprimir : IMPRIMIR PARENTESIS_IZQ ContenidoImprimir PARENTESIS_DER error'''
-    mensaje_error = f"Error de sintaxis: Se esperaba un punto y coma después de 'imprimir' en línea {p.lineno(1)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(1), mensaje_error)  # Marcar error en el estado global
+    reportar_error_sintactico(p, "S001", 1)
 
 def p_imprimir_error_argumentos(p):
     '''Imprimir : IMPRIMIR PARENTESIS_IZQ error PARENTESIS_DER PUNTO_Y_COMA'''
-    mensaje_error = f"Error de sintaxis: Argumentos no válidos en 'imprimir' en línea {p.lineno(3)}. Verifica el contenido."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(3), mensaje_error)
+    reportar_error_sintactico(p, "S002", 3)
 
 # Regla para <ContenidoImprimir>
 def p_contenido_imprimir_texto(p):
@@ -190,112 +324,85 @@ def p_contenido_imprimir_multiples(p):
 # Regla para <Declaracion>
 def p_declaracion_simple(p):
     '''Declaracion : Tipo ListaIdentificadores PUNTO_Y_COMA'''
-    print(f"Línea {p.lineno(3)}: Declaración de variables '{p[1].valor}': {', '.join(p[2])}")
-    nodo = Nodo("Declaracion", p[1].valor)
+    p.parser.traza.info("declaracion", p.lineno(3), "Línea %s: Declaración de variables '%s': %s",
+                        p.lineno(3), p[1], p[2])
+    nodo = Nodo("Declaracion", p[1].valor, inicio=p[1].inicio, fin=p.slice[3].endpos)
     for identificador in p[2]:
         nodo.agregar_hijo(Nodo("Variable", identificador))
     p[0] = nodo
 
 def p_declaracion_asignacion(p):
     '''Declaracion : Tipo IDENTIFICADOR IGUAL Expresion PUNTO_Y_COMA'''
-    print(f"Línea {p.lineno(2)}: Declaración con asignación ({p[1].valor}): {p[2]} = {p[4].valor}")
-    nodo = Nodo("Declaracion y Asignacion", p[1].valor)
-    nodo.agregar_hijo(Nodo("Variable", p[2]))
-    nodo.agregar_hijo(p[4])
-    p[0] = nodo
+    p.parser.traza.info("declaracion", p.lineno(2), "Línea %s: Declaración con asignación (%s): %s = %s",
+                        p.lineno(2), p[1], p[2], p[4])
+    variable = Nodo("Variable", p[2], inicio=p.slice[2].lexpos, fin=p.slice[2].endpos)
+    p[0] = Nodo("Declaracion y Asignacion", p[1].valor, hijos=(variable, p[4]), inicio=p[1].inicio,
+                fin=p.slice[5].endpos)
 
 def p_declaracion_error_identificador(p):
     '''Declaracion : Tipo error PUNTO_Y_COMA'''
-    mensaje_error = f"Error de sintaxis: Identificadores no válidos en declaración en línea {p.lineno(2)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(2), mensaje_error)
+    reportar_error_sintactico(p, "S003", 2)
 
 def p_declaracion_error_punto_y_coma(p):
     '''Declaracion : Tipo IDENTIFICADOR error'''
-    mensaje_error = f"Error de sintaxis: Se esperaba un punto y coma al final de la línea {p.lineno(2)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(2), mensaje_error)
+    reportar_error_sintactico(p, "S004", 2)
 
 # Regla para <Tipo>
 def p_tipo(p):
     '''Tipo : INT
             | FLOAT
             | CHAR'''
-    p[0] = Nodo("Tipo", p[1])
+    p[0] = Nodo("Tipo", p[1], inicio=p.slice[1].lexpos, fin=p.slice[1].endpos)
 
 # Regla para <ListaIdentificadores>
 def p_lista_identificadores_unico(p):
     '''ListaIdentificadores : IDENTIFICADOR'''
-    p[0] = [p[1]]
+    p[0] = ListaTexto([p[1]])
 
 def p_lista_identificadores_multiples(p):
     '''ListaIdentificadores : ListaIdentificadores COMA IDENTIFICADOR'''
-    p[0] = p[1] + [p[3]]
+    p[1].append(p[3])
+    p[0] = p[1]
 
 # Regla para <Asignacion>
 def p_asignacion(p):
     '''Asignacion : IDENTIFICADOR IGUAL Expresion PUNTO_Y_COMA'''
-    print(f"Línea {p.lineno(1)}: Asignación: {p[1]} = {p[3].valor}")
-    nodo = Nodo("Asignacion", p[1])
-    nodo.agregar_hijo(p[3])
-    p[0] = nodo
+    p.parser.traza.info("asignacion", p.lineno(1), "Línea %s: Asignación: %s = %s", p.lineno(1), p[1], p[3])
+    p[0] = Nodo("Asignacion", p[1], hijos=(p[3],), inicio=p.slice[1].lexpos, fin=p.slice[4].endpos)
 
 def p_asignacion_error_identificador(p):
     '''Asignacion : error IGUAL Expresion PUNTO_Y_COMA'''
-    mensaje_error = f"Error de sintaxis: Identificador no válido en línea {p.lineno(1)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(1), mensaje_error)
+    reportar_error_sintactico(p, "S005", 1)
 
 def p_asignacion_error_faltante(p):
     '''Asignacion : IDENTIFICADOR IGUAL error PUNTO_Y_COMA'''
-    mensaje_error = f"Error de sintaxis: Valor faltante en asignación en línea {p.lineno(2)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(2), mensaje_error)
+    reportar_error_sintactico(p, "S006", 2)
 
 # Regla para <Expresion>
 def p_expresion_numero(p):
     '''Expresion : NUMERO'''
-    p[0] = Nodo("Numero", p[1])
+    p[0] = Nodo("Numero", p[1], inicio=p.slice[1].lexpos, fin=p.slice[1].endpos)
 
 def p_expresion_identificador(p):
     '''Expresion : IDENTIFICADOR'''
-    p[0] = Nodo("Variable", p[1])
+    p[0] = Nodo("Variable", p[1], inicio=p.slice[1].lexpos, fin=p.slice[1].endpos)
 
 def p_expresion_suma(p):
     '''Expresion : Expresion SUMA Expresion'''
-    descripcion = f"{p[1].valor} + {p[3].valor}"  # Representación textual
-    nodo = Nodo("Suma", descripcion)  # Incluye la descripción como valor del nodo
-    nodo.agregar_hijo(p[1])
-    nodo.agregar_hijo(p[3])
-    p[0] = nodo
+    # El texto "a + b" se arma recién cuando alguien pide el valor del nodo
+    p[0] = Nodo("Suma", hijos=(p[1], p[3]), inicio=p[1].inicio, fin=p[3].fin)
 
 def p_expresion_resta(p):
     '''Expresion : Expresion RESTA Expresion'''
-    descripcion = f"{p[1].valor} - {p[3].valor}"
-    nodo = Nodo("Resta", descripcion)
-    nodo.agregar_hijo(p[1])
-    nodo.agregar_hijo(p[3])
-    p[0] = nodo
+    p[0] = Nodo("Resta", hijos=(p[1], p[3]), inicio=p[1].inicio, fin=p[3].fin)
 
 def p_expresion_multiplicacion(p):
     '''Expresion : Expresion MULTIPLICACION Expresion'''
-    descripcion = f"{p[1].valor} * {p[3].valor}"
-    nodo = Nodo("Multiplicacion", descripcion)
-    nodo.agregar_hijo(p[1])
-    nodo.agregar_hijo(p[3])
-    p[0] = nodo
+    p[0] = Nodo("Multiplicacion", hijos=(p[1], p[3]), inicio=p[1].inicio, fin=p[3].fin)
 
 def p_expresion_division(p):
     '''Expresion : Expresion DIVISION Expresion'''
-    descripcion = f"{p[1].valor} / {p[3].valor}"
-    nodo = Nodo("Division", descripcion)
-    nodo.agregar_hijo(p[1])
-    nodo.agregar_hijo(p[3])
-    p[0] = nodo
+    p[0] = Nodo("Division", hijos=(p[1], p[3]), inicio=p[1].inicio, fin=p[3].fin)
 
 def p_expresion_error_operador(p):
     '''Expresion : error SUMA Expresion
@@ -306,58 +413,41 @@ def p_expresion_error_operador(p):
                  | Expresion MULTIPLICACION error
                  | error DIVISION Expresion
                  | Expresion DIVISION error'''
-    mensaje_error = f"Error de sintaxis: Operación errónea en línea {p.lineno(2)}. Falta un operando."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(2), mensaje_error)
+    reportar_error_sintactico(p, "S007", 2)
+    # Las reglas que contienen esta expresión esperan un nodo; su valor es lo que muestra la traza
+    p[0] = Nodo("Error", "<error>")
 
 # Regla para <Mientras>
 def p_mientras(p):
     '''Mientras : MIENTRAS PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER'''
-    print(f"Líneas {p.lineno(1)}-{p.lineno(7)}: Bloque 'mientras' procesado con condición: {p[3].valor}")
-    nodo = Nodo("Mientras")
-    nodo.agregar_hijo(p[3])
-    nodo.agregar_hijo(p[6])
-    p[0] = nodo
+    p.parser.traza.info("mientras", p.lineno(1), "Líneas %s-%s: Bloque 'mientras' procesado con condición: %s",
+                        p.lineno(1), p.lineno(7), p[3])
+    p[0] = Nodo("Mientras", hijos=(p[3], p[6]), inicio=p.slice[1].lexpos, fin=p.slice[7].endpos)
 
 def p_mientras_error(p):
     '''Mientras : MIENTRAS PARENTESIS_IZQ error PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER'''
-    mensaje_error = f"Error de sintaxis en la condición del bloque 'mientras' en línea {p.lineno(1)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(1), mensaje_error)  # Marcar error en el estado global
+    reportar_error_sintactico(p, "S008", 1)
 
 # Regla para <Si>
 def p_si(p):
     '''Si : SI PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER'''
-    print(f"Líneas {p.lineno(1)}-{p.lineno(7)}: Estructura 'si' procesada con condición: {p[3].valor}")
-    nodo = Nodo("Si")
-    nodo.agregar_hijo(p[3])
-    nodo.agregar_hijo(p[6])
-    p[0] = nodo
+    p.parser.traza.info("si", p.lineno(1), "Líneas %s-%s: Estructura 'si' procesada con condición: %s",
+                        p.lineno(1), p.lineno(7), p[3])
+    p[0] = Nodo("Si", hijos=(p[3], p[6]), inicio=p.slice[1].lexpos, fin=p.slice[7].endpos)
 
 def p_si_error_incompleto(p):
     '''Si : SI PARENTESIS_IZQ error PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER'''
-    mensaje_error = f"Error de sintaxis: Condición mal formada en 'si' en línea {p.lineno(3)}. Verifica la condición."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(3), mensaje_error)
+    reportar_error_sintactico(p, "S009", 3)
 
 def p_si_sino(p):
     '''Si : SI PARENTESIS_IZQ Condicion PARENTESIS_DER LLAVE_IZQ Sentencias LLAVE_DER SINO LLAVE_IZQ Sentencias LLAVE_DER'''
-    print(f"Líneas {p.lineno(1)}-{p.lineno(11)}: Estructura 'si-sino' procesada con condición: {p[3].valor}")
-    nodo = Nodo("Si-Sino")
-    nodo.agregar_hijo(p[3])
-    nodo.agregar_hijo(p[6])
-    nodo.agregar_hijo(p[10])
-    p[0] = nodo
+    p.parser.traza.info("si_sino", p.lineno(1), "Líneas %s-%s: Estructura 'si-sino' procesada con condición: %s",
+                        p.lineno(1), p.lineno(11), p[3])
+    p[0] = Nodo("Si-Sino", hijos=(p[3], p[6], p[10]), inicio=p.slice[1].lexpos, fin=p.slice[11].endpos)
 
 def p_si_sino_error(p):
     '''Si : SINO LLAVE_IZQ Sentencias LLAVE_DER'''
-    mensaje_error = f"Error de sintaxis: 'sino' no puede existir sin un bloque 'si' en línea {p.lineno(1)}."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(1), mensaje_error)
+    reportar_error_sintactico(p, "S010", 1)
 
 # Regla para <Condicion>
 def p_condicion_comparacion(p):
@@ -367,72 +457,147 @@ def p_condicion_comparacion(p):
                  | Expresion MAYOR_IGUAL Expresion
                  | Expresion IGUAL_IGUAL Expresion
                  | Expresion DISTINTO Expresion'''
-    descripcion = f"{p[1].valor} {p[2]} {p[3].valor}" 
-    nodo = Nodo("Condicion", descripcion)
-    nodo.agregar_hijo(p[1])  
-    nodo.agregar_hijo(p[3])  
-    p[0] = nodo
+    # Se guarda el operador; el texto de la condición se arma al pedirlo
+    p[0] = Nodo("Condicion", p[2], hijos=(p[1], p[3]), inicio=p[1].inicio, fin=p[3].fin)
 
 def p_condicion_logica(p):
     '''Condicion : Condicion AND_COR Condicion
                  | Condicion AND_LAR Condicion
                  | Condicion OR_COR Condicion
                  | Condicion OR_LAR Condicion'''
-    nodo = Nodo("Condicion Logica", p[2])
-    nodo.agregar_hijo(p[1])
-    nodo.agregar_hijo(p[3])
-    p[0] = nodo
+    p[0] = Nodo("Condicion Logica", p[2], hijos=(p[1], p[3]), inicio=p[1].inicio, fin=p[3].fin)
 
 def p_condicion_error_operador(p):
     '''Condicion : Expresion MENOR error'''
-    mensaje_error = f"Error de sintaxis: Condición errónea en línea {p.lineno(2)}. Verifica los operandos."
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(1), mensaje_error)
+    reportar_error_sintactico(p, "S011", 2, linea_estado=p.lineno(1))
+    # Las reglas que contienen esta condición esperan un nodo; su valor es lo que muestra la traza
+    p[0] = Nodo("Error", "<error>")
 
 # Regla para <Terminar>
 def p_terminar(p):
     '''Terminar : TERMINAR PUNTO_Y_COMA'''
-    columna = calcular_columna(p.slice[1], analizador)
-    print(f"Línea {p.lineno(1)}: Instrucción 'terminar'")
-    nodo = Nodo("Terminar")
-    p[0] = nodo
+    p.parser.traza.info("terminar", p.lineno(1), "Línea %s: Instrucción 'terminar'", p.lineno(1))
+    p[0] = Nodo("Terminar", inicio=p.slice[1].lexpos, fin=p.slice[2].endpos)
 
 def p_error_terminar_punto_y_coma(p):
     '''Terminar : TERMINAR error'''
-    mensaje_error = f"Error de sintaxis: Se esperaba un punto y coma al final de la línea {p.lineno(1)}"
-    print(mensaje_error)
-    guardar_mensaje_error(mensaje_error)
-    parser_state.set_error(p.lineno(1), mensaje_error)  # Marcar error
-
-def calcular_columna(p, lexer):
-    line_start = lexer.lexdata.rfind('\n', 0, p.lexpos) + 1
-    return (p.lexpos - line_start) + 1
+    reportar_error_sintactico(p, "S012", 1)
 
 # Manejo de errores
-def p_error(p):
-    if p:
-        # Sincronización general si no se alcanzó una regla específica
-        while True:
-            tok = parser.token()  # Obtener el siguiente token
-            if not tok or tok.type in ('PUNTO_Y_COMA', 'LLAVE_DER'):
-                break  # Sincronizar con tokens seguros
-    else:
+def manejar_error(analizador_sintactico, p):
+    if not p:
         # Error al final del archivo
-        guardar_mensaje_error("Error de sintaxis: fin inesperado del archivo.")
-        parser.error = True
+        guardar_mensaje_error(analizador_sintactico, Diagnostico("S013", ERROR, None, None, None, None, ()))
+        analizador_sintactico.error = True
+    elif len(analizador_sintactico.errores) >= analizador_sintactico.maximo_errores:
+        # Demasiados errores: se deja de analizar el resto del texto
+        guardar_mensaje_error(analizador_sintactico, Diagnostico(
+            "S014", ERROR, p.lineno, getattr(p, "col", None), p.lexpos, getattr(p, "endpos", None),
+            (analizador_sintactico.maximo_errores,)))
+        analizador_sintactico.error = True
+        if analizador_sintactico.entrada is not None:
+            analizador_sintactico.entrada.agotar()
+        else:
+            # También deja de leer una entrada por partes (input_file), no solo la parte cargada
+            p.lexer.stop()
+    elif recuperar(analizador_sintactico, p):
+        # Ninguna regla de error cubrió la sentencia: se la descartó y el error se informa acá
+        registrar_error_sintactico(analizador_sintactico, Diagnostico(
+            "S015", ERROR, p.lineno, getattr(p, "col", None), p.lexpos, getattr(p, "endpos", None),
+            (p.value,)), p.lineno)
+
+def p_error(p):
+    manejar_error(parser, p)
 
 def parse(input_text):
     parser_state.clear_error()  # Limpiar el estado de errores
-    result = parser.parse(input_text)  # Ejecutar el parser
+    reiniciar_lexer(analizador, input_text)
+    result = analizar_tokens(parser, list(iter(analizador.token, None)), analizador)  # Ejecutar el parser
 
     # Mostrar resultado del análisis
     if parser_state.error_found:
-        print(f"Análisis sintáctico finalizado con errores. Último error: {parser_state.error_message}")
+        parser.traza.info("resultado", None, "Análisis sintáctico finalizado con errores. Último error: %s",
+                          parser_state.error_message)
     else:
-        print("El análisis sintáctico finalizó correctamente.")
+        parser.traza.info("resultado", None, "El análisis sintáctico finalizó correctamente.")
 
     return result
 
+def preparar_parser(analizador_sintactico, errores, estado, traza=traza_consola):
+    """Asocia al parser su propia lista de errores, su estado, su traza y su manejador de errores."""
+    analizador_sintactico.errores = errores
+    analizador_sintactico.estado = estado
+    analizador_sintactico.traza = traza
+    analizador_sintactico.error = False
+    analizador_sintactico.errorfunc = partial(manejar_error, analizador_sintactico)
+    analizador_sintactico.maximo_errores = MAXIMO_ERRORES
+    analizador_sintactico.entrada = None
+    if getattr(analizador_sintactico, "recuperacion", None) is None:
+        # Las copias de crear_parser comparten las tablas, y también estas
+        analizador_sintactico.recuperacion = TablasRecuperacion(analizador_sintactico)
+    return analizador_sintactico
+
+def analizar_tokens(analizador_sintactico, tokens, lexer, al_avanzar=None):
+    """Analiza una lista de tokens ya obtenidos; ante un error, la recuperación puede saltearlos en una pasada.
+
+    Si se indica al_avanzar, se le avisa cada tanto cuántos tokens se consumieron (ver Entrada.con_avisos)."""
+    entrada = analizador_sintactico.entrada = Entrada(tokens)
+    siguiente = entrada.siguiente if al_avanzar is None else entrada.con_avisos(al_avanzar)
+    try:
+        return analizador_sintactico.parse(lexer=lexer, tokenfunc=siguiente)
+    finally:
+        analizador_sintactico.entrada = None
+
+def crear_parser(traza=traza_consola):
+    """Crea un parser independiente que comparte las tablas LALR del parser global."""
+    return preparar_parser(copy.copy(parser), [], ParserState(), traza)
+
+# Variable de entorno que pide generar parser.out (en el directorio de la caché)
+VARIABLE_DEPURACION = "ANALIZADOR_DEPURAR_PARSER"
+
+# Firma de la gramática, que se calcula una sola vez por proceso
+_firma = None
+
+def reflejar_gramatica():
+    """Reúne las reglas, los tokens y la precedencia de este módulo, como lo hace yacc.yacc()."""
+    reflejo = yacc.ParserReflect(vars(sys.modules[__name__]), log=yacc.PlyLogger(sys.stderr))
+    reflejo.get_all()
+    return reflejo
+
+def firma_gramatica(reflejo=None):
+    """Huella de la gramática (reglas, tokens y precedencia) y de la versión de las tablas de PLY.
+
+    Sale de la misma firma con la que PLY valida sus tablas; si no se pasa el reflejo, se obtiene uno."""
+    global _firma
+    if _firma is None:
+        if reflejo is None:
+            reflejo = reflejar_gramatica()
+        _firma = huella(reflejo.signature(), yacc.__tabversion__)
+    return _firma
+
+def construir_parser(depurar=False):
+    """Crea el parser desde las tablas LALR en caché, guardadas con pickle y nombradas por la firma de la gramática.
+
+    Nunca escribe en el directorio del código; parser.out solo se genera si se pide depuración.
+    La gramática se reúne una sola vez: el mismo reflejo da la firma y se le pasa a PLY."""
+    reflejo = reflejar_gramatica()
+    if depurar:
+        os.makedirs(directorio_cache(), exist_ok=True)
+        return yacc.yacc(reflect=reflejo, debug=True, write_tables=False, outputdir=directorio_cache())
+
+    nombre = f"parsetab_{firma_gramatica(reflejo)}.pickle"
+    ruta = os.path.join(directorio_cache(), nombre)
+    if os.path.exists(ruta):
+        # PLY vuelve a comparar la firma al leer; si no coincide, regenera las tablas
+        return yacc.yacc(reflect=reflejo, debug=False, picklefile=ruta)
+
+    generado = []
+    guardar_en_cache(nombre, lambda temporal: generado.append(
+        yacc.yacc(reflect=reflejo, debug=False, picklefile=temporal)))
+    if generado:
+        return generado[0]
+    return yacc.yacc(reflect=reflejo, debug=False, write_tables=False)
+
 # Construir el parser
-parser = yacc.yacc()
\ No newline at end of file
+parser = preparar_parser(construir_parser(bool(os.environ.get(VARIABLE_DEPURACION))),
+                         errores_sintacticos, parser_state)
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""El lexer binario (lexer_binario) produce los mismos tokens y diagnósticos que el lexer de texto.
+
+Se corre con pytest desde la raíz del repositorio, o directamente: python tests/test_binario.py"""
+import glob
+import os
+import random
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "ply-3.11")]
+
+from ply.lex import LexError
+from lex import analizador, lexer_binario, reiniciar_lexer
+from traza import APAGADO, Traza
+
+# Textos con caracteres de varios bytes, sobre todo alrededor de literales y operadores inválidos
+TEXTOS_ACENTUADOS = [
+    "c = 'ññ' ááább;\n",
+    "imprimir(\"año ñandú\");\nchar c = 'á'; x = 1;\n# comentário\ny = 'éé';\n",
+    "int x; 'ü\n z = 3;",
+    "x = 1..2 ñu; y = 3abc ñ, z = a ++ ñandú;\n",
+    "'€€€' ñ 'a' '' 'ñ\n'ab' ó;",
+]
+ALFABETO = "abc 12.3..;,'x'\"s\"\n\n#c\t=!<>&|+-*/{}()9a_ \r"
+# Fragmentos que se combinan separados por espacios: un número pegado a una letra acentuada no
+# se compara, porque \b no la considera letra en los patrones de bytes
+FRAGMENTOS = ["'ñ'", "'ññ'", "'é", "'€€€'", "\"año\"", "# ñandú\n", "ñ", "ab", "12", "1..2", "3abc",
+              "++", "+=", ";", ",", "'x'", "'xy'", "''", "\n", "x = 1;", "si (a < b) {", "}"]
+
+def textos_de_prueba():
+    textos = [open(ruta, encoding="utf-8").read() for ruta in sorted(glob.glob(os.path.join(RAIZ, "casos_prueba", "*.txt")))]
+    azar = random.Random(2)
+    for _ in range(200):
+        textos.append("".join(azar.choice(ALFABETO) for _ in range(azar.randint(0, 200))))
+    for _ in range(200):
+        textos.append(" ".join(azar.choice(FRAGMENTOS) for _ in range(azar.randint(0, 40))))
+    return textos + TEXTOS_ACENTUADOS
+
+def lexear(lexer, datos):
+    """Tokens y diagnósticos del lexer sobre los datos; un LexError se anota como un token más."""
+    reiniciar_lexer(lexer, datos)
+    tokens = []
+    try:
+        for tok in iter(lexer.token, None):
+            tokens.append((tok.type, tok.value, tok.lineno, tok.lexpos, tok.col, tok.endpos, tok.end_col))
+    except LexError:
+        tokens.append(("LexError",))
+    diagnosticos = [(d.codigo, d.linea, d.columna, d.inicio, d.fin, d.args) for d in lexer.errores_lexicos]
+    return tokens, diagnosticos
+
+def sin_posiciones(resultado):
+    """Con caracteres de varios bytes, las posiciones y columnas del lexer binario se cuentan en bytes."""
+    tokens, diagnosticos = resultado
+    return [tok[:3] for tok in tokens], [(d[0], d[1], d[5]) for d in diagnosticos]
+
+def test_binario_igual_al_de_texto():
+    texto_lexer = analizador.clone()
+    texto_lexer.traza = Traza(APAGADO)
+    binario = lexer_binario(texto_lexer)
+    for texto in textos_de_prueba():
+        esperado = lexear(texto_lexer, texto)
+        obtenido = lexear(binario, texto.encode("utf-8"))
+        if texto.isascii():
+            assert obtenido == esperado, texto
+        else:
+            assert sin_posiciones(obtenido) == sin_posiciones(esperado), texto
+
+if __name__ == "__main__":
+    test_binario_igual_al_de_texto()
+    print("ok")
@@ -0,0 +1,134 @@
+"""El análisis incremental de Sesion (lexer y parser que reutilizan lo que no cambió) da siempre
+lo mismo que analizar el texto desde cero con una sesión nueva.
+
+Se aplican ediciones al azar (con semilla fija) y, de vez en cuando, se cancela el análisis a mitad
+de camino; después de cada paso se comparan tokens, diagnósticos, árbol y eventos de la traza.
+Se corre con pytest desde la raíz del repositorio, o directamente: python tests/test_incremental.py [semilla]"""
+import os
+import random
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [RAIZ, os.path.join(RAIZ, "ply-3.11")]
+
+import incremental
+import recuperacion
+from generador import GeneradorProgramas
+from recorrido import preorden
+from sesion import ResultadoVencido, Sesion
+from traza import INFO, Traza
+
+# Fragmentos que se insertan: tokens sueltos, errores léxicos y sentencias o bloques completos
+FRAGMENTOS = ["a", " ", "\n", "1", "..", "'x", "'", ";", "+", "**", "\"t", "\"", "#c ", "9a", ",", "{", "}",
+              "<=", "<", "(", ")", "=", "v12 = 3;\n", "x = a + 1;\n", "imprimir(\"hola\");\n", "leer(v1);\n",
+              "si (a < b) {\n", "mientras (a < 3) {\n", "}\n", "} sino {\n", "int q;\n", "terminar;\n"]
+# Sentencias válidas que se insertan al principio de una línea, para que el programa siga sin errores
+# y el parser tenga sentencias que reutilizar
+SENTENCIAS = ["v1 = 2;\n", "    v3 = v1 + 7 * v2;\n", "leer v4;\n", "si (v1 < 3) {\n v2 = 1;\n}\n",
+              "mientras (v2 > v1) {\n leer v5;\n}\n", "\n", "# comentario\n"]
+
+PASOS = 150
+
+class Cancelado(Exception):
+    pass
+
+def estado(resultado):
+    """Todo lo que produce un análisis, en una forma comparable."""
+    tokens = [(tok.type, tok.value, tok.lineno, tok.lexpos, tok.col, tok.endpos, tok.end_col)
+              for tok in resultado.tokens]
+    arbol = None
+    if resultado.arbol is not None:
+        arbol = [(nodo.nombre, nodo.valor, nodo.inicio, nodo.fin, nivel) for nodo, nivel in preorden(resultado.arbol)]
+    return tokens, resultado.diagnosticos, arbol, resultado.hay_errores, resultado.eventos
+
+def desde_cero(texto):
+    """Estado de una sesión nueva sobre el texto, o la clase de la excepción que lanzó."""
+    try:
+        return estado(Sesion(Traza(INFO)).analisis(texto))
+    except Exception as e:
+        return type(e)
+
+def editar(azar, texto):
+    """Reemplaza un tramo al azar del texto (quizás vacío) por un fragmento (quizás vacío), o inserta
+    una sentencia válida al principio de una línea interior."""
+    if azar.random() < 0.5:
+        inicio = texto.find("\n", azar.randrange(len(texto) // 10, len(texto) * 9 // 10)) + 1
+        return texto[:inicio] + azar.choice(SENTENCIAS) + texto[inicio:]
+    inicio = azar.randrange(len(texto) + 1)
+    fin = min(len(texto), inicio + azar.choice([0, 0, 1, 2, 5, 30, 200]))
+    nuevo = azar.choice(FRAGMENTOS) if azar.random() < 0.8 else ""
+    return texto[:inicio] + nuevo + texto[fin:]
+
+def comprobar(semilla, pasos=PASOS):
+    """Aplica las ediciones y devuelve cuántos pasos se compararon y cuántos análisis se cancelaron."""
+    azar = random.Random(semilla)
+    # Con una semilla impar, el programa de partida ya tiene errores
+    texto = GeneradorProgramas(semilla, tasa_errores=0.05 * (semilla % 2)).generar(6000)
+    sesion = Sesion(Traza(INFO))
+    anterior = sesion.analisis(texto)
+    sin_errores = None if anterior.hay_errores else texto
+    comparados = cancelados = 0
+    for paso in range(pasos):
+        editado = editar(azar, texto)
+        esperado = desde_cero(editado)
+        if isinstance(esperado, type):
+            # El lexer no puede seguir (carácter ilegal): la sesión tiene que fallar igual, y la edición se descarta
+            try:
+                sesion.analisis(editado)
+            except esperado:
+                anterior = None
+                continue
+            raise AssertionError(("la sesión no falló", semilla, paso))
+        texto = editado
+
+        # A veces se cancela el análisis en alguno de los primeros avisos de avance
+        if azar.random() < 0.25:
+            limite = azar.randrange(4)
+
+            def cancelar(fase, hecho, total):
+                nonlocal limite
+                limite -= 1
+                if limite < 0:
+                    raise Cancelado()
+            sesion.vigilar(cancelar)
+            try:
+                sesion.analisis(texto)
+            except Cancelado:
+                cancelados += 1
+            sesion.vigilar(None)
+
+        resultado = sesion.analisis(texto)
+        assert estado(resultado) == esperado, (semilla, paso)
+        comparados += 1
+
+        # El resultado del texto anterior quedó vencido: sus tokens y nodos se reutilizaron
+        if anterior is not None and anterior is not resultado:
+            try:
+                anterior.tokens
+            except ResultadoVencido:
+                pass
+            else:
+                raise AssertionError(("resultado anterior vigente", semilla, paso))
+        anterior = resultado
+
+        # Las ediciones que dejan errores se deshacen a menudo: el parser solo reutiliza
+        # sentencias de análisis sin errores
+        if not resultado.hay_errores:
+            sin_errores = texto
+        elif sin_errores is not None and azar.random() < 0.6:
+            texto = sin_errores
+    return comparados, cancelados
+
+def test_incremental_igual_a_desde_cero(monkeypatch):
+    # Avisos de avance frecuentes, para que las cancelaciones caigan también en textos chicos
+    monkeypatch.setattr(recuperacion, "TOKENS_POR_AVISO", 50)
+    monkeypatch.setattr(incremental, "TOKENS_POR_AVISO", 50)
+    for semilla in range(3):
+        comparados, cancelados = comprobar(semilla)
+        assert comparados > PASOS // 2 and cancelados
+
+if __name__ == "__main__":
+    recuperacion.TOKENS_POR_AVISO = incremental.TOKENS_POR_AVISO = 50
+    for semilla in ([int(sys.argv[1])] if len(sys.argv) > 1 else range(3)):
+        print("semilla %d: %d pasos comparados, %d análisis cancelados" % ((semilla,) + comprobar(semilla)))
+    print("ok")
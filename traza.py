@@ -0,0 +1,78 @@
+import json
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+from salidas import SalidaConsola, SalidaLista
+
+# Niveles de la traza, de menor a mayor detalle
+APAGADO = 0
+ERROR = 1
+INFO = 2
+NOMBRES_NIVEL = {APAGADO: "apagado", ERROR: "error", INFO: "info"}
+
+# Evento emitido por el lexer o por una regla del parser
+Evento = namedtuple('Evento', 'nivel tipo linea mensaje')
+
+def formatear_eventos(lote):
+    """Convierte un lote de eventos en los mismos mensajes que se mostraban por consola."""
+    return "".join([evento.mensaje + "\n" for evento in lote])
+
+def formatear_jsonl(lote):
+    """Convierte un lote de eventos en líneas JSON, una por evento."""
+    return "".join([json.dumps({"nivel": NOMBRES_NIVEL[evento.nivel], "tipo": evento.tipo,
+                                "linea": evento.linea, "mensaje": evento.mensaje},
+                               ensure_ascii=False) + "\n" for evento in lote])
+
+def _ignorar(*args):
+    pass
+
+class Traza:
+    """Reparte los eventos del análisis entre las salidas suscriptas, según el nivel.
+
+    Los métodos error e info de un nivel desactivado son funciones vacías: el mensaje
+    ni siquiera se formatea, por eso las reglas pasan el formato y los argumentos por separado."""
+    def __init__(self, nivel=INFO, salidas=None):
+        self.salidas = list(salidas) if salidas else []
+        self.ajustar(nivel)
+
+    def ajustar(self, nivel):
+        """Cambia el nivel de la traza."""
+        self.nivel = nivel
+        activa = bool(self.salidas)
+        self.error = partial(self.emitir, ERROR) if activa and nivel >= ERROR else _ignorar
+        self.info = partial(self.emitir, INFO) if activa and nivel >= INFO else _ignorar
+
+    def suscribir(self, salida):
+        """Agrega una salida (SalidaLista, SalidaArchivo, SalidaConsola...) que recibirá los eventos."""
+        self.salidas.append(salida)
+        self.ajustar(self.nivel)
+        return salida
+
+    def desuscribir(self, salida):
+        self.salidas.remove(salida)
+        self.ajustar(self.nivel)
+
+    def emitir(self, nivel, tipo, linea, formato, *args):
+        """Arma el evento y lo entrega a cada salida."""
+        evento = (Evento(nivel, tipo, linea, formato % args if args else formato),)
+        for salida in self.salidas:
+            salida.escribir_lote(evento)
+
+    def reenviar(self, eventos):
+        """Vuelve a entregar eventos ya emitidos (por ejemplo, de un resultado guardado), según el nivel actual."""
+        lote = [evento for evento in eventos if evento.nivel <= self.nivel]
+        if lote:
+            for salida in self.salidas:
+                salida.escribir_lote(lote)
+
+    @contextmanager
+    def grabando(self):
+        """Guarda en una lista los eventos emitidos dentro del bloque, además de entregarlos como siempre."""
+        grabacion = self.suscribir(SalidaLista())
+        try:
+            yield grabacion.registros
+        finally:
+            self.desuscribir(grabacion)
+
+# Traza por defecto: los mensajes de siempre, en la salida estándar vigente
+traza_consola = Traza(INFO, [SalidaConsola(formatear_eventos)])